@@ -0,0 +1,1754 @@
+"""NetShade micro-benchmarks.
+
+Usage: python3 bench.py <name> [<name> ...]      (no name = run all)
+"""
+import collections
+import errno
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from engine import AirodumpCsv, FileWatcher, InterfaceInventory, Nl80211, ScanHistory
+from script import ConsoleLog
+
+
+def _timeit(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _mac(n, prefix=0x02):
+    return ":".join(f"{b:02X}" for b in (prefix, n >> 32 & 0xff, n >> 24 & 0xff,
+                                          n >> 16 & 0xff, n >> 8 & 0xff, n & 0xff))
+
+
+# ---------------------------------------------------------------------------
+# Synthetic airodump-ng CSV
+# ---------------------------------------------------------------------------
+_AP_HEADER = ("BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, "
+              "Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key")
+_STA_HEADER = "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs"
+
+
+class SyntheticSurvey:
+    def __init__(self, n_aps, n_stations, seed=1):
+        rnd = random.Random(seed)
+        self.rnd = rnd
+        self.tick = 0
+        self.aps = [[_mac(i), rnd.choice([1, 6, 11, 36, 44, 149]), rnd.randint(-90, -30),
+                     0, f"net{i}"] for i in range(n_aps)]
+        self.stations = [[_mac(i, 0x06), self.aps[rnd.randrange(n_aps)][0], rnd.randint(-90, -30), 0]
+                         for i in range(n_stations)]
+
+    def step(self, n_aps, n_stations):
+        """Changes power/last-seen of some rows, like one airodump interval."""
+        self.tick += 1
+        for rows, n in ((self.aps, n_aps), (self.stations, n_stations)):
+            for row in self.rnd.sample(rows, n):
+                row[2] = self.rnd.randint(-90, -30)
+                row[3] = self.tick
+
+    def render(self):
+        out = ["", _AP_HEADER]
+        for mac, channel, power, seen, essid in self.aps:
+            out.append(f"{mac}, 2024-01-01 10:00:00, 2024-01-01 10:{seen % 60:02d}:00, "
+                       f"{channel:2d},  54, WPA2, CCMP, PSK, {power},      100,        0,"
+                       f"   0.  0.  0.  0,   {len(essid)}, {essid}, ")
+        out += ["", _STA_HEADER]
+        for mac, ap, power, seen in self.stations:
+            out.append(f"{mac}, 2024-01-01 10:00:00, 2024-01-01 10:{seen % 60:02d}:00, "
+                       f"{power},       12, {ap},")
+        out += ["", ""]
+        return "\r\n".join(out).encode()
+
+
+def _legacy_parse(content):
+    """The original ScanThread._parse_csv body: decode, split and parse every row."""
+    content = content.decode("utf-8", errors="ignore")
+    mac_re = AirodumpCsv._MAC_RE
+    sep = '\r\n\r\n' if '\r\n\r\n' in content else '\n\n'
+    sections = content.split(sep)
+    networks, clients = {}, {}
+    for line in sections[0].splitlines()[2:]:
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) < 14 or not mac_re.match(parts[0].encode()):
+            continue
+        networks[parts[0]] = {"bssid": parts[0], "channel": parts[3], "power": parts[8],
+                              "privacy": parts[5], "ssid": parts[13] or "<Hidden>"}
+    for line in sections[1].strip().splitlines()[2:]:
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) < 6 or not mac_re.match(parts[0].encode()):
+            continue
+        clients[parts[0]] = {"bssid": parts[0], "ap_bssid": parts[5], "power": parts[3]}
+    return networks, clients
+
+
+def bench_csv():
+    """Per-poll cost of the CSV parser as the survey grows (50 APs + 200 stations change per poll)."""
+    print(f"{'APs':>6} {'stations':>9} {'size':>8} {'full parse':>11} {'incremental':>12} "
+          f"{'unchanged':>10} {'deltas':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ns_scan-01.csv")
+        for n_aps, n_sta in [(500, 5000), (1000, 10000), (2500, 25000), (5000, 50000)]:
+            survey = SyntheticSurvey(n_aps, n_sta)
+            csv = AirodumpCsv(path)
+            data = survey.render()
+            with open(path, "wb") as f:
+                f.write(data)
+            csv.poll()
+
+            full = _timeit(lambda: _legacy_parse(data))
+            incr_times, deltas = [], 0
+            for _ in range(5):
+                survey.step(50, 200)
+                with open(path, "wb") as f:
+                    f.write(survey.render())
+                t0 = time.perf_counter()
+                nets, clients, _, _ = csv.poll()
+                incr_times.append(time.perf_counter() - t0)
+                deltas += len(nets) + len(clients)
+            idle = _timeit(csv.poll)
+            print(f"{n_aps:>6} {n_sta:>9} {len(data) // 1024:>6}KB {full * 1e3:>9.1f}ms "
+                  f"{min(incr_times) * 1e3:>10.1f}ms {idle * 1e6:>8.1f}us {deltas // 5:>7}")
+
+
+def bench_watch():
+    """Latency from an airodump-style rewrite (3 writes, 10 ms apart) to the parser waking up."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ns_scan-01.csv")
+        for label, rounds in [("inotify", 20), ("polling", 3)]:
+            watcher = FileWatcher(path, use_inotify=label == "inotify")
+            if label == "inotify" and not watcher.uses_inotify:
+                print("inotify unavailable")
+                continue
+            latencies = []
+            for i in range(rounds):
+                written = []
+
+                def rewrite():
+                    time.sleep(0.05)
+                    with open(path, "wb") as f:
+                        for _ in range(3):
+                            f.write(b"row %d\n" % i)
+                            f.flush()
+                            written.append(time.perf_counter())
+                            time.sleep(0.01)
+
+                t = threading.Thread(target=rewrite)
+                t.start()
+                watcher.wait()
+                latencies.append(time.perf_counter() - written[0])
+                t.join()
+            watcher.close()
+            watcher.wait()
+            latencies.sort()
+            print(f"{label:>8}: median {latencies[len(latencies) // 2] * 1e3:7.1f}ms  "
+                  f"max {latencies[-1] * 1e3:7.1f}ms")
+
+
+_APP = None
+
+
+def _qapp():
+    """The QApplication, created on first use and kept for the whole run,
+    so benches that only need it to exist can call this without a binding."""
+    global _APP
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    if _APP is None:
+        _APP = QApplication.instance() or QApplication([])
+    return _APP
+
+
+def _scan_cycles(n_aps, n_stations, n_cycles, n_changes):
+    """Batches like ScanJob.batch_ready emits: one full insert, then update cycles."""
+    survey = SyntheticSurvey(n_aps, n_stations)
+    csv = AirodumpCsv(os.devnull)
+    cycles = []
+    for i in range(n_cycles + 1):
+        if i:
+            survey.step(n_changes, n_changes)
+        nets, clients, lost_nets, lost_clients = csv.feed(survey.render())
+        cycles.append({"networks": nets, "clients": clients,
+                       "lost_networks": lost_nets, "lost_clients": lost_clients})
+    return cycles
+
+
+def bench_scan_view():
+    """GUI thread time per parse cycle for the scan table, plus sort and filter (offscreen)."""
+    from PyQt6.QtCore import Qt
+    from script import ScanTab, StatusBar
+    app = _qapp()
+    print(f"{'APs':>6} {'stations':>9} {'insert':>9} {'update':>9} {'sort PWR':>9} {'filter':>9}")
+    for n_aps, n_sta in [(2000, 8000), (20000, 40000)]:
+        cycles = _scan_cycles(n_aps, n_sta, 3, 500)
+        tab = ScanTab(StatusBar())
+        tab.resize(1200, 800)
+        tab.show()
+        app.processEvents()
+        times = []
+        for batch in cycles:
+            t0 = time.perf_counter()
+            tab._on_batch(batch)
+            app.processEvents()
+            times.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        tab.tree.sortByColumn(3, Qt.SortOrder.DescendingOrder)
+        app.processEvents()
+        sort = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        tab.filter_edit.setText("net19")
+        app.processEvents()
+        filt = time.perf_counter() - t0
+        tab.close()
+        print(f"{n_aps:>6} {n_sta:>9} {times[0] * 1e3:>7.1f}ms {max(times[1:]) * 1e3:>7.1f}ms "
+              f"{sort * 1e3:>7.1f}ms {filt * 1e3:>7.1f}ms")
+
+
+def _traced(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def bench_records():
+    """Memory held by 10k parsed networks and 10k clients: dict records vs slotted records."""
+    data = SyntheticSurvey(10000, 10000).render()
+    _, dicts = _traced(lambda: _legacy_parse(data))
+
+    def records():
+        csv = AirodumpCsv(os.devnull)
+        csv.feed(data)
+        csv._ap_lines = csv._sta_lines = None  # raw rewrite kept for diffing, not records
+        return csv.networks, csv.clients
+
+    _, slots = _traced(records)
+    print(f"{'dicts':>8}: {dicts / 1024:8.0f}KB  ({dicts / 20000:5.0f} B/record)")
+    print(f"{'slotted':>8}: {slots / 1024:8.0f}KB  ({slots / 20000:5.0f} B/record)")
+    print(f"{'saved':>8}: {(dicts - slots) / 2 / 1024:8.0f}KB per 10k records")
+
+
+def bench_history():
+    """Scan history: write cost per parse cycle and indexed query latency over a long survey."""
+    survey = SyntheticSurvey(1000, 10000)
+    csv = AirodumpCsv(os.devnull)
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ScanHistory(os.path.join(tmp, "history.db"))
+        session = history.start_session("wlan0mon", "abg")
+        writes, t = [], 0.0
+        for i in range(300):
+            if i:
+                survey.step(200, 1000)
+            nets, clients, _, _ = csv.feed(survey.render())
+            t += 1.0
+            t0 = time.perf_counter()
+            history.record(session, nets, clients, csv.seen_networks, csv.seen_clients, t=t)
+            writes.append(time.perf_counter() - t0)
+        writes.sort()
+        ap, sta = next(iter(csv.networks)), next(iter(csv.clients))
+        print(f"write/cycle: first {writes[-1] * 1e3:.1f}ms, median {writes[len(writes) // 2] * 1e3:.1f}ms "
+              f"(200 APs + 1000 stations changed)")
+        for label, fn in [("last seen", lambda: history.last_seen(ap)),
+                          ("rssi 60s window", lambda: history.rssi_stats(ap, t - 60, t)),
+                          ("station rssi", lambda: history.rssi_stats(sta, station=True)),
+                          ("session APs", lambda: history.session_networks(session))]:
+            print(f"{label:>16}: {_timeit(fn) * 1e3:7.2f}ms")
+        history.close()
+
+
+def _legacy_console():
+    """The original QTextEdit ConsoleOutput: one HTML span per line, 50 lines per insertHtml."""
+    from PyQt6.QtWidgets import QTextEdit
+    from script import PALETTE
+
+    class LegacyConsole(QTextEdit):
+        def __init__(self):
+            super().__init__()
+            self.setReadOnly(True)
+            self.document().setMaximumBlockCount(2000)
+            self._buffer = []
+            self._last_flush = time.time()
+
+        def _flush_buffer(self):
+            if not self._buffer:
+                return
+            self.moveCursor(self.textCursor().MoveOperation.End)
+            batch, self._buffer = self._buffer[:50], self._buffer[50:]
+            self.insertHtml("".join(batch))
+            self.ensureCursorVisible()
+
+        def _enqueue(self, html_line):
+            self._buffer.append(html_line)
+            now = time.time()
+            if now - self._last_flush > 0.5 or len(self._buffer) > 100:
+                self._flush_buffer()
+                self._last_flush = now
+
+        def append_raw(self, text):
+            ts = time.strftime("%H:%M:%S")
+            prompt = f'<span style="color:{PALETTE["overlay0"]};">[{ts}]</span>'
+            self._enqueue(f'{prompt} <span style="color:{PALETTE["subtext1"]};">{text}</span><br>')
+
+    return LegacyConsole()
+
+
+def bench_console():
+    """Console throughput under an output flood: lines/s until every line is on screen (offscreen)."""
+    from script import ConsoleOutput
+    app = _qapp()
+    lines = [f"CH  6 ][ Elapsed: {i} s ][ 2024-01-01 10:00 ][ WPA handshake: 02:00:00:00:00:{i % 256:02X}"
+             for i in range(5000)]
+    for label, console in (("QTextEdit", _legacy_console()), ("ring", ConsoleOutput())):
+        console.resize(900, 300)
+        console.show()
+        app.processEvents()
+        t0 = time.perf_counter()
+        for i, line in enumerate(lines):
+            console.append_raw(line)
+            if i % 100 == 99:
+                app.processEvents()  # the event loop gets a turn between pipe reads
+        while console._buffer:
+            console._flush_buffer()
+            app.processEvents()
+        elapsed = time.perf_counter() - t0
+        console.close()
+        print(f"{label:>10}: {len(lines) / elapsed:10.0f} lines/s  ({elapsed:.2f}s for {len(lines)})")
+
+
+def _run_loop(ms):
+    from PyQt6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def bench_console_flush():
+    """Adaptive console flushing: bursty output through the event loop, then idle wake-ups."""
+    from script import ConsoleOutput
+    app = _qapp()
+    console = ConsoleOutput()
+    console.resize(900, 300)
+    console.show()
+    app.processEvents()
+    fires = [0]
+    console._timer.timeout.connect(lambda: fires.__setitem__(0, fires[0] + 1))
+    for burst in range(10):
+        for i in range(3000):
+            if i % 3:
+                console.append_raw("Sending 64 directed DeAuth (code 7). STMAC: [06:00:00:00:00:01]")
+            else:
+                console.append_raw(f"CH  6 ][ Elapsed: {burst * 3000 + i} s ][ WPA handshake")
+        _run_loop(50)
+    while console.metrics()["backlog"]:
+        _run_loop(16)
+    for key, value in console.metrics().items():
+        print(f"{key:>22}: {value:.1f}" if isinstance(value, float) else f"{key:>22}: {value}")
+    fires[0] = 0
+    _run_loop(1000)
+    print(f"{'idle wake-ups / 1s':>22}: {fires[0]}")
+    console.close()
+
+
+def bench_console_log():
+    """Console history: write throughput and search latency over 1M persisted lines."""
+    rnd = random.Random(1)
+    sources = ["card", "scan", "handshake", "deauth", "crack"]
+    levels = ["raw"] * 16 + ["info", "warn", "error", "success"]
+    words = ["Sending", "DeAuth", "directed", "channel", "beacons", "tested", "keys", "Elapsed",
+             "failed", "interface", "monitor", "packets", "ACKs", "probe", "retry"]
+    with tempfile.TemporaryDirectory() as tmp:
+        log = ConsoleLog(os.path.join(tmp, "console.db"))
+        n, t0 = 0, time.perf_counter()
+        for chunk in range(1000):
+            records = []
+            for i in range(1000):
+                text = " ".join(rnd.choices(words, k=6)) + f" {_mac(rnd.randrange(5000))}"
+                if chunk == 500 and i == 0:
+                    text = "KEY FOUND! [ hunter2 ]"
+                records.append((time.time(), rnd.choice(levels), text))
+            log.write(rnd.choice(sources), records)
+            n += len(records)
+        log.close()
+        elapsed = time.perf_counter() - t0
+        print(f"write: {n / elapsed:9.0f} lines/s ({n} lines in {elapsed:.1f}s, "
+              f"{os.path.getsize(log.path) // 2**20} MB)")
+        log = ConsoleLog(log.path)
+        for label, query in [("rare phrase", dict(text="key found")),
+                             ("MAC", dict(text=_mac(4242))),
+                             ("common word", dict(text="deauth")),
+                             ("level=error", dict(level="error")),
+                             ("crack + text", dict(text="tested keys", source="crack")),
+                             ("error + text", dict(text="monitor", level="error", source="scan"))]:
+            rows = log.search(**query)
+            print(f"{label:>14}: {_timeit(lambda: log.search(**query)) * 1e3:7.2f}ms  ({len(rows)} rows/page)")
+        log.close()
+
+
+def _fake_sysfs(root):
+    """A /sys/class/net tree: two cards, one with its monitor vif, plus wired and loopback."""
+    for name, arphrd, driver in [("wlan0", 1, "iwlwifi"), ("wlan1", 1, "rtl88xxau"),
+                                 ("wlan1mon", 803, "rtl88xxau"), ("eth0", 1, "e1000e"),
+                                 ("lo", 772, None)]:
+        base = os.path.join(root, name)
+        os.makedirs(os.path.join(base, "device"))
+        if name.startswith("wlan"):
+            os.makedirs(os.path.join(base, "phy80211"))
+        with open(os.path.join(base, "type"), "w") as f:
+            f.write(f"{arphrd}\n")
+        if driver:
+            os.symlink(f"../../../bus/drivers/{driver}", os.path.join(base, "device", "driver"))
+
+
+def _legacy_refresh():
+    """The original WifiCardTab._refresh_state probes, minus the widget updates."""
+    import engine
+    ifaces = engine.get_all_wireless_ifaces()
+    modes = [engine.get_iface_mode(i) for i in ifaces]
+    iface = ifaces[0]
+    mode = engine.get_iface_mode(iface)
+    all_ifaces = engine.get_all_wireless_ifaces()
+    if mode != "monitor":
+        next((i for i in all_ifaces if engine.get_iface_mode(i) == "monitor"), None)
+    engine.get_iface_driver(iface)
+    return modes
+
+
+def bench_inventory():
+    """Interface refresh: subprocess forks and latency, legacy probes vs the sysfs inventory."""
+    import engine
+    forks = 0
+    run = subprocess.run
+
+    def counting_run(*args, **kwargs):
+        nonlocal forks
+        forks += 1
+        return run(*args, **kwargs)
+
+    engine.subprocess.run = counting_run
+    try:
+        t = _timeit(_legacy_refresh)
+        print(f"legacy   : {forks // 5:3d} forks/refresh  {t * 1e3:8.2f}ms  (GUI thread, x2 per command)")
+        with tempfile.TemporaryDirectory() as tmp:
+            _fake_sysfs(tmp)
+            inv = InterfaceInventory(root=tmp, use_netlink=False)
+            forks = 0
+            t = _timeit(inv.read)
+            print(f"inventory: {forks // 5:3d} forks/refresh  {t * 1e3:8.2f}ms  (worker thread) -> {inv.read()}")
+            inv.close()
+    finally:
+        engine.subprocess.run = run
+
+    # Link-event latency: add a dummy link and time the inventory's refresh.
+    inv = InterfaceInventory()
+    if not inv.watching:
+        print("netlink  : unavailable")
+        return
+    done = threading.Event()
+    inv.changed.connect(lambda _snapshot: done.set(), direct=True)
+    t0 = time.perf_counter()
+    added = subprocess.run(["ip", "link", "add", "nsbench0", "type", "dummy"],
+                           capture_output=True).returncode == 0
+    if added:
+        hit = done.wait(2.0)
+        print(f"netlink  : link added -> refresh in {(time.perf_counter() - t0) * 1e3:.0f}ms"
+              f" (settle {inv.SETTLE * 1e3:.0f}ms)" if hit else "netlink  : no event within 2s")
+        subprocess.run(["ip", "link", "del", "nsbench0"], capture_output=True)
+    else:
+        print("netlink  : watching (no permission to add a test link)")
+    inv.close()
+
+
+class _ReplaySocket:
+    """Stands in for the netlink socket: swallows requests, returns recorded reads in order."""
+
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data)
+        return len(data)
+
+    def recv(self, _size):
+        return self.reads.pop(0) if self.reads else b""
+
+    def close(self):
+        pass
+
+
+def _nl80211_recording(family=0x1c):
+    """Kernel replies to family lookup, interface dump and split wiphy dump, as read()
+    returns them: two cards, wlan0 on channel 6 and a monitor vif on channel 149."""
+    nl, u32 = Nl80211, Nl80211._U32.pack
+    genl = nl._GENL.pack(1, 1, 0)
+    multi = nl.NLM_F_MULTI
+
+    def done(seq):
+        return nl.message(nl.NLMSG_DONE, multi, seq, b"\0" * 4)
+
+    def iface(seq, wiphy, ifindex, name, iftype, freq, mac):
+        a = (nl.attr(nl.ATTR_IFINDEX, u32(ifindex)) + nl.attr(nl.ATTR_IFNAME, name + b"\0")
+             + nl.attr(nl.ATTR_WIPHY, u32(wiphy)) + nl.attr(nl.ATTR_IFTYPE, u32(iftype))
+             + nl.attr(nl.ATTR_MAC, bytes.fromhex(mac)))
+        if freq:
+            a += nl.attr(nl.ATTR_WIPHY_FREQ, u32(freq))
+        return nl.message(family, multi, seq, genl + a)
+
+    def wiphy(seq, index, name):
+        return nl.message(family, multi, seq, genl + nl.attr(nl.ATTR_WIPHY, u32(index))
+                          + nl.attr(nl.ATTR_WIPHY_NAME, name + b"\0") + nl.attr(99, b"\0" * 64))
+
+    lookup = nl.message(nl.GENL_ID_CTRL, 0, 1, nl._GENL.pack(1, 2, 0)
+                        + nl.attr(nl.CTRL_ATTR_FAMILY_NAME, b"nl80211\0")
+                        + nl.attr(nl.CTRL_ATTR_FAMILY_ID, struct.pack("=H", family)))
+    ifaces = (iface(2, 0, 3, b"wlan0", 2, 2437, "001122334455")
+              + iface(2, 1, 4, b"wlan1", 2, 0, "02aabbccddee")
+              + iface(2, 1, 7, b"wlan1mon", 6, 5745, "02aabbccddee"))
+    wiphys = b"".join(wiphy(3, i, n) for i, n in [(0, b"phy0"), (0, b"phy0"), (1, b"phy1"),
+                                                  (1, b"phy1"), (2, b"phy2")])
+    return [lookup, ifaces, done(2), wiphys + done(3)]
+
+
+def bench_nl80211():
+    """Startup interface detection: iw/iwconfig forks vs nl80211, live and replayed."""
+    import engine
+    forks = 0
+    run = subprocess.run
+
+    def counting_run(*args, **kwargs):
+        nonlocal forks
+        forks += 1
+        return run(*args, **kwargs)
+
+    live = engine.nl80211_interfaces
+    engine.subprocess.run = counting_run
+    try:
+        engine.nl80211_interfaces = lambda: None
+        t = _timeit(engine.detect_interface)
+        print(f"iw/iwconfig   : {forks // 5:2d} forks  {t * 1e3:7.2f}ms")
+        engine.nl80211_interfaces = live
+        forks = 0
+        t = _timeit(engine.detect_interface)
+        found = "nl80211" if live() is not None else "no nl80211 here, fell back"
+        print(f"detect (live) : {forks // 5:2d} forks  {t * 1e3:7.2f}ms  ({found})")
+    finally:
+        engine.subprocess.run = run
+        engine.nl80211_interfaces = live
+
+    def probe():
+        nl = Nl80211()
+        try:
+            nl.interfaces()
+        except OSError:
+            pass
+        finally:
+            nl.close()
+    print(f"genl round trip: {_timeit(probe, 50) * 1e3:7.3f}ms  (socket + family lookup + dump)")
+
+    expected = [("wlan0", 0, "managed", 6, "phy0"), ("wlan1", 1, "managed", 0, "phy1"),
+                ("wlan1mon", 1, "monitor", 149, "phy1")]
+
+    def replay():
+        nl = Nl80211(_ReplaySocket(_nl80211_recording()))
+        return nl.query()
+    wiphys, ifaces = replay()
+    got = [(i["ifname"], i["wiphy"], i["mode"], i["channel"], i["phy"]) for i in ifaces]
+    assert got == expected, got
+    assert wiphys == {0: "phy0", 1: "phy1", 2: "phy2"}, wiphys
+    assert ifaces[2]["mac"] == "02:AA:BB:CC:DD:EE" and ifaces[0]["freq"] == 2437
+    print(f"replay        : {_timeit(replay, 200) * 1e6:7.1f}us  query() over the recording -> ok")
+
+    # A kernel without cfg80211 answers the family lookup with ENOENT.
+    nl = Nl80211(_ReplaySocket([Nl80211.message(Nl80211.NLMSG_ERROR, 0, 1, struct.pack("=i", -2))]))
+    try:
+        nl.interfaces()
+        raise AssertionError("expected ENOENT")
+    except OSError as e:
+        assert e.errno == errno.ENOENT
+    print("replay ENOENT : raises OSError -> callers fall back")
+
+
+def _legacy_worker():
+    """The original WorkerThread: one QThread blocking on readline per child."""
+    from PyQt6.QtCore import QThread, pyqtSignal
+
+    class WorkerThread(QThread):
+        output = pyqtSignal(str, str)
+        finished = pyqtSignal(int)
+
+        def __init__(self, cmd):
+            super().__init__()
+            self.cmd = cmd
+
+        def run(self):
+            process = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True, bufsize=1)
+            for line in iter(process.stdout.readline, ''):
+                line = line.rstrip()
+                if line:
+                    self.output.emit(line, "raw")
+            process.wait()
+            self.finished.emit(process.returncode)
+
+    return WorkerThread
+
+
+def _os_threads():
+    return len(os.listdir("/proc/self/task"))
+
+
+def bench_supervisor():
+    """8 children printing 20k lines each at once: OS threads and wall time, per-QThread vs supervisor."""
+    from PyQt6.QtCore import QEventLoop
+    from engine import ChildProcess
+    _qapp()
+    n_children, n_lines = 8, 20_000
+    cmd = [sys.executable, "-c",
+           f"import sys; sys.stdout.write(''.join(f'CH {{i:6d}} beacons 1234 data 56\\n' for i in range({n_lines})))"]
+    for label, factory in [("QThread each", _legacy_worker()), ("supervisor", ChildProcess)]:
+        loop = QEventLoop()
+        base = _os_threads()
+        peak, got, left = base, 0, n_children
+
+        def on_line(_text, _kind):
+            nonlocal got
+            got += 1
+
+        def on_done(_rc):
+            nonlocal left
+            left -= 1
+            if not left:
+                loop.quit()
+
+        children = [factory(cmd) for _ in range(n_children)]
+        t0 = time.perf_counter()
+        for child in children:
+            child.output.connect(on_line)
+            child.finished.connect(on_done)
+            child.start()
+        peak = max(peak, _os_threads())
+        loop.exec()
+        elapsed = time.perf_counter() - t0
+        assert got == n_children * n_lines, got
+        print(f"{label:>13}: {elapsed * 1e3:7.0f}ms  {got / elapsed:9.0f} lines/s  "
+              f"+{peak - base} OS threads while running")
+        if factory is ChildProcess:
+            u = children[0].usage()
+            print(f"{'':>13}  child 0: rc={u['returncode']} cpu={u['cpu_s']:.3f}s "
+                  f"maxrss={u['rss_kb']} kB  {u['lines']} lines/{u['bytes']} B in {u['runtime_s'] * 1e3:.0f}ms")
+        for child in children:
+            child.wait()
+
+
+def _airodump_screen(n_frames, n_aps=30, n_stations=10):
+    """An airodump-ng style stdout: a few plain lines, then full-screen redraws
+    with colour, clear-to-EOL and cursor moves, as the curses UI writes them."""
+    rnd = random.Random(7)
+    out = [b"Interface wlan0mon: channel hopping\n"]
+    for f in range(n_frames):
+        rows = [f"\x1b[2J\x1b[1;1H CH {f % 13 + 1:2d} ][ Elapsed: {f} s ][ 2024-05-01 12:00 "
+                f"][ WPA handshake: {_mac(3)}\x1b[K\n\x1b[K\n",
+                " BSSID              PWR  Beacons    #Data, #/s  CH   MB   ENC CIPHER  AUTH ESSID\x1b[K\n"]
+        for i in range(n_aps):
+            bold = "\x1b[1m" if i == f % n_aps else ""
+            rows.append(f" {bold}{_mac(i)}  {-rnd.randrange(30, 90):3d} {rnd.randrange(9999):8d} "
+                        f"{rnd.randrange(999):8d} {rnd.randrange(9):4d} {i % 13 + 1:3d}  54e  WPA2 CCMP   "
+                        f"PSK  net-{i}\x1b[0m\x1b[K\n")
+        rows.append("\x1b[K\n BSSID              STATION            PWR   Rate    Lost    Frames  Notes\x1b[K\n")
+        for i in range(n_stations):
+            rows.append(f"\x1b[{n_aps + 6 + i};1H {_mac(i)}  {_mac(i + 100, 0x04)}  -{rnd.randrange(30, 90)}"
+                        f"    0 - 1      0       {rnd.randrange(999)}\x1b[K")
+        rows.append("\x1b[J")
+        out.append("".join(rows).encode())
+    return b"".join(out)
+
+
+def bench_pipe_reader():
+    """airodump-ng screen output: text-mode readline per line vs chunked PipeReader (MB/s, CPU/MB)."""
+    import io
+    from engine import PipeReader
+    stream = _airodump_screen(2000)
+    mb = len(stream) / 2**20
+
+    def legacy():
+        lines = 0
+        for line in iter(io.TextIOWrapper(io.BytesIO(stream), newline=None).readline, ""):
+            if line.rstrip():
+                lines += 1
+        return lines, None
+
+    def chunked():
+        reader, lines, frames = PipeReader(), 0, 0
+        for i in range(0, len(stream), 65536):
+            new, frame = reader.feed(stream[i:i + 65536])
+            lines += len(new)
+            frames += frame is not None
+        new, frame = reader.feed(b"", final=True)
+        return lines + len(new), frames + (frame is not None)
+
+    for label, fn in [("readline", legacy), ("PipeReader", chunked)]:
+        t0, c0 = time.perf_counter(), time.process_time()
+        lines, updates = fn()
+        wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+        delivered = f"{lines} lines" + (f" + {updates} frame updates" if updates is not None else " to the GUI")
+        print(f"{label:>10}: {mb / wall:7.1f} MB/s  {cpu / mb * 1e3:6.1f} ms CPU/MB  ({delivered}, {mb:.1f} MB)")
+
+    # Chunk boundaries must not matter: random cuts give the same lines and final frame.
+    rnd = random.Random(3)
+    sample = stream[:stream.index(b"\x1b[2J", len(stream) // 20)]
+    whole = PipeReader()
+    lines, _ = whole.feed(sample)
+    last = whole.feed(b"", final=True)
+    split, got, frame = PipeReader(), [], None
+    i = 0
+    while i < len(sample):
+        n = rnd.randrange(1, 4096)
+        new, f = split.feed(sample[i:i + n])
+        got += new
+        frame = f or frame
+        i += n
+    new, f = split.feed(b"", final=True)
+    assert got + new == lines + last[0], "lines differ across chunkings"
+    assert (f or frame) == (last[1] or whole._frame), "final frame differs across chunkings"
+    assert not any("\x1b" in line for line in (last[1] or whole._frame))
+    print(f"chunking  : random 1-4096 B cuts match a single feed; frame = {len(whole._frame)} lines, "
+          f"{whole._frame[0].strip()[:48]!r}")
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return f.read().splitlines()
+
+
+def _legacy_handshake(lines):
+    """HandshakeTab._handle_output's original test, per line."""
+    return sum(any(p in text.lower() for p in ["wpa handshake", "handshake", "4-way handshake", "eapol"])
+               for text in lines)
+
+
+def _legacy_crack(lines):
+    """CrackConvertTab._handle_crack_output's original tests, per line."""
+    hits = 0
+    for text in lines:
+        if "KEY FOUND" in text.upper():
+            hits += 1
+        elif any(k in text.lower() for k in ("failed", "not found")):
+            hits += 1
+    return hits
+
+
+def bench_events():
+    """Tool output parsers: fixture corpora must parse to the expected events, then lines/s."""
+    from engine import (AircrackParser, AireplayParser, AirodumpParser, DeauthSent,
+                        HandshakeCaptured, KeyFound, Progress, ToolError, mac_to_int)
+    ap, sta = mac_to_int("AA:BB:CC:DD:EE:FF"), mac_to_int("11:22:33:44:55:66")
+    expected = {
+        "airodump.txt": (AirodumpParser, [
+            HandshakeCaptured(ap, "wpa"), HandshakeCaptured(mac_to_int("02:1A:11:F0:00:01"), "pmkid"),
+            ToolError("ioctl(SIOCSIWMODE) failed: Device or resource busy"),
+            ToolError("Failed initializing wireless card(s): wlan0mon"),
+            ToolError("Interface wlan9mon doesn't exist")], _legacy_handshake),
+        "aireplay.txt": (AireplayParser, [
+            DeauthSent(ap, None, None), DeauthSent(ap, None, None),
+            DeauthSent(None, sta, 63), DeauthSent(None, sta, 76), DeauthSent(None, sta, 10),
+            DeauthSent(None, sta, None),
+            ToolError("No such BSSID available."),
+            ToolError("write failed: Operation not permitted"),
+            ToolError("wi_write(): Permission denied")], None),
+        "aircrack.txt": (AircrackParser, [
+            Progress(1152, 9822768, 1934.21, 1), Progress(8123456, 9822768, 2011.04, 4032),
+            Progress(52, -1, 0.0, 0), KeyFound("correct horse"), ToolError("KEY NOT FOUND"),
+            ToolError("Passphrase not in dictionary"),
+            ToolError("Packets contained no EAPOL data; unable to process this AP."),
+            ToolError("No matching network found - check your bssid."),
+            ToolError("Failed to open 'missing.cap' (2): No such file or directory")], _legacy_crack),
+    }
+    for name, (parser_cls, events, legacy) in expected.items():
+        lines = _fixture(name)
+        got = parser_cls().parse(lines)
+        assert got == events, f"{name}: {got}"
+        # Same events whatever the batching.
+        assert [e for line in lines for e in parser_cls().parse([line])] == events, name
+
+        corpus = lines * (200_000 // len(lines))
+        batches = [corpus[i:i + 100] for i in range(0, len(corpus), 100)]
+        parser = parser_cls()
+        t = _timeit(lambda: [parser.parse(batch) for batch in batches], 3)
+        old = f"  legacy scans {len(corpus) / _timeit(lambda: legacy(corpus), 3):9.0f} lines/s" if legacy else ""
+        print(f"{name:>13}: {len(events)} events ok  {parser_cls.__name__} {len(corpus) / t:9.0f} lines/s{old}")
+
+    # The usual stream: a redrawn airodump screen where one line per frame carries an event.
+    from engine import PipeReader
+    reader, data, batches = PipeReader(), _airodump_screen(2000), []
+    for i in range(0, len(data), 4096):
+        lines, frame = reader.feed(data[i:i + 4096])
+        batches += [b for b in (lines, frame) if b]
+    lines = [line for batch in batches for line in batch]
+    parser = AirodumpParser()
+    hits = sum(len(parser.parse(batch)) for batch in batches)
+    t = _timeit(lambda: [parser.parse(batch) for batch in batches], 3)
+    print(f"{'screen':>13}: {hits} events in {len(batches)} frames  AirodumpParser {len(lines) / t:9.0f} lines/s"
+          f"  legacy scans {len(lines) / _timeit(lambda: _legacy_handshake(lines), 3):9.0f} lines/s")
+
+
+def _radiotap(frame):
+    return b"\x00\x00\x08\x00\x00\x00\x00\x00" + frame
+
+
+def _eapol_frame(ap, sta, msg, replay, pmkid=False):
+    """One QoS data frame carrying 4-way handshake message `msg` (WPA2, radiotap)."""
+    from_ap = msg in (1, 3)
+    addrs = sta + ap + ap if from_ap else ap + sta + ap
+    header = bytes([0x88, 0x02 if from_ap else 0x01, 0, 0]) + addrs + b"\x00\x00" + b"\x00\x00"
+    info = {1: 0x008A, 2: 0x010A, 3: 0x13CA, 4: 0x030A}[msg]
+    nonce = bytes(32) if msg == 4 else os.urandom(32)
+    data = b"\xdd\x14\x00\x0f\xac\x04" + os.urandom(16) if pmkid else (os.urandom(22) if msg == 2 else b"")
+    body = struct.pack(">BHHQ32s16s8s8s16sH", 2, info, 16, replay, nonce, bytes(16), bytes(8), bytes(8),
+                       bytes(16) if msg == 1 else os.urandom(16), len(data)) + data
+    return _radiotap(header + b"\xaa\xaa\x03\x00\x00\x00\x88\x8e" + struct.pack(">BBH", 2, 3, len(body)) + body)
+
+
+def _pcap_write(f, frames):
+    for frame in frames:
+        f.write(struct.pack("<IIII", 0, 0, len(frame), len(frame)) + frame)
+
+
+def _pcap_noise(n, rnd):
+    """Beacons and encrypted data frames of realistic sizes, as a busy channel produces."""
+    blob = os.urandom(2400)
+    for i in range(n):
+        if i % 4 == 0:
+            yield _radiotap(b"\x80\x00" + blob[:22] + blob[:rnd.randrange(60, 300)])
+        else:
+            yield _radiotap(b"\x88\x41" + blob[:24] + blob[rnd.randrange(100):rnd.randrange(200, 1600)])
+
+
+def bench_handshake():
+    """Capture-file handshake check: incremental EAPOL tracking on a growing pcap, then
+    MB/s and peak memory over a multi-hundred-MB capture vs reading it whole."""
+    from engine import HandshakeVerifier, PcapTail
+    rnd = random.Random(3)
+    ap, sta, other = (bytes.fromhex(_mac(n).replace(":", "")) for n in (1, 2, 3))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "home-01.cap")
+        header = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 262144, 127)
+
+        # Growing file: records land in arbitrary slices, as airodump-ng flushes them.
+        steps = [list(_pcap_noise(50, rnd)), [_eapol_frame(ap, other, 1, 7)],
+                 [_eapol_frame(ap, sta, 1, 41)], [_eapol_frame(ap, sta, 2, 41)],
+                 [_eapol_frame(ap, sta, 3, 42), _eapol_frame(ap, sta, 4, 42)]]
+        verifier = HandshakeVerifier(path, _mac(1))
+        seen = []
+        with open(path, "wb") as f:
+            f.write(header[:10]); f.flush()
+            assert verifier.poll() is None or verifier.progress().messages == ()
+            f.write(header[10:])
+            for frames in steps:
+                with tempfile.TemporaryFile() as part:
+                    _pcap_write(part, frames)
+                    part.seek(0)
+                    data = part.read()
+                cut = rnd.randrange(1, len(data))
+                f.write(data[:cut]); f.flush()
+                verifier.poll()
+                f.write(data[cut:]); f.flush()
+                p = verifier.poll()
+                if p:
+                    seen.append((p.messages, p.complete))
+        assert seen == [((1,), False), ((1, 2), True), ((1, 2, 3, 4), True)], seen
+        assert verifier.progress().station == int.from_bytes(sta, "big")
+        print(f"  growing file: {' -> '.join(str(m) + ('*' if c else '') for m, c in seen)}")
+
+        pm = os.path.join(tmp, "pmkid-01.cap")
+        with open(pm, "wb") as f:
+            f.write(header)
+            _pcap_write(f, [_eapol_frame(ap, sta, 1, 1, pmkid=True)])
+        p = HandshakeVerifier(pm, _mac(1)).poll()
+        assert p.complete and p.pmkid and p.messages == (1,), p
+        print(f"  PMKID in M1: complete={p.complete}")
+
+        # A big capture with the handshake at the very end.
+        with open(path, "wb") as f:
+            f.write(header)
+            noise = list(_pcap_noise(20000, rnd))
+            while f.tell() < 300 << 20:
+                _pcap_write(f, noise)
+            _pcap_write(f, [_eapol_frame(ap, sta, m, 9 + (m > 2)) for m in (1, 2, 3, 4)])
+        size = os.path.getsize(path)
+        for label, fn in (("HandshakeVerifier", lambda: HandshakeVerifier(path, _mac(1)).poll()),
+                          ("whole-file walk", lambda: _whole_file_walk(path))):
+            t0 = time.perf_counter()
+            result = fn()
+            dt = time.perf_counter() - t0
+            tracemalloc.start()     # separate pass: tracing slows allocation-heavy loops
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {label:>17}: {size / dt / 1e6:7.0f} MB/s over {size >> 20} MB, "
+                  f"peak {peak / 1e6:6.1f} MB  -> {result}")
+        tail = PcapTail(path)
+        t0 = time.perf_counter()
+        count = sum(1 for _ in tail.frames())
+        print(f"  PcapTail, every frame: {size / (time.perf_counter() - t0) / 1e6:7.0f} MB/s ({count} records)")
+
+
+def _whole_file_walk(path):
+    """The obvious approach: read it all, then walk every record looking for EAPOL."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos, hits = 24, 0
+    while pos + 16 <= len(data):
+        incl = struct.unpack_from("<I", data, pos + 8)[0]
+        if b"\x88\x8e" in data[pos + 16:pos + 16 + incl]:
+            hits += 1
+        pos += 16 + incl
+    return f"{hits} EAPOL-ish records"
+
+
+def _beacon(bssid, ssid):
+    fixed = bytes(8) + b"\x64\x00\x11\x04"      # timestamp, interval, capabilities
+    return _radiotap(b"\x80\x00\x00\x00" + b"\xff" * 6 + bssid + bssid + b"\x00\x00" + fixed
+                     + bytes([0, len(ssid)]) + ssid + b"\x01\x08\x82\x84\x8b\x96\x0c\x12\x18\x24")
+
+
+def _rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _pcapng_write(f, frames, resolution=6):
+    def block(kind, body):
+        body += b"\0" * (-len(body) % 4)
+        return struct.pack("<II", kind, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+    f.write(block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)))
+    f.write(block(1, struct.pack("<HHI", 127, 0, 262144) + struct.pack("<HHB3x", 9, 1, resolution) + bytes(4)))
+    for i, frame in enumerate(frames):
+        ts = (1714564800 + i) * 10 ** resolution
+        f.write(block(6, struct.pack("<IIIII", 0, ts >> 32, ts & 0xFFFFFFFF, len(frame), len(frame)) + frame))
+
+
+def bench_capture_index():
+    """CaptureIndex over a 1 GB pcap and a pcapng: cold build (MB/s, heap and RSS growth), cached load."""
+    from engine import CaptureIndex
+    rnd = random.Random(5)
+    aps = [bytes.fromhex(_mac(n).replace(":", "")) for n in range(40)]
+    sta = bytes.fromhex(_mac(900).replace(":", ""))
+    beacons = [_beacon(ap, f"net-{i}".encode()) for i, ap in enumerate(aps)]
+    noise = list(_pcap_noise(20000, rnd))
+    for i in range(0, len(noise), 4):
+        noise[i] = beacons[i // 4 % len(beacons)]
+    handshake = [_eapol_frame(aps[3], sta, 1, 5, pmkid=True), _eapol_frame(aps[3], sta, 2, 5),
+                 _eapol_frame(aps[7], sta, 2, 9)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big-01.cap")
+        with open(path, "wb") as f:
+            f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 262144, 127))
+            _pcap_write(f, handshake[:1])
+            while f.tell() < 1 << 30:
+                _pcap_write(f, noise)
+            _pcap_write(f, handshake[1:])
+        ng = os.path.join(tmp, "small.pcapng")
+        with open(ng, "wb") as f:
+            _pcapng_write(f, noise[:1000] + handshake + noise[:1000], resolution=9)
+
+        for label, p in (("pcap", path), ("pcapng", ng)):
+            size = os.path.getsize(p)
+            rss0, peak_rss, done = _rss(), [0], threading.Event()
+
+            def sample():
+                while not done.wait(0.02):
+                    peak_rss[0] = max(peak_rss[0], _rss() - rss0)
+            threading.Thread(target=sample, daemon=True).start()
+            t0 = time.perf_counter()
+            index = CaptureIndex.load(p)
+            cold = time.perf_counter() - t0
+            done.set()
+            tracemalloc.start()     # separate pass: tracing slows the walk tenfold
+            CaptureIndex.build(p)
+            heap = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            t0 = time.perf_counter()
+            cached = CaptureIndex.load(p)
+            warm = time.perf_counter() - t0
+            assert cached.networks == index.networks and cached.packets == index.packets
+            assert len(index.networks) == 40 and index.networks[_mac(3)]["ssid"] == "net-3", index.networks
+            assert index.crackable_networks == [_mac(3)], index.crackable_networks
+            assert index.messages(_mac(7)) == [2] and index.first is not None
+            print(f"  {label:>6} {size >> 20:5d} MB, {index.packets} packets: cold {cold:6.2f} s "
+                  f"({size / cold / 1e6:5.0f} MB/s, heap peak {heap >> 10:4d} KB, RSS +{peak_rss[0] / 1e6:5.1f} MB)"
+                  f"  cached {warm * 1e3:5.2f} ms")
+        print("\n".join("    " + line for line in index.summary()))
+
+
+def bench_library():
+    """Capture library over 3000 captures: cold sync, reopen, idle re-sync, one new file,
+    vs re-indexing everything; then a live LibraryJob picking up a new capture."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from engine import CaptureIndex, CaptureLibrary, LibraryJob, conversion_is_current
+    _qapp()
+    rnd = random.Random(11)
+    aps = [bytes.fromhex(_mac(n).replace(":", "")) for n in range(200)]
+    sta = bytes.fromhex(_mac(900).replace(":", ""))
+    header = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 262144, 127)
+    noise = list(_pcap_noise(40, rnd))
+
+    def write_capture(path, i, mtime):
+        with open(path, "wb") as f:
+            f.write(header)
+            _pcap_write(f, [_beacon(aps[(i + k) % 200], f"net-{(i + k) % 200}".encode()) for k in range(3)] + noise)
+            if i % 3 == 0:
+                _pcap_write(f, [_eapol_frame(aps[i % 200], sta, 1, i), _eapol_frame(aps[i % 200], sta, 2, i)])
+        os.utime(path, ns=(mtime, mtime))
+
+    n = 3000
+    with tempfile.TemporaryDirectory() as tmp:
+        cap_dir = os.path.join(tmp, "captured")
+        os.mkdir(cap_dir)
+        old = time.time_ns() - 3600 * 10 ** 9
+        for i in range(n):
+            write_capture(os.path.join(cap_dir, f"site{i // 10}-{i % 10 + 1:02d}.cap"), i, old)
+        for i in range(0, n, 5):        # every 5th converted; those on a multiple of 10 outdated
+            out = os.path.join(cap_dir, f"site{i // 10}-{i % 10 + 1:02d}.hc22000")
+            with open(out, "w") as f:
+                f.write("WPA*02*...\n")
+            t = old + (10 ** 9 if i % 10 else -10 ** 9)
+            os.utime(out, ns=(t, t))
+        db = os.path.join(tmp, "library.db")
+
+        lib = CaptureLibrary(db, cap_dir)
+        t0 = time.perf_counter()
+        changed, removed, pending = lib.sync()
+        cold = time.perf_counter() - t0
+        assert len(changed) == n and not removed and not pending
+        entries = {os.path.basename(e.path): e for e in changed}
+        assert entries["site0-01.cap"].crackable == 1 and entries["site0-02.cap"].crackable == 0
+        assert entries["site0-06.cap"].converted(".hc22000") == "current"
+        assert entries["site0-01.cap"].converted(".hc22000") == "stale"
+        assert entries["site0-02.cap"].converted(".hc22000") is None
+        assert conversion_is_current(os.path.join(cap_dir, "site0-06.cap"), os.path.join(cap_dir, "site0-06.hc22000"))
+        assert not conversion_is_current(os.path.join(cap_dir, "site0-01.cap"), os.path.join(cap_dir, "site0-01.hc22000"))
+        lib.close()
+
+        t0 = time.perf_counter()
+        lib = CaptureLibrary(db, cap_dir)
+        reopen = time.perf_counter() - t0
+        assert len(lib.entries()) == n
+        t0 = time.perf_counter()
+        assert lib.sync() == ([], [], [])
+        idle = time.perf_counter() - t0
+
+        write_capture(os.path.join(cap_dir, "new-01.cap"), 3, old)
+        os.remove(os.path.join(cap_dir, "site0-03.cap"))
+        t0 = time.perf_counter()
+        changed, removed, _ = lib.sync()
+        one = time.perf_counter() - t0
+        assert [os.path.basename(e.path) for e in changed] == ["new-01.cap"] and len(removed) == 1
+        lib.close()
+
+        t0 = time.perf_counter()
+        for name in os.listdir(cap_dir):
+            if name.endswith(".cap"):
+                CaptureIndex.build(os.path.join(cap_dir, name))
+        rebuild = time.perf_counter() - t0
+        print(f"  {n} captures: cold sync {cold:6.2f} s, reopen {reopen * 1e3:6.1f} ms, "
+              f"idle re-sync {idle * 1e3:6.1f} ms, +1/-1 file {one * 1e3:6.1f} ms")
+        print(f"  re-indexing every capture instead: {rebuild:6.2f} s per pass")
+
+        job = LibraryJob(db, cap_dir)
+        loop, seen = QEventLoop(), []
+
+        def on_changed(changed, removed):
+            seen.append((time.perf_counter(), changed, removed))
+            if len(seen) == 2:
+                loop.quit()
+        job.changed.connect(on_changed)
+        job.start()
+        QTimer.singleShot(300, lambda: (seen.append(time.perf_counter()),
+                                         write_capture(os.path.join(cap_dir, "live-01.cap"), 0, old)))
+        QTimer.singleShot(10_000, loop.quit)
+        loop.exec()
+        job.stop()
+        written = next(s for s in seen if isinstance(s, float))
+        batches = [s for s in seen if not isinstance(s, float)]
+        assert len(batches[0][1]) == n and [os.path.basename(e.path) for e in batches[1][1]] == ["live-01.cap"]
+        print(f"  LibraryJob: cached list of {len(batches[0][1])} shown at start, "
+              f"new capture picked up {(batches[1][0] - written) * 1e3:5.0f} ms after it was written")
+
+
+def bench_conversion_queue():
+    """500 conversions (a stand-in converter): bounded ConversionQueue vs one process per click,
+    then dedupe, skip-if-current and cancel."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    from engine import ChildProcess, ConversionQueue, ProcessSupervisor
+    _qapp()
+    n = 500
+
+    def fake_command(cap, fmt, out_dir):
+        out = os.path.join(out_dir, os.path.splitext(os.path.basename(cap))[0] + fmt)
+        return ["/bin/sh", "-c", 'echo "reading $1"; i=0; while [ $i -lt 200 ]; do i=$((i+1)); done; '
+                                 'printf "WPA*02*x\\n" > "$0"; echo "1 hash written"', out, cap], out
+
+    def run_until(done, limit_ms=120_000, probe=None):
+        loop = QEventLoop()
+        timer = QTimer()
+        timer.setInterval(5)
+        timer.timeout.connect(lambda: (probe and probe(), done() and loop.quit()))
+        timer.start()
+        QTimer.singleShot(limit_ms, loop.quit)
+        loop.exec()
+        timer.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caps = []
+        old = time.time_ns() - 3600 * 10 ** 9
+        for i in range(n):
+            cap = os.path.join(tmp, f"cap{i:03d}-01.cap")
+            open(cap, "wb").close()
+            os.utime(cap, ns=(old, old))
+            caps.append(cap)
+        out_dir = os.path.join(tmp, "out")
+        os.mkdir(out_dir)
+        supervisor = ProcessSupervisor.instance()
+
+        # Old behaviour: every click spawns its own process right away.
+        peak = [0]
+        children = [ChildProcess(fake_command(cap, ".legacy", out_dir)[0], sudo_kill=True) for cap in caps]
+        left = [n]
+        for child in children:
+            child.finished.connect(lambda _rc: left.__setitem__(0, left[0] - 1))
+        t0 = time.perf_counter()
+        for child in children:
+            child.start()
+        run_until(lambda: left[0] == 0, probe=lambda: peak.__setitem__(0, max(peak[0], len(supervisor.children()))))
+        legacy = time.perf_counter() - t0
+        print(f"  one process per request: {legacy:6.2f} s, up to {peak[0]} converters at once")
+
+        queue = ConversionQueue(command=fake_command)
+        peak = [0]
+        t0 = time.perf_counter()
+        jobs = queue.submit_many(caps, ".hc22000", out_dir)
+        again = queue.submit_many(caps, ".hc22000", out_dir)     # double clicks
+        assert len(queue.jobs) == n and all(a is b for a, b in zip(jobs, again))
+        run_until(lambda: queue.counts()[0] == n, probe=lambda: peak.__setitem__(0, max(peak[0], len(supervisor.children()))))
+        bounded = time.perf_counter() - t0
+        states = {job.state for job in jobs}
+        assert states == {"done"}, states
+        assert queue.peak_running <= queue.max_workers and peak[0] <= queue.max_workers
+        print(f"  ConversionQueue ({queue.max_workers} worker(s)): {bounded:6.2f} s, "
+              f"up to {peak[0]} converters at once, 500 duplicate submissions dropped")
+
+        t0 = time.perf_counter()
+        skipped = queue.submit_many(caps, ".hc22000", out_dir)
+        assert {job.state for job in skipped} == {"skipped"}
+        print(f"  resubmitting all 500 with current outputs: {(time.perf_counter() - t0) * 1e3:6.1f} ms, all skipped")
+
+        queue = ConversionQueue(command=fake_command)
+        jobs = queue.submit_many(caps, ".hccap", out_dir)
+        run_until(lambda: queue.counts()[0] >= 50)
+        t0 = time.perf_counter()
+        queue.cancel_all()
+        # A job whose converter is still running is not finished yet.
+        assert all(job.state == "cancelling" and not job.finished for job in queue.running_jobs())
+        run_until(lambda: queue.counts()[0] == n and not supervisor.children())
+        counts = collections.Counter(job.state for job in jobs)
+        assert counts["cancelled"] >= n - 50 - queue.max_workers and not supervisor.children(), counts
+        print(f"  cancel all after 50: {dict(counts)}, settled in {(time.perf_counter() - t0) * 1e3:5.0f} ms")
+
+
+def bench_hc22000_merge():
+    """Merging 200 per-capture .hc22000 files (300k lines, ~80% duplicates) into one:
+    cold merge, unchanged re-merge, one appended file, per-BSSID lookup vs an in-memory set."""
+    from engine import HashMerge
+    rnd = random.Random(19)
+    networks = [_mac(n).replace(":", "").lower() for n in range(500)]
+
+    def line(net, k):
+        ap = networks[net]
+        mic = "%032x" % rnd.getrandbits(128) if k < 0 else "%032x" % (net * 1000 + k)
+        return (f"WPA*02*{mic}*{ap}*{_mac(900 + k % 7).replace(':', '').lower()}*"
+                f"{f'net-{net}'.encode().hex()}*{'ab' * 32}*{'0103' * 60}*02\n")
+
+    def write_source(path, first, count):
+        with open(path, "w") as f:
+            for _ in range(count):
+                net = first + rnd.randrange(25)
+                f.write(line(net % 500, rnd.randrange(120)))
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for i in range(200):
+            write_source(os.path.join(out_dir, f"site{i:03d}.hc22000"), (i * 5) % 500, 1500)
+        total = sum(os.path.getsize(os.path.join(out_dir, n)) for n in os.listdir(out_dir))
+
+        merge = HashMerge(out_dir)
+        t0 = time.perf_counter()
+        added, dupes, read = merge.merge()
+        cold = time.perf_counter() - t0
+        assert read == 200 and added + dupes == 300000 and merge.count() == added
+        merged = os.path.join(out_dir, HashMerge.NAME)
+        with open(merged, "rb") as f:
+            lines = f.readlines()
+        assert len(lines) == len(set(lines)) == added
+        merge.close()
+
+        t0 = time.perf_counter()
+        merge = HashMerge(out_dir)
+        assert merge.merge() == (0, 0, 0)
+        idle = time.perf_counter() - t0
+
+        with open(os.path.join(out_dir, "site007.hc22000"), "a") as f:
+            f.write(line(40, 3) + line(41, -1) + line(42, -1))
+        t0 = time.perf_counter()
+        assert merge.merge() == (2, 1, 1)
+        one = time.perf_counter() - t0
+
+        bssid = int(networks[41], 16)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            net_lines = merge.lines(bssid)
+        lookup = (time.perf_counter() - t0) / 20
+        assert net_lines and all(l.split(b"*")[3] == networks[41].encode() for l in net_lines)
+        assert merge.networks()[bssid] == len(net_lines)
+        merge.close()
+
+        def in_memory():
+            seen = set()
+            with open(os.path.join(out_dir, "naive.out"), "wb") as out:
+                for name in sorted(os.listdir(out_dir)):
+                    if name.startswith("site"):
+                        with open(os.path.join(out_dir, name), "rb") as f:
+                            for l in f:
+                                if l not in seen:
+                                    seen.add(l)
+                                    out.write(l)
+            return len(seen)
+
+        t0 = time.perf_counter()
+        assert in_memory() == added + 2
+        naive = time.perf_counter() - t0
+
+        for name in (HashMerge.NAME, HashMerge.NAME + ".idx"):
+            os.remove(os.path.join(out_dir, name))
+        tracemalloc.start()
+        HashMerge(out_dir).merge()
+        merge_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        tracemalloc.start()
+        in_memory()
+        naive_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"  {total / 2 ** 20:.0f} MB in, {added} unique of 300000: cold merge {cold:5.2f} s, "
+          f"unchanged {idle * 1e3:5.1f} ms, one appended file {one * 1e3:5.1f} ms")
+    print(f"  per-BSSID lookup {lookup * 1e3:5.2f} ms ({len(net_lines)} lines); "
+          f"in-memory set {naive:5.2f} s")
+    print(f"  peak Python memory: merge {merge_peak / 2 ** 20:6.2f} MB, in-memory set {naive_peak / 2 ** 20:6.2f} MB")
+
+
+def bench_session():
+    """Session snapshot of a 10k-network / 20k-client survey: GUI-thread cost of recording
+    each scan cycle, then restoring it into a fresh MainWindow without blocking first paint."""
+    from script import MainWindow, ScanModel, ScanTab, SessionStore, StatusBar
+    app = _qapp()
+    cycles = _scan_cycles(10000, 20000, 10, 500)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.db")
+        store = SessionStore(path)
+        tab = ScanTab(StatusBar())
+        tab.session = store
+        write_store = store.write_scan
+        spent = []
+        store.write_scan = lambda *a: (spent.append(time.perf_counter()), write_store(*a),
+                                       spent.append(time.perf_counter() - spent.pop()))
+        for batch in cycles:
+            tab._on_batch(batch)
+        store.write_state({"scan": tab.session_state(), "target": ["00:11:22:00:00:05", "net5", "6"]})
+        t0 = time.perf_counter()
+        store.close()
+        drain = time.perf_counter() - t0
+        size = os.path.getsize(path) + os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") \
+            else os.path.getsize(path)
+        print(f"  record: first cycle {spent[0] * 1e3:5.1f} ms, update cycles max {max(spent[1:]) * 1e3:5.2f} ms "
+              f"on the GUI thread; writer drained {drain * 1e3:5.1f} ms after the last cycle; {size / 2 ** 20:.1f} MB")
+        expected = tab.model.networks()
+
+        t0 = time.perf_counter()
+        state, networks, clients = SessionStore(path).load()
+        load = time.perf_counter() - t0
+        assert networks == expected and len(clients) == tab.model.client_count()
+        model = ScanModel()
+        t0 = time.perf_counter()
+        model.restore(networks, clients)
+        restore = time.perf_counter() - t0
+        replay = ScanModel()
+        t0 = time.perf_counter()
+        replay.apply_batch({"networks": [n for _, n in networks], "clients": clients,
+                            "lost_networks": [], "lost_clients": []})
+        via_batch = time.perf_counter() - t0
+
+        cwd = os.getcwd()
+        os.chdir(tmp)           # the library tab keeps its database in the working directory
+        window = MainWindow()
+        os.chdir(cwd)
+        window.resize(1280, 860)
+        handler = window._on_session_loaded
+        stall = []
+        window._session_loaded.disconnect()
+        window._session_loaded.connect(lambda r: (stall.append(time.perf_counter()), handler(r),
+                                                  stall.append(time.perf_counter() - stall.pop())))
+        t0 = time.perf_counter()
+        window.show()
+        window.open_session(path)
+        app.processEvents()
+        first_paint = time.perf_counter() - t0
+        while window.session is None and time.perf_counter() - t0 < 10:
+            app.processEvents()
+            time.sleep(0.001)
+        restored = time.perf_counter() - t0
+        assert window.scan_tab.model.networks() == expected
+        assert window.status_bar_widget.target_label.text() == "Target: net5  [00:11:22:00:00:05]"
+        window.shutdown()
+        window.close()
+    print(f"  restore: load {load * 1e3:5.1f} ms, model reset {restore * 1e3:5.1f} ms "
+          f"(one apply_batch {via_batch * 1e3:5.1f} ms)")
+    print(f"  MainWindow: first paint {first_paint * 1e3:5.1f} ms, session on screen {restored * 1e3:5.1f} ms, "
+          f"longest GUI-thread step {stall[0] * 1e3:5.1f} ms")
+
+
+def _legacy_banner():
+    """The original AnimatedBanner paint path: every gradient, font and segment per frame."""
+    from PyQt6.QtCore import QPoint, QRect, Qt
+    from PyQt6.QtGui import QBrush, QColor, QFont, QLinearGradient, QPainter, QPen, QRadialGradient
+    from script import PALETTE, AnimatedBanner
+    import math
+
+    class LegacyBanner(AnimatedBanner):
+        def __init__(self):
+            super().__init__()
+            self.particles = [{"x": x, "y": y, "vx": vx, "vy": vy, "r": r, "alpha": alpha, "color": color}
+                              for x, y, vx, vy, r, alpha, color in zip(
+                                  self._px, self._py, self._pvx, self._pvy, self._pr, self._palpha, self._pcolor)]
+
+        def _animate(self):
+            for p in self.particles:
+                p["x"] = (p["x"] + p["vx"]) % 1.0
+                p["y"] = (p["y"] + p["vy"]) % 1.0
+            super()._animate()
+
+        def _draw_sakura_petal(self, painter, cx, cy, size, angle, color):
+            painter.save()
+            painter.translate(cx, cy)
+            painter.rotate(angle)
+            c = QColor(color)
+            for i in range(5):
+                painter.save()
+                painter.rotate(i * 72)
+                grad = QRadialGradient(0, -size * 0.4, size * 0.6)
+                grad.setColorAt(0, c)
+                grad.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
+                painter.setBrush(QBrush(grad))
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.drawEllipse(int(-size * 0.3), int(-size * 0.9), int(size * 0.6), int(size * 0.7))
+                painter.restore()
+            painter.restore()
+
+        def paintEvent(self, event):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            w, h = self.width(), self.height()
+
+            grad = QLinearGradient(0, 0, w, h)
+            grad.setColorAt(0.0, QColor("#0f0f1a"))
+            grad.setColorAt(0.35, QColor(PALETTE["crust"]))
+            grad.setColorAt(0.7, QColor("#1a1030"))
+            grad.setColorAt(1.0, QColor("#0d0d1e"))
+            painter.fillRect(0, 0, w, h, QBrush(grad))
+
+            for st in self.stars:
+                alpha = int(80 + 90 * (0.5 + 0.5 * math.sin(st["phase"])))
+                c = QColor(PALETTE["lavender"])
+                c.setAlpha(alpha)
+                painter.setBrush(QBrush(c))
+                painter.setPen(Qt.PenStyle.NoPen)
+                r = max(1, int(st["r"] * (0.7 + 0.3 * math.sin(st["phase"] * 1.3))))
+                painter.drawEllipse(QPoint(int(st["x"] * w), int(st["y"] * h)), r, r)
+
+            # Wave lines
+            wave_colors = [PALETTE["mauve"], PALETTE["blue"], PALETTE["sapphire"], PALETTE["lavender"]]
+            for i in range(4):
+                amp = 10 + i * 4
+                freq = 0.04 + i * 0.015
+                phase = self.wave_offset * (0.7 + i * 0.3) + i * math.pi / 3
+                c = QColor(wave_colors[i % len(wave_colors)])
+                c.setAlpha(25 + i * 8)
+                painter.setPen(QPen(c, 1.5))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                prev_x = 0
+                prev_y = int(h * 0.6 + amp * math.sin(freq * 0 + phase))
+                for j in range(1, 81):
+                    nx = int(j * w / 80)
+                    ny = int(h * 0.6 + amp * math.sin(freq * nx + phase))
+                    painter.drawLine(prev_x, prev_y, nx, ny)
+                    prev_x, prev_y = nx, ny
+
+            # Particles + connections
+            for p in self.particles:
+                c = QColor(p["color"])
+                c.setAlpha(int(p["alpha"] * 200))
+                grad_p = QRadialGradient(p["x"] * w, p["y"] * h, p["r"] * 4)
+                grad_p.setColorAt(0, c)
+                grad_p.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
+                painter.setBrush(QBrush(grad_p))
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.drawEllipse(QPoint(int(p["x"] * w), int(p["y"] * h)), int(p["r"] * 4), int(p["r"] * 4))
+
+            for i, p1 in enumerate(self.particles):
+                for j, p2 in enumerate(self.particles):
+                    if i >= j:
+                        continue
+                    dx = (p1["x"] - p2["x"]) * w
+                    dy = (p1["y"] - p2["y"]) * h
+                    dist = math.sqrt(dx * dx + dy * dy)
+                    if dist < 90:
+                        c = QColor(PALETTE["mauve"])
+                        c.setAlpha(int(30 * (1 - dist / 90)))
+                        painter.setPen(QPen(c, 0.5))
+                        painter.drawLine(int(p1["x"] * w), int(p1["y"] * h), int(p2["x"] * w), int(p2["y"] * h))
+
+            # Sakura
+            for s in self.sakura:
+                painter.save()
+                painter.setOpacity(s["alpha"])
+                self._draw_sakura_petal(painter, s["x"] * w, s["y"] * h, s["size"], s["angle"], s["color"])
+                painter.restore()
+
+            # Bottom fade overlay
+            overlay = QLinearGradient(0, 0, 0, h)
+            overlay.setColorAt(0, QColor(0, 0, 0, 0))
+            overlay.setColorAt(1, QColor(PALETTE["base"]))
+            painter.fillRect(0, 0, w, h, QBrush(overlay))
+
+            # Title text
+            painter.setFont(QFont("JetBrains Mono", 28, QFont.Weight.Bold))
+            gtext = QLinearGradient(0, 0, w, 0)
+            gtext.setColorAt(0.0, QColor(PALETTE["mauve"]))
+            gtext.setColorAt(0.4, QColor(PALETTE["lavender"]))
+            gtext.setColorAt(0.7, QColor(PALETTE["blue"]))
+            gtext.setColorAt(1.0, QColor(PALETTE["sapphire"]))
+            painter.setPen(QPen(QBrush(gtext), 1))
+            painter.drawText(QRect(0, 38, w, 60), Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter, "NetShade")
+
+            painter.setFont(QFont("JetBrains Mono", 11))
+            painter.setPen(QColor(PALETTE["subtext0"]))
+            painter.drawText(QRect(0, 95, w, 30), Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                             "Wi-Fi Security Testing Framework")
+
+            painter.setFont(QFont("JetBrains Mono", 9))
+            painter.setPen(QColor(PALETTE["overlay0"]))
+            painter.drawText(QRect(0, 125, w, 24), Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                             "Developed by Rupen Maharjan")
+
+            painter.setPen(QPen(QColor(PALETTE["surface1"]), 1))
+            painter.drawLine(0, h - 1, w, h - 1)
+            painter.end()
+
+    return LegacyBanner
+
+
+def bench_banner():
+    """AnimatedBanner frame time at 1280x180 (and 2x pixel ratio), cached layers vs the original repaint."""
+    from PyQt6.QtGui import QImage
+    from script import AnimatedBanner
+    _qapp()
+    frames = 300
+    print(f"{'':>10} {'dpr':>4} {'mean':>9} {'p95':>9} {'max':>9} {'CPU @ 30 ms':>12}")
+    for dpr in (1, 2):
+        for name, cls in (("original", _legacy_banner()), ("cached", AnimatedBanner)):
+            random.seed(21)
+            banner = cls()
+            banner.scheduler.stop()
+            banner.resize(1280, 180)
+            image = QImage(1280 * dpr, 180 * dpr, QImage.Format.Format_ARGB32_Premultiplied)
+            image.setDevicePixelRatio(dpr)
+            times = []
+            for _ in range(frames):
+                banner._animate()
+                t0 = time.perf_counter()
+                banner.render(image)
+                times.append(time.perf_counter() - t0)
+            times.sort()
+            mean = sum(times) / frames
+            print(f"{name:>10} {dpr:>4} {mean * 1e3:>7.2f}ms {times[int(frames * 0.95)] * 1e3:>7.2f}ms "
+                  f"{times[-1] * 1e3:>7.2f}ms {mean / 0.030:>11.0%}")
+            banner.close()
+
+
+def bench_particle_links():
+    """Banner particle links within 90 px: grid neighbor search vs the all-pairs loop,
+    at the original density and denser fields on a 3840x360 banner; then frame time at 3840 px."""
+    from PyQt6.QtGui import QImage
+    from script import AnimatedBanner, neighbor_pairs
+    import math
+    _qapp()
+    rnd = random.Random(22)
+
+    def all_pairs(xs, ys, radius):
+        pairs = []
+        for i, (x1, y1) in enumerate(zip(xs, ys)):
+            for j in range(i + 1, len(xs)):
+                dx, dy = x1 - xs[j], y1 - ys[j]
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist < radius:
+                    pairs.append((i, j, dist))
+        return pairs
+
+    print(f"{'particles':>10} {'pairs':>7} {'all pairs':>10} {'grid':>9}")
+    for n in (22, 66, 200, 1000, 3000):
+        xs = [rnd.uniform(0, 3840) for _ in range(n)]
+        ys = [rnd.uniform(0, 360) for _ in range(n)]
+        grid = neighbor_pairs(xs, ys, 90)
+        assert {(min(i, j), max(i, j)) for i, j, _ in grid} == {(i, j) for i, j, _ in all_pairs(xs, ys, 90)}
+        repeat = 3 if n > 500 else 20
+        brute = _timeit(lambda: all_pairs(xs, ys, 90), repeat)
+        fast = _timeit(lambda: neighbor_pairs(xs, ys, 90), repeat)
+        print(f"{n:>10} {len(grid):>7} {brute * 1e3:>8.2f}ms {fast * 1e3:>7.2f}ms")
+
+    random.seed(22)
+    frames = 200
+    for name, cls in (("original", _legacy_banner()), ("grid", AnimatedBanner)):
+        banner = cls()
+        banner.scheduler.stop()
+        banner.resize(3840, 180)
+        image = QImage(3840, 180, QImage.Format.Format_ARGB32_Premultiplied)
+        banner.render(image)
+        if name == "original":
+            banner.particles += [dict(banner.particles[i % 22], x=rnd.random(), y=rnd.random()) for i in range(44)]
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            banner._animate()
+            banner.render(image)
+        print(f"  3840x180, {banner.particle_count if name == 'grid' else len(banner.particles)} particles, "
+              f"{name}: {(time.perf_counter() - t0) / frames * 1e3:5.2f} ms/frame")
+        banner.close()
+
+
+def bench_animation():
+    """Process CPU of a window holding the banner, 3 s per state: the original free-running
+    30 ms timer vs the animation scheduler when active, idle, on battery, minimized, hidden
+    and in reduced motion."""
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QVBoxLayout, QWidget
+    from script import AnimatedBanner
+    _qapp()
+
+    def window():
+        top = QWidget()
+        banner = AnimatedBanner()
+        QVBoxLayout(top).addWidget(banner)
+        top.resize(1280, 400)
+        top.show()
+        _run_loop(200)
+        return top, banner
+
+    def cpu(seconds=3.0):
+        t0 = time.process_time()
+        _run_loop(int(seconds * 1000))
+        return (time.process_time() - t0) / seconds
+
+    def report(name, banner, load):
+        rate = banner.scheduler.interval
+        print(f"  {name:<22} {load:>6.1%} of a core   "
+              f"{'paused' if rate is None else f'{1000 // rate} fps'}")
+
+    top, banner = window()
+    banner.scheduler.stop()
+    legacy = QTimer(banner)
+    legacy.timeout.connect(banner._animate)
+    legacy.start(30)
+    print(f"  {'original, visible':<22} {cpu():>6.1%} of a core")
+    top.showMinimized()
+    _run_loop(200)
+    print(f"  {'original, minimized':<22} {cpu():>6.1%} of a core")
+    top.close()
+
+    top, banner = window()
+    sched = banner.scheduler
+    report("visible", banner, cpu())
+    sched._last_input -= sched.IDLE_AFTER + 1
+    _run_loop(100)
+    report("idle", banner, cpu())
+    sched.on_battery = True
+    sched.reschedule()
+    report("idle on battery", banner, cpu())
+    sched._last_input = time.monotonic()
+    sched.reschedule()
+    report("on battery", banner, cpu())
+    sched.on_battery = False
+    top.showMinimized()
+    _run_loop(200)
+    assert sched.interval is None
+    report("minimized", banner, cpu())
+    top.showNormal()
+    _run_loop(200)
+    assert sched.interval == sched.ACTIVE
+    top.hide()
+    _run_loop(200)
+    report("hidden", banner, cpu())
+    top.show()
+    sched.set_reduced_motion(True)
+    _run_loop(200)
+    report("reduced motion", banner, cpu())
+    top.close()
+
+
+def bench_startup():
+    """Startup: --startup-timeline phases (median of 5 offscreen launches through the
+    netshade.py launcher), the same launch running script.py directly, and building
+    the main window with only the first tab vs all six tabs."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)     # the launcher exists to use the cache
+
+    def launch(entry, runs=5):
+        phases = collections.defaultdict(list)
+        with tempfile.TemporaryDirectory() as tmp:
+            for _ in range(runs):
+                proc = subprocess.Popen([sys.executable, os.path.join(here, entry), "--startup-timeline"],
+                                        cwd=tmp, env=env, stdout=subprocess.PIPE, text=True)
+                for line in proc.stdout:
+                    parts = line.split()
+                    if len(parts) >= 3 and parts[0] == "[startup]" and parts[-2].replace(".", "").isdigit():
+                        phases[" ".join(parts[1:-2])].append(float(parts[-2]))
+                    if "first frame" in line:
+                        break
+                proc.kill()
+                proc.wait()
+        return {label: sorted(at)[len(at) // 2] for label, at in phases.items()}
+
+    subprocess.run([sys.executable, "-c", "import script"], cwd=here, env=env, check=True)  # warm the cache
+    cached = launch("netshade.py")
+    direct = launch("script.py")
+    print(f"  {'phase (ms since process start)':<36} {'netshade.py':>11} {'script.py':>10}")
+    for label, at in cached.items():
+        print(f"  {label:<36} {at:11.1f} {direct.get(label, float('nan')):10.1f}")
+
+    from script import MainWindow, stylesheet
+    app = _qapp()
+    app.setStyleSheet(stylesheet())
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)           # the library tab keeps its database in the working directory
+        try:
+            MainWindow().shutdown()     # first construction pays for fonts and style sheet parsing
+            t0 = time.perf_counter()
+            lazy = MainWindow()
+            lazy_built = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            eager = MainWindow()
+            for key, _cls, _label in MainWindow._TABS:
+                eager.tab(key)
+            eager_built = time.perf_counter() - t0
+            lazy.shutdown()
+            eager.shutdown()
+        finally:
+            os.chdir(cwd)
+    print(f"  MainWindow(): first tab only {lazy_built * 1e3:5.1f} ms, all six tabs {eager_built * 1e3:5.1f} ms")
+
+
+def bench_headless():
+    """Headless: wall time from launch and peak RSS of the daemon finishing an
+    `interfaces` and a `library` request, against the GUI reaching its first frame
+    (median of 5 offscreen launches each)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    launcher = os.path.join(here, "netshade.py")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    def peak_kb(pid):
+        # VmHWM, not wait4()'s ru_maxrss: that one keeps this process's peak across the exec.
+        with open(f"/proc/{pid}/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+
+    def run(args, until, request=None, runs=5):
+        times, peaks = [], []
+        with tempfile.TemporaryDirectory() as tmp:
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                proc = subprocess.Popen([sys.executable, launcher, *args], cwd=tmp, env=env, text=True,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+                if request:
+                    proc.stdin.write(json.dumps(request) + "\n")
+                    proc.stdin.flush()
+                for line in proc.stdout:
+                    if until in line:
+                        break
+                times.append(time.perf_counter() - t0)
+                peaks.append(peak_kb(proc.pid))
+                proc.kill()
+                proc.wait()
+        return sorted(times)[len(times) // 2] * 1e3, sorted(peaks)[len(peaks) // 2] / 1024
+
+    subprocess.run([sys.executable, "-c", "import script, cli"], cwd=here, env=env, check=True)
+    gui = run(["--startup-timeline"], "first frame")
+    rows = [(f"daemon, {cmd} done", run(["daemon"], '"event":"done"', {"cmd": cmd}))
+            for cmd in ("interfaces", "library")]
+    rows.append(("GUI, first frame", gui))
+    print(f"  {'':<28} {'wall ms':>8} {'peak RSS MB':>12} {'vs GUI':>7}")
+    for label, (ms, mb) in rows:
+        print(f"  {label:<28} {ms:8.1f} {mb:12.1f} {mb / gui[1]:6.0%}")
+
+
+BENCHMARKS = {
+    "csv": bench_csv,
+    "watch": bench_watch,
+    "scan_view": bench_scan_view,
+    "records": bench_records,
+    "history": bench_history,
+    "console": bench_console,
+    "console_flush": bench_console_flush,
+    "console_log": bench_console_log,
+    "inventory": bench_inventory,
+    "nl80211": bench_nl80211,
+    "supervisor": bench_supervisor,
+    "pipe_reader": bench_pipe_reader,
+    "events": bench_events,
+    "handshake": bench_handshake,
+    "capture_index": bench_capture_index,
+    "library": bench_library,
+    "conversion_queue": bench_conversion_queue,
+    "hc22000_merge": bench_hc22000_merge,
+    "session": bench_session,
+    "banner": bench_banner,
+    "particle_links": bench_particle_links,
+    "animation": bench_animation,
+    "startup": bench_startup,
+    "headless": bench_headless,
+}
+
+
+def main(argv):
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"unknown benchmark {name!r}; choose from {', '.join(BENCHMARKS)}")
+        print(f"== {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,602 @@
+"""NetShade without the GUI: one-shot commands and a daemon, over engine.py.
+
+Every command writes JSON lines to stdout, one object per event with at
+least "event", "id" and "ts", and ends with a "done" event carrying the
+exit code. Nothing here imports Qt.
+
+    netshade interfaces [--watch]
+    netshade scan IFACE [--band abg] [--no-history]
+    netshade capture IFACE --bssid MAC --channel N --name NAME [--autostop]
+    netshade deauth IFACE --bssid MAC [--client MAC] [--channel N] [--bursts N]
+    netshade crack CAPTURE --wordlist FILE
+    netshade convert CAPTURE... [--format .hc22000|.hccap] [--out DIR] [--merge]
+    netshade library [--watch]
+    netshade merge [DIR]
+    netshade daemon
+
+The daemon reads requests as JSON lines on stdin, each a command's
+arguments plus "cmd" and an optional "id": {"cmd": "scan", "id": "s1",
+"iface": "wlan0mon"}. {"cmd": "stop", "id": "s1"} stops a job, {"cmd":
+"jobs"} lists them and {"cmd": "quit"} or end of input stops them all
+and exits. Several jobs run at once; their events interleave.
+"""
+import sys
+import os
+import re
+import abc
+import json
+import time
+import signal
+import argparse
+import threading
+
+import engine
+from engine import (
+    CAPTURED_DIR, HISTORY_DB, CAPTURE_LIBRARY_DB, CONVERSION_FORMATS,
+    ChildProcess, AttackProcess, InterfaceInventory, ScanJob, HandshakeMonitor,
+    LibraryJob, CaptureLibrary, ConversionQueue, HashMerge,
+    AirodumpParser, AircrackParser, HandshakeCaptured, Progress, KeyFound, DeauthSent,
+    ToolError, int_to_mac, next_capture_path,
+)
+
+
+# ---------------------------------------------------------------------------
+# JSON shapes
+# ---------------------------------------------------------------------------
+_MAC = re.compile(r"[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}")
+
+
+def _check_mac(value):
+    if not isinstance(value, str) or not _MAC.fullmatch(value):
+        raise ValueError(f"not a MAC address: {value!r}")
+    return value
+
+
+def check_fields(args, fields):
+    """Raises ValueError for a request field of the wrong JSON type.
+
+    `fields` maps names to str, int (a positive integer), bool or [str];
+    missing and null fields are left to REQUIRED.
+    """
+    for name, kind in fields.items():
+        value = args.get(name)
+        if value is None:
+            continue
+        if kind == [str]:
+            ok = isinstance(value, list) and all(isinstance(item, str) for item in value)
+            expected = "a list of strings"
+        elif kind is int:
+            ok = isinstance(value, int) and not isinstance(value, bool) and value > 0
+            expected = "a positive integer"
+        else:
+            ok = isinstance(value, kind)
+            expected = f"a {'boolean' if kind is bool else 'string'}"
+        if not ok:
+            raise ValueError(f"{name} must be {expected}, not {value!r}")
+
+
+def _mac(value):
+    return int_to_mac(value) if isinstance(value, int) else value
+
+
+def network_fields(net):
+    return {"bssid": net.bssid, "ssid": net.ssid, "power": net.power,
+            "channel": net.channel, "privacy": net.privacy, "band": net.band}
+
+
+def client_fields(client):
+    return {"mac": client.bssid, "ap": client.ap_bssid, "power": client.power}
+
+
+def capture_fields(entry):
+    return {"path": entry.path, "size": entry.size, "format": entry.format,
+            "packets": entry.packets, "first": entry.first, "last": entry.last,
+            "ssids": list(entry.ssids), "bssids": [_mac(b) for b in entry.bssids],
+            "crackable": entry.crackable, "eapol": entry.eapol,
+            "hc22000": entry.converted(".hc22000"), "hccap": entry.converted(".hccap")}
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+class Job(abc.ABC):
+    """One running command. Everything runs on the event loop thread.
+
+    start() sets it going; it reports events until finish(rc), which the
+    command calls itself or stop() brings about.
+    """
+
+    REQUIRED = ()
+    FIELDS = {}         # request field -> type, see check_fields()
+
+    def __init__(self, runner, job_id, args):
+        self.runner = runner
+        self.id = job_id
+        self.args = args
+        self.rc = None
+
+    @property
+    def name(self):
+        return COMMANDS_BY_CLASS[type(self)]
+
+    def report(self, event, **fields):
+        self.runner.write({"event": event, "id": self.id, **fields})
+
+    @abc.abstractmethod
+    def start(self):
+        """Sets the command going; raising ends the job with an error and rc 2."""
+
+    def stop(self):
+        self.finish(130)
+
+    def finish(self, rc=0, **fields):
+        if self.rc is not None:
+            return
+        self.rc = rc
+        self.report("done", rc=rc, **fields)
+        self.runner.finished(self)
+
+
+class ProcessJob(Job):
+    """Runs one tool through ChildProcess; output lines are reported only with "verbose"."""
+
+    def _spawn(self, process):
+        self.process = process
+        process.events.connect(self._events)
+        process.finished.connect(self._exited)
+        process.error.connect(self._failed)
+        if self.args.get("verbose"):
+            process.output.connect(lambda line, kind: self.report("output", line=line, kind=kind))
+        process.start()
+
+    def _events(self, events):
+        for event in events:
+            if isinstance(event, ToolError):
+                self.report("error", message=event.message)
+            else:
+                self.on_event(event)
+
+    def on_event(self, event):
+        pass
+
+    def _exited(self, rc):
+        self.finish(130 if self.process.stop_requested else rc)
+
+    def _failed(self, message):
+        self.report("error", message=message)
+        self.finish(127)
+
+    def stop(self):
+        if self.process.isRunning():
+            self.process.stop()
+        else:
+            self.finish(130)
+
+
+class Interfaces(Job):
+    FIELDS = {"watch": bool}
+    inventory = None
+
+    def start(self):
+        watch = self.args.get("watch", False)
+        self.inventory = InterfaceInventory(use_netlink=watch)
+        self.inventory.changed.connect(self._report)
+        self._report(self.inventory.snapshot())
+        if not watch:
+            self.finish()
+
+    def _report(self, snapshot):
+        self.report("interfaces", monitor=engine.monitor_iface(snapshot),
+                    interfaces={iface: {"mode": mode, "driver": driver}
+                                for iface, (mode, driver) in sorted(snapshot.items())})
+
+    def finish(self, rc=0, **fields):
+        if self.inventory:
+            self.inventory.close()
+        super().finish(rc, **fields)
+
+
+class Scan(Job):
+    REQUIRED = ("iface",)
+    FIELDS = {"iface": str, "band": str, "history": bool, "verbose": bool}
+
+    def start(self):
+        history = HISTORY_DB if self.args.get("history", True) else None
+        self.scan = ScanJob(self.args["iface"], self.args.get("band", "abg"), history)
+        self.scan.batch_ready.connect(self._batch)
+        self.scan.raw_output.connect(lambda line: self.report("output", line=line))
+        self.scan.start()
+        self.scan.process.finished.connect(self._exited)
+        self.scan.process.error.connect(lambda message: self.finish(127))
+
+    def _batch(self, batch):
+        for net in batch["networks"]:
+            self.report("network", **network_fields(net))
+        for client in batch["clients"]:
+            self.report("client", **client_fields(client))
+        if batch["lost_networks"] or batch["lost_clients"]:
+            self.report("lost", networks=[int_to_mac(m) for m in batch["lost_networks"]],
+                        clients=[int_to_mac(m) for m in batch["lost_clients"]])
+
+    def _exited(self, rc):
+        self.scan.stop()
+        self.finish(130 if self.scan.process.stop_requested else rc)
+
+    def stop(self):
+        self.scan.stop()
+
+
+class Capture(ProcessJob):
+    REQUIRED = ("iface", "bssid", "channel", "name")
+    FIELDS = {"iface": str, "bssid": str, "channel": int, "name": str, "autostop": bool,
+              "verbose": bool}
+    path = monitor = None
+    complete = False
+
+    def start(self):
+        a = self.args
+        _check_mac(a["bssid"])
+        CAPTURED_DIR.mkdir(exist_ok=True)
+        prefix = CAPTURED_DIR / a["name"]
+        self.path = str(next_capture_path(prefix))
+        self.report("capture", path=self.path)
+        self._spawn(ChildProcess(engine.capture_command(a["bssid"], a["channel"], prefix, a["iface"]),
+                                 sudo_kill=True, parser=AirodumpParser()))
+        self.monitor = HandshakeMonitor(self.path, a["bssid"])
+        self.monitor.progress.connect(self._progress)
+        self.monitor.error.connect(lambda message: self.report("error", message=message))
+        self.monitor.start()
+
+    def on_event(self, event):
+        if isinstance(event, HandshakeCaptured):
+            self.report("handshake", bssid=event.bssid, kind=event.kind)
+
+    def _progress(self, progress):
+        if progress.station is None:
+            return      # nothing from the target yet
+        self.report("eapol", bssid=progress.bssid, station=_mac(progress.station),
+                    messages=list(progress.messages), complete=progress.complete,
+                    pmkid=progress.pmkid)
+        if progress.complete and not self.complete:
+            self.complete = True
+            self.report("verified", path=self.path)
+            if self.args.get("autostop"):
+                self.stop()
+
+    def _exited(self, rc):
+        # Stopped once the handshake is in, by --autostop or by hand, is success.
+        self.finish(0 if self.complete else 130 if self.process.stop_requested else rc)
+
+    def finish(self, rc=0, **fields):
+        if self.monitor:
+            self.monitor.stop()
+        super().finish(rc, path=self.path, verified=self.complete, **fields)
+
+
+class Deauth(ProcessJob):
+    REQUIRED = ("iface", "bssid")
+    FIELDS = {"iface": str, "bssid": str, "client": str, "channel": int, "bursts": int,
+              "verbose": bool}
+    bursts = 0
+
+    def start(self):
+        a = self.args
+        _check_mac(a["bssid"])
+        if a.get("client"):
+            _check_mac(a["client"])
+        if a.get("channel"):
+            engine.set_channel(a["iface"], a["channel"])
+        self._spawn(AttackProcess(engine.deauth_command(a["bssid"], a["iface"], a.get("client", ""))))
+
+    def on_event(self, event):
+        if isinstance(event, DeauthSent):
+            self.bursts += 1
+            self.report("deauth", ap=_mac(event.ap), station=_mac(event.station), acks=event.acks)
+            if self.bursts == self.args.get("bursts"):
+                self.stop()
+
+    def _exited(self, rc):
+        # aireplay-ng --deauth 0 only ends when killed; a requested stop is success.
+        self.finish(0 if self.process.stop_requested else rc, bursts=self.bursts)
+
+
+class Crack(ProcessJob):
+    REQUIRED = ("capture", "wordlist")
+    FIELDS = {"capture": str, "wordlist": str, "verbose": bool}
+    PROGRESS_INTERVAL = 1.0
+    key = None
+
+    def start(self):
+        a = self.args
+        for path in (a["capture"], a["wordlist"]):
+            if not os.path.isfile(path):
+                raise ValueError(f"no such file: {path}")
+        self._last = 0.0
+        self._spawn(ChildProcess(engine.crack_command(a["capture"], a["wordlist"]),
+                                 sudo_kill=True, parser=AircrackParser()))
+
+    def on_event(self, event):
+        if isinstance(event, KeyFound):
+            self.key = event.key
+            self.report("key", key=event.key)
+        elif isinstance(event, Progress):
+            # aircrack-ng redraws many times a second; one line a second is plenty.
+            now = time.monotonic()
+            if now - self._last >= self.PROGRESS_INTERVAL:
+                self._last = now
+                self.report("progress", tested=event.tested, total=event.total,
+                            rate=event.rate, elapsed=event.elapsed)
+
+    def finish(self, rc=0, **fields):
+        super().finish(rc, found=self.key is not None, **fields)
+
+
+class Convert(Job):
+    REQUIRED = ("captures",)
+    FIELDS = {"captures": [str], "format": str, "out": str, "workers": int, "merge": bool}
+
+    def start(self):
+        a = self.args
+        fmt = a.get("format", ".hc22000")
+        if fmt not in CONVERSION_FORMATS:
+            raise ValueError(f"unknown format {fmt!r}; one of {', '.join(CONVERSION_FORMATS)}")
+        self.out_dir = a.get("out") or str(CAPTURED_DIR.resolve())
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.queue = ConversionQueue(max_workers=a.get("workers"))
+        self.queue.job_changed.connect(self._changed)
+        self._states = {}
+        self.jobs = None
+        self.jobs = self.queue.submit_many(a["captures"], fmt, self.out_dir)
+        if all(job.finished for job in self.jobs):
+            self._all_finished()     # all skipped, or failed to start
+
+    def _changed(self, job):
+        if self._states.get(id(job)) == job.state:
+            return      # output line only
+        self._states[id(job)] = job.state
+        self.report("conversion", capture=job.cap, format=job.fmt, output=job.out,
+                    state=job.state, detail=job.detail, rc=job.rc)
+        if self.jobs is not None and self.rc is None and all(j.finished for j in self.jobs):
+            self._all_finished()
+
+    def _all_finished(self):
+        failed = sum(1 for job in self.jobs if job.state in ("failed", "cancelled"))
+        if self.args.get("merge") and any(job.fmt == ".hc22000" for job in self.jobs):
+            merge_into(self, self.out_dir)
+        self.finish(1 if failed else 0)
+
+    def stop(self):
+        self.queue.cancel_all()
+
+
+def merge_into(job, directory):
+    merge = HashMerge(directory)
+    try:
+        added, dupes, read = merge.merge()
+        job.report("merged", path=merge.path, added=added, duplicates=dupes, sources=read,
+                   total=merge.count(), networks=len(merge.networks()))
+    finally:
+        merge.close()
+
+
+class Merge(Job):
+    FIELDS = {"directory": str}
+
+    def start(self):
+        merge_into(self, self.args.get("directory") or str(CAPTURED_DIR))
+        self.finish()
+
+
+class Library(Job):
+    FIELDS = {"watch": bool}
+
+    def start(self):
+        CAPTURED_DIR.mkdir(exist_ok=True)
+        if not self.args.get("watch"):
+            library = CaptureLibrary(CAPTURE_LIBRARY_DB, CAPTURED_DIR)
+            try:
+                library.sync()
+                self._changed(library.entries(), [])
+            finally:
+                library.close()
+            self.finish()
+            return
+        self.library = LibraryJob(CAPTURE_LIBRARY_DB, CAPTURED_DIR)
+        self.library.changed.connect(self._changed)
+        self.library.error.connect(lambda message: (self.report("error", message=message),
+                                                    self.finish(1)))
+        self.library.start()
+
+    def _changed(self, entries, removed):
+        for entry in entries:
+            self.report("capture", **capture_fields(entry))
+        for path in removed:
+            self.report("removed", path=path)
+
+    def stop(self):
+        self.library.stop()
+        self.finish(0)
+
+
+COMMANDS = {
+    "interfaces": Interfaces, "scan": Scan, "capture": Capture, "deauth": Deauth,
+    "crack": Crack, "convert": Convert, "library": Library, "merge": Merge,
+}
+COMMANDS_BY_CLASS = {cls: name for name, cls in COMMANDS.items()}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+class Runner:
+    """Starts jobs from request dicts and writes every event as one JSON line.
+
+    With `daemon` false the loop stops once the last job is done; the
+    process exits with that job's code.
+    """
+
+    def __init__(self, loop, out=sys.stdout, daemon=False):
+        self.loop = loop
+        self.out = out
+        self.daemon = daemon
+        self.jobs = {}
+        self.rc = 0
+        self.quitting = False
+        self._next_id = 0
+
+    def write(self, obj):
+        obj["ts"] = round(time.time(), 3)
+        try:
+            self.out.write(json.dumps(obj, separators=(",", ":")) + "\n")
+            self.out.flush()
+        except BrokenPipeError:
+            # Nobody is reading any more: stop the tools rather than run blind.
+            self.out = open(os.devnull, "w")
+            self.quit()
+
+    def error(self, message, job_id=None):
+        self.write({"event": "error", "id": job_id, "message": message})
+
+    def request(self, req):
+        if not isinstance(req, dict):
+            return self.error("request must be a JSON object")
+        cmd, job_id = req.get("cmd"), req.get("id")
+        if cmd == "stop":
+            job = self.jobs.get(job_id)
+            return job.stop() if job else self.error(f"no running job {job_id!r}", job_id)
+        if cmd == "jobs":
+            return self.write({"event": "jobs", "id": job_id,
+                               "jobs": [{"id": j.id, "cmd": j.name} for j in self.jobs.values()]})
+        if cmd == "quit":
+            return self.quit()
+        cls = COMMANDS.get(cmd)
+        if cls is None:
+            return self.error(f"unknown command {cmd!r}", job_id)
+        if self.quitting:
+            return self.error("shutting down", job_id)
+        missing = [name for name in cls.REQUIRED if req.get(name) in (None, "", [])]
+        if missing:
+            return self.error(f"{cmd}: missing {', '.join(missing)}", job_id)
+        if job_id is None:
+            self._next_id += 1
+            job_id = f"{cmd}-{self._next_id}"
+        if job_id in self.jobs:
+            return self.error(f"job {job_id!r} is already running", job_id)
+        job = cls(self, job_id, req)
+        self.jobs[job_id] = job
+        self.write({"event": "started", "id": job_id, "cmd": cmd})
+        try:
+            check_fields(req, cls.FIELDS)
+            job.start()
+        except Exception as e:
+            # Whatever the engine raised, the job must end with "done" and leave the table.
+            message = str(e) if isinstance(e, (OSError, ValueError)) else f"{type(e).__name__}: {e}"
+            job.report("error", message=message)
+            job.finish(2)
+
+    def finished(self, job):
+        self.jobs.pop(job.id, None)
+        self.rc = job.rc
+        if not self.jobs and (self.quitting or not self.daemon):
+            self.loop.stop()
+
+    def quit(self):
+        """Stops every job; the loop ends once the last one has finished."""
+        self.quitting = True
+        if not self.jobs:
+            self.loop.stop()
+        for job in list(self.jobs.values()):
+            job.stop()
+
+
+def _read_requests(stream, runner):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+        except ValueError as e:
+            runner.loop.call(runner.error, f"bad request: {e}")
+            continue
+        runner.loop.call(runner.request, req)
+    runner.loop.call(runner.quit)
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="netshade", description="NetShade without the GUI; "
+                                     "events are written to stdout as JSON lines.")
+    sub = parser.add_subparsers(dest="cmd", required=True, metavar="COMMAND")
+
+    p = sub.add_parser("interfaces", help="list wireless interfaces")
+    p.add_argument("--watch", action="store_true", help="keep reporting changes")
+
+    p = sub.add_parser("scan", help="stream networks and clients airodump-ng sees")
+    p.add_argument("iface")
+    p.add_argument("--band", default="abg")
+    p.add_argument("--no-history", dest="history", action="store_false",
+                   help=f"do not record to {HISTORY_DB}")
+    p.add_argument("--verbose", action="store_true")
+
+    p = sub.add_parser("capture", help="capture one network's handshake")
+    p.add_argument("iface")
+    p.add_argument("--bssid", required=True)
+    p.add_argument("--channel", required=True, type=int)
+    p.add_argument("--name", required=True, help=f"file name prefix under {CAPTURED_DIR}/")
+    p.add_argument("--autostop", action="store_true",
+                   help="stop once the capture holds a crackable handshake or PMKID")
+    p.add_argument("--verbose", action="store_true")
+
+    p = sub.add_parser("deauth", help="deauthenticate clients of a network")
+    p.add_argument("iface")
+    p.add_argument("--bssid", required=True)
+    p.add_argument("--client", default="")
+    p.add_argument("--channel", type=int)
+    p.add_argument("--bursts", type=int, help="stop after this many bursts")
+    p.add_argument("--verbose", action="store_true")
+
+    p = sub.add_parser("crack", help="run a wordlist against a capture")
+    p.add_argument("capture")
+    p.add_argument("--wordlist", required=True)
+    p.add_argument("--verbose", action="store_true")
+
+    p = sub.add_parser("convert", help="convert captures for Hashcat or John the Ripper")
+    p.add_argument("captures", nargs="+")
+    p.add_argument("--format", default=".hc22000", choices=list(CONVERSION_FORMATS))
+    p.add_argument("--out", help=f"output directory (default {CAPTURED_DIR}/)")
+    p.add_argument("--workers", type=int)
+    p.add_argument("--merge", action="store_true", help="merge the .hc22000 files afterwards")
+
+    p = sub.add_parser("library", help=f"index the captures in {CAPTURED_DIR}/")
+    p.add_argument("--watch", action="store_true", help="keep reporting changes")
+
+    p = sub.add_parser("merge", help="merge .hc22000 files into one deduplicated file")
+    p.add_argument("directory", nargs="?")
+
+    sub.add_parser("daemon", help="run requests read as JSON lines from stdin")
+    return parser
+
+
+def main(argv=None):
+    args = vars(build_parser().parse_args(argv))
+    loop = engine.event_loop()
+    runner = Runner(loop, daemon=args["cmd"] == "daemon")
+
+    def interrupt(signum, frame):
+        loop.call(runner.quit)
+    signal.signal(signal.SIGINT, interrupt)
+    signal.signal(signal.SIGTERM, interrupt)
+
+    if runner.daemon:
+        threading.Thread(target=_read_requests, args=(sys.stdin, runner), daemon=True).start()
+    else:
+        loop.call(runner.request, args)
+    loop.run()
+    return runner.rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2990 @@
+"""NetShade engine: scanning, capture, attacks, conversion and the capture
+library, with no Qt in sight.
+
+Everything here runs on the standard library. Results come back through
+Signal attributes that deliver on one event loop thread: script.py (the
+GUI) points them at the Qt event loop, cli.py (the `netshade` command and
+daemon) runs an EventLoop.
+"""
+import sys
+import os
+import subprocess
+import threading
+import time
+import re
+import shutil
+import tempfile
+import select
+import selectors
+import signal
+import errno
+import socket
+import mmap
+import sqlite3
+import queue
+import heapq
+import collections
+import struct
+import json
+import hashlib
+from pathlib import Path
+
+
+CAPTURED_DIR = Path("captured")
+HISTORY_DB = Path("scan_history.db")
+CAPTURE_LIBRARY_DB = Path("capture_library.db")
+
+
+# ---------------------------------------------------------------------------
+# Signals and the event loop
+# ---------------------------------------------------------------------------
+class Signal:
+    """The engine's pyqtSignal: declared on the class, bound per instance.
+
+    emit() hands its arguments to the event loop, which calls the slots
+    connected at that moment: right away when emit() runs on the loop's own
+    thread, queued otherwise, as a Qt AutoConnection does. The types given
+    are documentation only.
+    """
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__[self.name] = BoundSignal()
+        return bound
+
+
+class BoundSignal:
+    __slots__ = ("_slots", "_direct")
+
+    def __init__(self):
+        self._slots = []
+        self._direct = []
+
+    def connect(self, slot, direct=False):
+        """Connects a callable, or anything with an emit() such as a Qt signal.
+        A direct slot runs on the emitting thread, like a Qt DirectConnection."""
+        (self._direct if direct else self._slots).append(slot if callable(slot) else slot.emit)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._slots.clear()
+            self._direct.clear()
+            return
+        slot = slot if callable(slot) else slot.emit
+        (self._direct if slot in self._direct else self._slots).remove(slot)
+
+    def emit(self, *args):
+        for slot in self._direct:
+            slot(*args)
+        if self._slots:
+            _loop.post(tuple(self._slots), args)
+
+    __call__ = emit
+
+
+class EventLoop:
+    """Runs signal deliveries and timers on the thread that created it.
+
+    The GUI swaps in a loop that posts to Qt's instead (set_event_loop());
+    anything with the same post(slots, args) and call(fn, *args) will do.
+    """
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self._queue = queue.SimpleQueue()
+        self._timers = []       # heap of (deadline, sequence, fn, args)
+        self._sequence = 0
+
+    def post(self, slots, args):
+        if threading.get_ident() == self.thread:
+            self.deliver(slots, args)
+        else:
+            self._queue.put((slots, args))
+
+    def call(self, fn, *args):
+        """Queues fn to run on the loop thread; safe from any thread or signal handler."""
+        self._queue.put(((fn,), args))
+
+    def call_later(self, delay, fn, *args):
+        """Runs fn on the loop thread after `delay` seconds; call from the loop thread."""
+        self._sequence += 1
+        heapq.heappush(self._timers, (time.monotonic() + delay, self._sequence, fn, args))
+
+    def deliver(self, slots, args):
+        for slot in slots:
+            try:
+                slot(*args)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+
+    def stop(self):
+        self._queue.put(None)
+
+    def run(self):
+        """Delivers until stop(); returns once everything queued before it has run."""
+        while True:
+            timeout = None
+            while self._timers:
+                deadline, _, fn, args = self._timers[0]
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    break
+                heapq.heappop(self._timers)
+                timeout = None
+                self.deliver((fn,), args)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            self.deliver(*item)
+
+
+_loop = EventLoop()
+
+
+def event_loop():
+    return _loop
+
+
+def set_event_loop(loop):
+    """Makes `loop` deliver every signal emitted from now on."""
+    global _loop
+    _loop = loop
+
+
+# ---------------------------------------------------------------------------
+# Pipe reader
+# ---------------------------------------------------------------------------
+class PipeReader:
+    """Turns raw pipe chunks into clean text lines and screen frames.
+
+    Chunks are cut after their last CR or LF; the remainder waits for the
+    next chunk, so escape sequences and UTF-8 are never split. ANSI/VT100
+    sequences and stray control bytes go in one regex pass over the bytes.
+    A cursor-home or clear-screen sequence starts a redraw frame, as drawn
+    by airodump-ng and aircrack-ng. Only the latest frame is kept, so a
+    burst of redraws costs one update instead of a screenful of lines each.
+    """
+
+    MAX_FRAME_LINES = 200
+
+    # Clear screen / cursor home: the start of a redraw. Once seen, the exact
+    # sequence a program uses is searched for as a plain substring.
+    _HOME = re.compile(rb"\x1b\[(?:2J|[01]?;?[01]?H)")
+    # Any other cursor positioning moves to a new row.
+    _MOVE = re.compile(rb"\x1b\[\d*;?\d*[Hf]")
+    _ANSI = re.compile(
+        rb"\x1b(?:\[[0-?]*[ -/]*[@-~]"           # CSI
+        rb"|\][^\x07\x1b]*(?:\x07|\x1b\\)"        # OSC
+        rb"|[()*+][0-9A-Za-z]"                   # charset designation
+        rb"|[@-Z\\-_])")                         # two-byte escapes
+    # Whatever control bytes the escapes leave behind, bar TAB and the line breaks.
+    _CONTROL = bytes(set(range(0x20)) - {0x09, 0x0a, 0x0d}) + b"\x7f"
+
+    def __init__(self):
+        self._home = None
+        self._partial = b""
+        self._frame = None
+
+    def feed(self, data, final=False):
+        """Returns (lines, frame): new lines outside any redraw, and the latest
+        frame as a list of lines if this chunk changed it, else None."""
+        data = self._partial + data
+        cut = len(data) if final else max(data.rfind(b"\n"), data.rfind(b"\r")) + 1
+        self._partial = data[cut:]
+        if not cut:
+            return [], None
+        body = data[:cut]
+        # Only the text before the first redraw and after the last one matters.
+        if self._home is None:
+            m = self._HOME.search(body)
+            if m:
+                self._home = m.group()
+        first = body.find(self._home) if self._home else -1
+        head = body[:first] if first >= 0 else body
+        lines, frame = [], None
+        if self._frame is None:
+            lines = self._lines(head)
+        elif head:
+            frame = self._frame
+            frame.extend(self._lines(head))
+        if first >= 0:
+            tail = body.rfind(self._home) + len(self._home)
+            frame = self._frame = self._lines(body[tail:])
+        if frame is not None and len(frame) > self.MAX_FRAME_LINES:
+            del frame[:-self.MAX_FRAME_LINES]
+        return lines, (list(frame) if frame else None)
+
+    def _lines(self, data):
+        data = self._ANSI.sub(b"", self._MOVE.sub(b"\n", data)).translate(None, self._CONTROL)
+        return [line for line in (raw.decode(errors="replace").rstrip()
+                                  for raw in data.splitlines()) if line]
+
+
+# ---------------------------------------------------------------------------
+# Process supervisor
+# ---------------------------------------------------------------------------
+class ProcessSupervisor:
+    """Runs the pipes of every child process from one thread.
+
+    A selector watches all child stdout pipes, a pidfd per child (so exits
+    are seen even while a grandchild holds the pipe open) and a wake-up pipe
+    for spawn/stop requests. Each read is handed to the owning ChildProcess,
+    whose PipeReader splits it, and relayed to the event loop as one queued
+    signal. Children are reaped with wait4() so their CPU time and
+    peak RSS are known, and stop() escalates to SIGKILL after GRACE seconds
+    without blocking anyone. Without pidfds, exits are polled every POLL
+    seconds once the pipe closes or a stop was requested.
+    """
+
+    GRACE = 3.0
+    POLL = 0.1
+    READ_SIZE = 64 * 1024
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.spawned = 0
+        self._selector = selectors.DefaultSelector()
+        self._requests = queue.SimpleQueue()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._children = {}     # pid -> ChildProcess, until reaped
+        self._reaping = set()   # stdout closed, not reaped yet
+        self._kill_at = {}      # ChildProcess -> SIGKILL deadline
+        threading.Thread(target=self._loop, name="process-supervisor", daemon=True).start()
+
+    def spawn(self, child):
+        self._post("spawn", child)
+
+    def stop(self, child):
+        self._post("stop", child)
+
+    def children(self):
+        """The children not reaped yet."""
+        return list(self._children.values())
+
+    def stats(self):
+        return [child.usage() for child in self.children()]
+
+    def _post(self, op, child):
+        self._requests.put((op, child))
+        os.write(self._wake_w, b"x")
+
+    def _loop(self):
+        while True:
+            timeout = self.POLL if self._reaping or self._kill_at else None
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    self._handle_requests()
+                    continue
+                child, is_exit = key.data
+                if is_exit:
+                    self._reap(child)
+                elif child.process.stdout is not None and not self._read(child):
+                    self._reap(child)
+            now = time.monotonic()
+            for child, deadline in list(self._kill_at.items()):
+                if now >= deadline:
+                    del self._kill_at[child]
+                    self._signal(child, "KILL")
+            for child in list(self._reaping):
+                self._reap(child)
+
+    def _handle_requests(self):
+        try:
+            os.read(self._wake_r, 4096)
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                op, child = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if op == "spawn":
+                self._spawn(child)
+            elif op == "stop":
+                self._stop(child)
+
+    def _spawn(self, child):
+        if child.stop_requested:
+            child._exited(-signal.SIGTERM, None)
+            return
+        try:
+            proc = subprocess.Popen(child.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    shell=child.shell, bufsize=0)
+        except Exception as e:
+            child._failed(str(e))
+            return
+        os.set_blocking(proc.stdout.fileno(), False)
+        self.spawned += 1
+        self._children[proc.pid] = child
+        child._started(proc)
+        self._selector.register(proc.stdout, selectors.EVENT_READ, (child, False))
+        try:
+            child._pidfd = os.pidfd_open(proc.pid)
+            self._selector.register(child._pidfd, selectors.EVENT_READ, (child, True))
+        except (AttributeError, OSError):
+            child._pidfd = None
+
+    def _read(self, child):
+        """Feeds one read to the child; True while the pipe stays open."""
+        stdout = child.process.stdout
+        try:
+            data = os.read(stdout.fileno(), self.READ_SIZE)
+        except BlockingIOError:
+            return True
+        except OSError:
+            data = b""
+        if data:
+            child._feed(data)
+            return True
+        self._selector.unregister(stdout)
+        stdout.close()
+        child.process.stdout = None
+        child._feed(b"", final=True)
+        return False
+
+    def _close_pipe(self, child):
+        """Drains what the exited child left in the pipe, then closes it."""
+        if child.process.stdout is None:
+            return
+        while self._read(child):
+            try:
+                if not select.select([child.process.stdout], [], [], 0)[0]:
+                    break
+            except (OSError, ValueError):
+                break
+        stdout = child.process.stdout
+        if stdout is not None:
+            self._selector.unregister(stdout)
+            stdout.close()
+            child.process.stdout = None
+            child._feed(b"", final=True)
+
+    def _reap(self, child):
+        if child.pid not in self._children:
+            return
+        try:
+            pid, status, rusage = os.wait4(child.pid, os.WNOHANG)
+        except ChildProcessError:
+            pid, status, rusage = child.pid, 0, None
+        if pid == 0:
+            if child._pidfd is None:
+                self._reaping.add(child)
+            return
+        self._close_pipe(child)
+        if child._pidfd is not None:
+            self._selector.unregister(child._pidfd)
+            os.close(child._pidfd)
+            child._pidfd = None
+        self._reaping.discard(child)
+        self._kill_at.pop(child, None)
+        self._children.pop(child.pid, None)
+        rc = os.waitstatus_to_exitcode(status)
+        child.process.returncode = rc
+        child._exited(rc, rusage)
+
+    def _stop(self, child):
+        if child.process is None or child.pid not in self._children:
+            return
+        self._signal(child, child.stop_signal)
+        if child.stop_signal != "KILL":
+            self._kill_at[child] = time.monotonic() + self.GRACE
+        if child._pidfd is None:
+            self._reaping.add(child)
+
+    def _signal(self, child, name):
+        if child.sudo_kill:
+            # The child runs as root: signal it through sudo, reaped like any other child.
+            # os.kill() is only the fallback for when sudo itself cannot be started.
+            killer = ChildProcess(["sudo", "kill", f"-{name}", str(child.pid)])
+            self._spawn(killer)
+            if killer.pid is not None:
+                return
+        try:
+            os.kill(child.pid, getattr(signal, "SIG" + name))
+        except OSError:
+            pass
+
+
+class ChildProcess:
+    """One supervised command: start() it and connect to its line output.
+
+    `output(line, kind)`, `frame(lines)`, `events(list)`, `finished(returncode)`
+    and `error(message)` are delivered on the event loop thread (see Signal).
+    frame carries the latest full-screen redraw; redraws that arrive while
+    one is still queued replace it. With a ToolParser, lines and frames are
+    parsed on the supervisor thread: events carries what it found and lines
+    it flagged as errors arrive with kind "error" instead of "raw". Commands run through
+    sudo set `sudo_kill` so stop() can signal them at all.
+    """
+
+    output = Signal(str, str)
+    frame = Signal(list)
+    events = Signal(list)
+    finished = Signal(int)
+    error = Signal(str)
+    _lines = Signal(list)
+    _events = Signal(list)
+    _frame_ready = Signal()
+    _done = Signal(int)
+    _fail = Signal(str)
+
+    stop_signal = "TERM"
+
+    # Started children stay referenced until their exit reaches the event loop.
+    _live = set()
+
+    def __init__(self, cmd, shell=False, sudo_kill=False, parser=None):
+        self.cmd = cmd
+        self.shell = shell
+        self.sudo_kill = sudo_kill
+        self.parser = parser
+        self.process = None
+        self.pid = None
+        self.returncode = None
+        self.rusage = None
+        self.started_at = self.ended_at = None
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.stop_requested = False
+        self._pidfd = None
+        self._reader = PipeReader()
+        self._latest_frame = None
+        self._frame_lock = threading.Lock()
+        self._exit = threading.Event()
+        self._lines.connect(self._emit_lines)
+        self._events.connect(self.events)
+        self._frame_ready.connect(self._emit_frame)
+        self._done.connect(self._on_done)
+        self._fail.connect(self._on_fail)
+
+    def start(self):
+        self._live.add(self)
+        ProcessSupervisor.instance().spawn(self)
+
+    def stop(self):
+        self.stop_requested = True
+        ProcessSupervisor.instance().stop(self)
+
+    def isRunning(self):
+        return self in self._live and not self._exit.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the child has been reaped; False on timeout."""
+        return self._exit.wait(timeout)
+
+    def usage(self):
+        """Lifecycle and resource figures; CPU and RSS are read from /proc while running."""
+        cpu = rss = None
+        if self.rusage is not None:
+            cpu = self.rusage.ru_utime + self.rusage.ru_stime
+            rss = self.rusage.ru_maxrss
+        elif self.pid is not None and not self._exit.is_set():
+            try:
+                with open(f"/proc/{self.pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+                rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE") // 1024
+            except (OSError, IndexError, ValueError):
+                pass
+        end = self.ended_at or time.monotonic()
+        return {
+            "cmd": self.cmd, "pid": self.pid, "returncode": self.returncode,
+            "state": "exited" if self._exit.is_set() else "running" if self.pid else "starting",
+            "runtime_s": end - self.started_at if self.started_at else 0.0,
+            "cpu_s": cpu, "rss_kb": rss, "bytes": self.bytes_read, "lines": self.lines_read,
+        }
+
+    # Everything below runs on the supervisor thread.
+    def _started(self, proc):
+        self.process = proc
+        self.pid = proc.pid
+        self.started_at = time.monotonic()
+
+    def _accept(self, line, kind):
+        return bool(line)
+
+    def _feed(self, data, final=False):
+        self.bytes_read += len(data)
+        lines, frame = self._reader.feed(data, final)
+        if self.stop_requested:
+            return
+        errors = ()
+        if self.parser is not None:
+            events = self.parser.parse(lines) if lines else []
+            if frame is not None:
+                events += self.parser.parse(frame)
+            if events:
+                errors = {e.message for e in events if isinstance(e, ToolError)}
+                self._events.emit(events)
+        lines = [(line, "error" if errors and line.strip() in errors else "raw") for line in lines]
+        lines = [item for item in lines if self._accept(*item)]
+        if lines:
+            self.lines_read += len(lines)
+            self._lines.emit(lines)
+        if frame is not None:
+            with self._frame_lock:
+                queued = self._latest_frame is not None
+                self._latest_frame = frame
+            if not queued:
+                self._frame_ready.emit()
+
+    def _exited(self, rc, rusage):
+        self.returncode = rc
+        self.rusage = rusage
+        self.ended_at = time.monotonic()
+        self._exit.set()
+        self._done.emit(rc)
+
+    def _failed(self, message):
+        self.ended_at = time.monotonic()
+        self._exit.set()
+        self._fail.emit(message)
+
+    # Event loop thread.
+    def _emit_lines(self, lines):
+        for line, kind in lines:
+            self.output.emit(line, kind)
+
+    def _emit_frame(self):
+        with self._frame_lock:
+            frame, self._latest_frame = self._latest_frame, None
+        if frame is not None:
+            self.frame.emit(frame)
+
+    def _on_done(self, rc):
+        self._live.discard(self)
+        self.finished.emit(rc)
+
+    def _on_fail(self, message):
+        self._live.discard(self)
+        self.error.emit(message)
+
+
+# ---------------------------------------------------------------------------
+# nl80211 over generic netlink
+# ---------------------------------------------------------------------------
+SYS_CLASS_NET = "/sys/class/net"
+
+# nl80211_iftype values, named the way `iw dev` prints them.
+NL80211_IFTYPES = {
+    1: "ibss", 2: "managed", 3: "ap", 4: "ap/vlan", 5: "wds", 6: "monitor",
+    7: "mesh point", 8: "p2p-client", 9: "p2p-go", 10: "p2p-device", 11: "ocb", 12: "nan",
+}
+
+
+def freq_to_channel(freq):
+    if freq == 2484:
+        return 14
+    if 2412 <= freq < 2484:
+        return (freq - 2407) // 5
+    if 4910 <= freq <= 4980:
+        return (freq - 4000) // 5
+    if 5000 <= freq < 5950:
+        return (freq - 5000) // 5
+    if 5955 <= freq <= 7115:
+        return (freq - 5950) // 5
+    return 0
+
+
+def sysfs_driver(iface, root=SYS_CLASS_NET):
+    try:
+        return os.path.basename(os.readlink(os.path.join(root, iface, "device", "driver")))
+    except OSError:
+        return "Unknown"
+
+
+class Nl80211:
+    """Generic-netlink client for the nl80211 interface and wiphy dumps.
+
+    interfaces() answers with one NL80211_CMD_GET_INTERFACE dump: name,
+    ifindex, wiphy, type, frequency/channel and MAC for every wireless
+    interface, with the driver taken from sysfs. Anything that goes wrong
+    (no netlink, no cfg80211, a timeout) raises OSError so callers can fall
+    back to the iw/iwconfig parsers. `sock` may be any object with send()
+    and recv(), which is how recorded responses are replayed.
+    """
+
+    NETLINK_GENERIC = 16
+    NLM_F_REQUEST = 0x1
+    NLM_F_MULTI = 0x2
+    NLM_F_DUMP = 0x300
+    NLMSG_ERROR = 2
+    NLMSG_DONE = 3
+    GENL_ID_CTRL = 0x10
+    CTRL_CMD_GETFAMILY = 3
+    CTRL_ATTR_FAMILY_ID = 1
+    CTRL_ATTR_FAMILY_NAME = 2
+    CMD_GET_WIPHY = 1
+    CMD_GET_INTERFACE = 5
+    ATTR_WIPHY = 1
+    ATTR_WIPHY_NAME = 2
+    ATTR_IFINDEX = 3
+    ATTR_IFNAME = 4
+    ATTR_IFTYPE = 5
+    ATTR_MAC = 6
+    ATTR_WIPHY_FREQ = 38
+    ATTR_SPLIT_WIPHY_DUMP = 174
+
+    TIMEOUT = 1.0
+    RECV_SIZE = 1 << 16
+    _HDR = struct.Struct("=IHHII")
+    _GENL = struct.Struct("=BBH")
+    _ATTR = struct.Struct("=HH")
+    _U32 = struct.Struct("=I")
+
+    def __init__(self, sock=None, sysfs=SYS_CLASS_NET):
+        self.sysfs = sysfs
+        self._sock = sock
+        self._seq = 0
+        self._family = None
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    # -- wire format -------------------------------------------------------
+    @classmethod
+    def attr(cls, atype, data):
+        pad = -len(data) % 4
+        return cls._ATTR.pack(cls._ATTR.size + len(data), atype) + data + b"\0" * pad
+
+    @classmethod
+    def message(cls, mtype, flags, seq, payload):
+        return cls._HDR.pack(cls._HDR.size + len(payload), mtype, flags, seq, 0) + payload
+
+    @classmethod
+    def messages(cls, buf):
+        """Yields (type, flags, seq, payload) for every netlink message in `buf`."""
+        offset = 0
+        while offset + cls._HDR.size <= len(buf):
+            length, mtype, flags, seq, _pid = cls._HDR.unpack_from(buf, offset)
+            if length < cls._HDR.size:
+                break
+            yield mtype, flags, seq, buf[offset + cls._HDR.size:offset + length]
+            offset += (length + 3) & ~3
+
+    @classmethod
+    def attrs(cls, buf):
+        """Returns {type: payload} for the attributes in `buf`."""
+        attrs = {}
+        offset = 0
+        while offset + cls._ATTR.size <= len(buf):
+            length, atype = cls._ATTR.unpack_from(buf, offset)
+            if length < cls._ATTR.size:
+                break
+            attrs[atype & 0x3fff] = buf[offset + cls._ATTR.size:offset + length]
+            offset += (length + 3) & ~3
+        return attrs
+
+    @classmethod
+    def _u32(cls, attrs, atype, default=0):
+        data = attrs.get(atype)
+        return cls._U32.unpack_from(data)[0] if data and len(data) >= 4 else default
+
+    # -- requests ----------------------------------------------------------
+    def _call(self, mtype, cmd, flags=0, attrs=b""):
+        """Sends one request; returns the genl payloads of its replies."""
+        self._seq += 1
+        seq = self._seq
+        payload = self._GENL.pack(cmd, 1, 0) + attrs
+        self._sock.send(self.message(mtype, self.NLM_F_REQUEST | flags, seq, payload))
+        replies = []
+        while True:
+            buf = self._sock.recv(self.RECV_SIZE)
+            if not buf:
+                raise OSError(errno.EIO, "netlink socket closed")
+            for rtype, rflags, rseq, body in self.messages(buf):
+                if rseq != seq:
+                    continue
+                if rtype == self.NLMSG_ERROR:
+                    err = -struct.unpack_from("=i", body)[0]
+                    if err:
+                        raise OSError(err, os.strerror(err))
+                    return replies
+                if rtype == self.NLMSG_DONE:
+                    return replies
+                replies.append(body[self._GENL.size:])
+                if not rflags & self.NLM_F_MULTI:
+                    return replies
+
+    def _open(self):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, self.NETLINK_GENERIC)
+            try:
+                sock.bind((0, 0))
+                sock.settimeout(self.TIMEOUT)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        if self._family is None:
+            replies = self._call(self.GENL_ID_CTRL, self.CTRL_CMD_GETFAMILY,
+                                 attrs=self.attr(self.CTRL_ATTR_FAMILY_NAME, b"nl80211\0"))
+            family = self.attrs(replies[0]).get(self.CTRL_ATTR_FAMILY_ID) if replies else None
+            if not family:
+                raise OSError(errno.ENOENT, "nl80211 family not registered")
+            self._family = struct.unpack_from("=H", family)[0]
+
+    def interfaces(self):
+        """Returns a dict per wireless interface, in kernel dump order."""
+        self._open()
+        ifaces = []
+        for payload in self._call(self._family, self.CMD_GET_INTERFACE, self.NLM_F_DUMP):
+            a = self.attrs(payload)
+            if self.ATTR_IFNAME not in a:
+                continue
+            name = a[self.ATTR_IFNAME].rstrip(b"\0").decode(errors="replace")
+            freq = self._u32(a, self.ATTR_WIPHY_FREQ)
+            ifaces.append({
+                "ifname":  name,
+                "ifindex": self._u32(a, self.ATTR_IFINDEX),
+                "wiphy":   self._u32(a, self.ATTR_WIPHY, -1),
+                "mode":    NL80211_IFTYPES.get(self._u32(a, self.ATTR_IFTYPE), "unknown"),
+                "freq":    freq,
+                "channel": freq_to_channel(freq),
+                "mac":     a.get(self.ATTR_MAC, b"").hex(":").upper(),
+                "driver":  sysfs_driver(name, self.sysfs),
+            })
+        return ifaces
+
+    def wiphys(self):
+        """Returns {wiphy index: phy name}, including radios without interfaces."""
+        self._open()
+        wiphys = {}
+        split = self.attr(self.ATTR_SPLIT_WIPHY_DUMP, b"")
+        for payload in self._call(self._family, self.CMD_GET_WIPHY, self.NLM_F_DUMP, split):
+            a = self.attrs(payload)
+            if self.ATTR_WIPHY in a and self.ATTR_WIPHY_NAME in a:
+                name = a[self.ATTR_WIPHY_NAME].rstrip(b"\0").decode(errors="replace")
+                wiphys[self._u32(a, self.ATTR_WIPHY)] = name
+        return wiphys
+
+    def query(self):
+        """Returns (wiphys, interfaces), each interface tagged with its phy name."""
+        ifaces = self.interfaces()
+        wiphys = self.wiphys()
+        for iface in ifaces:
+            iface["phy"] = wiphys.get(iface["wiphy"], f"phy{iface['wiphy']}")
+        return wiphys, ifaces
+
+
+def nl80211_interfaces():
+    """The nl80211 interface list, or None when nl80211 can't be queried."""
+    nl = Nl80211()
+    try:
+        return nl.interfaces()
+    except OSError:
+        return None
+    finally:
+        nl.close()
+
+
+def nl80211_snapshot():
+    ifaces = nl80211_interfaces()
+    if ifaces is None:
+        return None
+    return {i["ifname"]: (i["mode"], i["driver"]) for i in ifaces}
+
+
+# ---------------------------------------------------------------------------
+# Helper: wireless interface detection
+# ---------------------------------------------------------------------------
+def get_all_wireless_ifaces():
+    ifaces = [i["ifname"] for i in nl80211_interfaces() or ()]
+    if ifaces:
+        return ifaces
+    try:
+        result = subprocess.run(["iw", "dev"], capture_output=True, text=True, timeout=5)
+        for line in result.stdout.splitlines():
+            m = re.match(r'\s+Interface\s+(\S+)', line)
+            if m:
+                ifaces.append(m.group(1))
+    except Exception:
+        pass
+    if not ifaces:
+        try:
+            result = subprocess.run(["iwconfig"], capture_output=True, text=True, timeout=5)
+            ifaces = re.findall(r'^(\w+)\s+IEEE', result.stdout + result.stderr, re.MULTILINE)
+        except Exception:
+            pass
+    if not ifaces:
+        try:
+            with open("/proc/net/wireless") as f:
+                for line in f.readlines()[2:]:
+                    iface = line.split(":")[0].strip()
+                    if iface:
+                        ifaces.append(iface)
+        except Exception:
+            pass
+    return ifaces or ["wlan0"]
+
+
+def get_iface_mode(iface):
+    for info in nl80211_interfaces() or ():
+        if info["ifname"] == iface:
+            return info["mode"]
+    try:
+        result = subprocess.run(["iw", "dev", iface, "info"], capture_output=True, text=True, timeout=5)
+        m = re.search(r'type\s+(\S+)', result.stdout)
+        if m:
+            return m.group(1).lower()
+    except Exception:
+        pass
+    try:
+        result = subprocess.run(["iwconfig", iface], capture_output=True, text=True, timeout=5)
+        output = result.stdout + result.stderr
+        if re.search(r'Mode\s*:\s*Monitor', output, re.IGNORECASE):
+            return "monitor"
+        if re.search(r'Mode\s*:\s*Managed', output, re.IGNORECASE):
+            return "managed"
+    except Exception:
+        pass
+    return "unknown"
+
+
+def get_iface_driver(iface):
+    try:
+        result = subprocess.run(["ethtool", "-i", iface], capture_output=True, text=True, timeout=5)
+        m = re.search(r'driver:\s+(\S+)', result.stdout)
+        if m:
+            return m.group(1)
+    except Exception:
+        pass
+    return "Unknown"
+
+
+def detect_interface(snapshot=None):
+    if snapshot is None:
+        snapshot = nl80211_snapshot()
+    if snapshot is None:
+        snapshot = {iface: (get_iface_mode(iface), None) for iface in get_all_wireless_ifaces()}
+    managed = monitor = None
+    for iface, (mode, _driver) in snapshot.items():
+        if mode == "monitor" and monitor is None:
+            monitor = iface
+        elif mode in ("managed", "unknown") and managed is None:
+            managed = iface
+    base = managed or monitor or "wlan0"
+    mon = monitor or (base + "mon")
+    return base, mon
+
+
+# ---------------------------------------------------------------------------
+# Interface inventory
+# ---------------------------------------------------------------------------
+# ARPHRD_* link types: monitor interfaces carry raw 802.11 (plain, prism or radiotap).
+ARPHRD_MODES = {1: "managed", 801: "monitor", 802: "monitor", 803: "monitor"}
+
+
+def read_sysfs_ifaces(root=SYS_CLASS_NET):
+    """Returns {iface: (mode, driver)} for the wireless interfaces under `root`,
+    or None when sysfs is not available."""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return None
+    ifaces = {}
+    for name in names:
+        base = os.path.join(root, name)
+        if not (os.path.isdir(os.path.join(base, "wireless"))
+                or os.path.exists(os.path.join(base, "phy80211"))):
+            continue
+        try:
+            with open(os.path.join(base, "type")) as f:
+                mode = ARPHRD_MODES.get(int(f.read()), "unknown")
+        except (OSError, ValueError):
+            mode = "unknown"
+        ifaces[name] = (mode, sysfs_driver(name, root))
+    return ifaces
+
+
+class InterfaceInventory:
+    """Cached {iface: (mode, driver)} snapshot of the wireless interfaces.
+
+    Snapshots come from one nl80211 dump, or from sysfs when nl80211 is not
+    available, so a refresh forks nothing; the iw/iwconfig/ethtool helpers
+    above only stand in when neither is.
+    refresh() reads on a worker thread and emits changed(snapshot). An
+    rtnetlink socket subscribed to link events refreshes whenever an
+    interface appears, disappears or changes type.
+    """
+
+    changed = Signal(dict)
+
+    RTMGRP_LINK = 0x1
+    SETTLE = 0.15
+
+    def __init__(self, root=SYS_CLASS_NET, use_netlink=True):
+        self.root = root
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._closed = False
+        self._wake_r, self._wake_w = os.pipe()
+        self._sock = self._netlink_open() if use_netlink else None
+        if self._sock is not None:
+            threading.Thread(target=self._watch_loop, daemon=True).start()
+
+    @property
+    def watching(self):
+        return self._sock is not None
+
+    def _netlink_open(self):
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        except (OSError, AttributeError):
+            return None
+        try:
+            sock.bind((0, self.RTMGRP_LINK))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+    def read(self):
+        """Reads a fresh snapshot on the calling thread."""
+        ifaces = nl80211_snapshot() if self.root == SYS_CLASS_NET else None
+        if ifaces is None:
+            ifaces = read_sysfs_ifaces(self.root)
+        if ifaces is None:
+            ifaces = {iface: (get_iface_mode(iface), get_iface_driver(iface))
+                      for iface in get_all_wireless_ifaces()}
+        return ifaces
+
+    def snapshot(self):
+        """Returns the cached snapshot, reading it on first use."""
+        if self._snapshot is None:
+            self._snapshot = self.read()
+        return self._snapshot
+
+    def refresh(self):
+        """Re-reads in the background; calls made meanwhile fold into one more read."""
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._running = True
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+
+    def _refresh_loop(self):
+        while True:
+            snapshot = self.read()
+            self._snapshot = snapshot
+            try:
+                self.changed.emit(snapshot)
+            except RuntimeError:
+                pass    # owner already deleted
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+    def _drain(self):
+        while True:
+            try:
+                if not self._sock.recv(64 * 1024):
+                    return
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return     # ENOBUFS: events were lost, the refresh covers them
+
+    def _watch_loop(self):
+        fds = [self._sock, self._wake_r]
+        while True:
+            ready, _, _ = select.select(fds, [], [])
+            if self._wake_r in ready:
+                return self._release()
+            self._drain()
+            # airmon-ng renames and retypes in several steps; wait for them to settle.
+            while True:
+                ready, _, _ = select.select(fds, [], [], self.SETTLE)
+                if not ready:
+                    break
+                if self._wake_r in ready:
+                    return self._release()
+                self._drain()
+            self.refresh()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._sock is not None:
+            os.write(self._wake_w, b"x")
+        else:
+            self._release()
+
+    def _release(self):
+        for fd in (self._wake_r, self._wake_w):
+            try: os.close(fd)
+            except OSError: pass
+        if self._sock is not None:
+            self._sock.close()
+
+
+# ---------------------------------------------------------------------------
+# File watcher: inotify on Linux, stat polling elsewhere
+# ---------------------------------------------------------------------------
+class FileWatcher:
+    """Blocks until a file is written, coalescing a burst of writes into one wake-up.
+
+    The parent directory is watched with inotify so the file may be created
+    after the watch starts. Without inotify the file's stat is polled every
+    `interval` seconds instead. close() wakes a blocked wait() from any thread.
+    With directory=True, `path` is a directory and any entry being created,
+    finished, renamed or deleted counts; writes in progress do not. Entries
+    whose names end in one of the `ignore` suffixes never count.
+    """
+
+    _IN_MODIFY = 0x002
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, path, settle=0.03, max_delay=0.08, interval=2.0, use_inotify=True,
+                 directory=False, ignore=()):
+        self.path = os.path.abspath(path)
+        self.settle = settle
+        self.max_delay = max_delay
+        self.interval = interval
+        self.directory = directory
+        self._name = None if directory else os.path.basename(self.path).encode()
+        self._ignore = tuple(suffix.encode() for suffix in ignore)
+        self._closed = threading.Event()
+        self._lock = threading.Lock()     # close() must finish its write before _release()
+        self._wake_r, self._wake_w = os.pipe()
+        self._fd = self._inotify_open() if use_inotify else None
+
+    @property
+    def uses_inotify(self):
+        return self._fd is not None
+
+    def _inotify_open(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes, ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+            if fd < 0:
+                return None
+            if self.directory:
+                mask = (self._IN_CLOSE_WRITE | self._IN_MOVED_FROM | self._IN_MOVED_TO
+                        | self._IN_CREATE | self._IN_DELETE)
+                watched = self.path
+            else:
+                mask = self._IN_MODIFY | self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_CREATE
+                watched = os.path.dirname(self.path)
+            if libc.inotify_add_watch(fd, watched.encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _drain(self):
+        """Reads pending inotify events; True if any concerned the watched file."""
+        hit = False
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return hit
+            offset = 0
+            while offset < len(buf):
+                _wd, _mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                if self._name is None and not (self._ignore and name.endswith(self._ignore)):
+                    hit = True
+                elif name == self._name:
+                    hit = True
+                offset += length
+
+    def wait(self):
+        """Returns True once the file changed, or False after close()."""
+        if self._closed.is_set():
+            return self._release()
+        if self._fd is None:
+            return self._wait_polling()
+        fds = [self._fd, self._wake_r]
+        while True:
+            ready, _, _ = select.select(fds, [], [])
+            if self._wake_r in ready:
+                return self._release()
+            if self._drain():
+                break
+        # Let the rest of the rewrite land before waking the reader.
+        deadline = time.monotonic() + self.max_delay
+        while (remaining := deadline - time.monotonic()) > 0:
+            ready, _, _ = select.select(fds, [], [], min(self.settle, remaining))
+            if not ready:
+                break
+            if self._wake_r in ready:
+                return self._release()
+            self._drain()
+        return True
+
+    def _wait_polling(self):
+        stamp = self._stat()
+        while not self._closed.wait(self.interval):
+            if self._stat() != stamp:
+                return True
+        return self._release()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_ino, st.st_size, st.st_mtime_ns
+        except OSError:
+            return None
+
+    def close(self):
+        with self._lock:
+            if not self._closed.is_set():
+                self._closed.set()
+                os.write(self._wake_w, b"x")
+
+    def _release(self):
+        with self._lock:
+            for fd in (self._fd, self._wake_r, self._wake_w):
+                if fd is not None:
+                    try: os.close(fd)
+                    except OSError: pass
+            self._fd = self._wake_r = self._wake_w = None
+        return False
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+def open_db(path, timeout=5):
+    """A connection to `path` set up the way every NetShade database is used:
+    WAL, so readers on other connections never block the writer, and
+    synchronous=NORMAL, so a commit does not wait for an fsync."""
+    db = sqlite3.connect(path, timeout=timeout)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class DbWriter:
+    """A background thread that owns one connection and writes in batches.
+
+    put() queues an item from any thread. The thread takes everything queued
+    by the time it wakes and passes the list to `write(db, items)` inside
+    one transaction. A batch that fails is rolled back and reported on
+    `error`, and the thread carries on. close() writes what is still queued
+    and joins the thread.
+    """
+
+    error = Signal(str)
+
+    def __init__(self, path, write, what="Database"):
+        self.path = str(path)
+        self._write = write
+        self._what = what
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        db = open_db(self.path)
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is None for item in items)
+            items = [item for item in items if item is not None]
+            if not items:
+                continue
+            try:
+                with db:
+                    self._write(db, items)
+            except sqlite3.Error as e:
+                self.error.emit(f"{self._what} write failed: {e}")
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Scan records
+# ---------------------------------------------------------------------------
+def mac_to_int(mac):
+    """'AA:BB:CC:DD:EE:FF' (str or bytes) -> 48-bit int."""
+    if isinstance(mac, str):
+        mac = mac.encode("ascii")
+    return int(mac.replace(b":", b""), 16)
+
+
+def int_to_mac(value):
+    return value.to_bytes(6, "big").hex(":").upper()
+
+
+def _to_int(text, default=-1):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return default
+
+
+class _Record:
+    """Immutable slotted record; one instance is shared by every tab that shows it.
+
+    MACs are held as 48-bit ints and formatted on demand. Power and channel
+    are ints, with airodump's -1 meaning unknown.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({args})"
+
+
+class Network(_Record):
+    __slots__ = ("mac", "ssid", "power", "channel", "privacy")
+
+    def __init__(self, mac, ssid, power, channel, privacy):
+        _set = object.__setattr__
+        _set(self, "mac", mac)
+        _set(self, "ssid", ssid)
+        _set(self, "power", power)
+        _set(self, "channel", channel)
+        _set(self, "privacy", privacy)
+
+    @property
+    def bssid(self):
+        return int_to_mac(self.mac)
+
+    @property
+    def band(self):
+        if self.channel > 14:
+            return "5 GHz"
+        return "2.4 GHz" if self.channel > 0 else "?"
+
+
+class Client(_Record):
+    __slots__ = ("mac", "ap", "power")
+
+    def __init__(self, mac, ap, power):
+        _set = object.__setattr__
+        _set(self, "mac", mac)
+        _set(self, "ap", ap)
+        _set(self, "power", power)
+
+    @property
+    def bssid(self):
+        return int_to_mac(self.mac)
+
+    @property
+    def ap_bssid(self):
+        return int_to_mac(self.ap)
+
+
+# ---------------------------------------------------------------------------
+# Tool output events
+# ---------------------------------------------------------------------------
+class _Event(_Record):
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+
+class HandshakeCaptured(_Event):
+    __slots__ = ("mac", "kind")         # kind: "wpa" or "pmkid"
+
+    @property
+    def bssid(self):
+        return int_to_mac(self.mac)
+
+
+class Progress(_Event):
+    __slots__ = ("tested", "total", "rate", "elapsed")  # total -1 if unknown, rate in keys/s
+
+
+class KeyFound(_Event):
+    __slots__ = ("key",)
+
+
+class DeauthSent(_Event):
+    __slots__ = ("ap", "station", "acks")   # MACs as ints, None when not printed
+
+
+class ToolError(_Event):
+    __slots__ = ("message",)
+
+
+_MAC_PATTERN = r"[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}"
+
+
+class ToolParser:
+    """Turns a batch of one tool's output lines into typed events.
+
+    TRIGGERS maps lowercase literals to handlers. A batch is lowered once
+    and each literal located with str.find(), so lines without a trigger
+    (nearly all of them) never reach Python code; each hit line goes once
+    to the handler of its earliest trigger, which pulls the details out with
+    a small anchored pattern and may return None to drop the line.
+    """
+
+    ERRORS = ("failed", "error", "no such", "not found", "not in dictionary", "doesn't exist",
+              "unable to", "couldn't", "could not", "permission denied", "no matching")
+    TRIGGERS = ()
+
+    def __init__(self):
+        self._triggers = tuple(self.TRIGGERS) + tuple((word, "error") for word in self.ERRORS)
+
+    def parse(self, lines):
+        text = lines if isinstance(lines, str) else "\n".join(lines)
+        low = text.lower()
+        if len(low) != len(text) and "\n" in text:   # case folding moved offsets
+            return [e for line in text.split("\n") for e in self.parse(line)]
+        hits = {}
+        for word, kind in self._triggers:
+            i = low.find(word)
+            while i >= 0:
+                start = low.rfind("\n", 0, i) + 1
+                if start not in hits or hits[start][0] > i:
+                    hits[start] = (i, kind)
+                i = low.find(word, i + len(word))
+        return self._dispatch(hits, text) if hits else []
+
+    def _dispatch(self, hits, text):
+        events = []
+        for start in sorted(hits):
+            end = text.find("\n", start)
+            event = getattr(self, "_" + hits[start][1])(text[start:end if end >= 0 else len(text)].strip())
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _error(self, line):
+        return ToolError(line)
+
+
+class AirodumpParser(ToolParser):
+    TRIGGERS = (("wpa handshake:", "handshake"), ("pmkid found:", "pmkid"))
+    _HANDSHAKE = re.compile(rf"WPA handshake:\s*({_MAC_PATTERN})", re.I)
+    _PMKID = re.compile(rf"PMKID found:\s*({_MAC_PATTERN})", re.I)
+
+    def _handshake(self, line):
+        m = self._HANDSHAKE.search(line)
+        return HandshakeCaptured(mac_to_int(m.group(1)), "wpa") if m else None
+
+    def _pmkid(self, line):
+        m = self._PMKID.search(line)
+        return HandshakeCaptured(mac_to_int(m.group(1)), "pmkid") if m else None
+
+
+class AireplayParser(ToolParser):
+    TRIGGERS = (("deauth", "deauth"),)
+    _DEAUTH = re.compile(
+        rf"Sending (?:\d+ directed )?DeAuth(?: \(code \d+\))?\.?"
+        rf"(?: STMAC: \[(?P<sta>{_MAC_PATTERN})\](?: \[\s*(?P<sta_acks>\d+)\|\s*(?P<ap_acks>\d+) ACKs\])?"
+        rf"| to broadcast -- BSSID: \[(?P<ap>{_MAC_PATTERN})\])")
+
+    def _deauth(self, line):
+        m = self._DEAUTH.search(line)
+        if not m:
+            return None
+        ap, sta = m.group("ap"), m.group("sta")
+        acks = int(m.group("sta_acks")) + int(m.group("ap_acks")) if m.group("ap_acks") else None
+        return DeauthSent(mac_to_int(ap) if ap else None, mac_to_int(sta) if sta else None, acks)
+
+
+class AircrackParser(ToolParser):
+    TRIGGERS = (("key found!", "key"), ("keys tested", "progress"), ("tested ", "tested_only"))
+    _KEY = re.compile(r"KEY FOUND! \[ (.*) \]")
+    _PROGRESS = re.compile(r"\[(?P<elapsed>\d+(?::\d+)+)\]\s+(?P<tested>\d+)(?:/(?P<total>\d+))?"
+                           r" keys tested(?: \((?P<rate>[\d.]+) k/s\))?")
+    _TESTED = re.compile(r"Tested (\d+) keys")
+
+    def _key(self, line):
+        m = self._KEY.search(line)
+        return KeyFound(m.group(1)) if m else None
+
+    def _progress(self, line):
+        m = self._PROGRESS.search(line)
+        if not m:
+            return None
+        elapsed = 0
+        for part in m.group("elapsed").split(":"):
+            elapsed = elapsed * 60 + int(part)
+        total, rate = m.group("total"), m.group("rate")
+        return Progress(int(m.group("tested")), int(total) if total else -1,
+                        float(rate) if rate else 0.0, elapsed)
+
+    def _tested_only(self, line):
+        m = self._TESTED.search(line)
+        return Progress(int(m.group(1)), -1, 0.0, 0) if m else None
+
+
+# ---------------------------------------------------------------------------
+# Incremental airodump-ng CSV parser
+# ---------------------------------------------------------------------------
+class AirodumpCsv:
+    """Reads the CSV that airodump-ng rewrites in place and reports only deltas.
+
+    airodump truncates and rewrites the whole file every interval, so there is
+    nothing to tail. Instead a poll is skipped outright when the file's stat
+    is unchanged, and otherwise the raw lines of the new rewrite are diffed
+    against the previous one as byte-string sets. Only rows whose bytes
+    changed are decoded and split, and a parsed row is reported only when a
+    displayed field differs from what was reported before.
+
+    seen_networks / seen_clients list the MACs of every row airodump rewrote
+    in the last feed, including rows whose displayed fields did not change
+    (its last-seen column did).
+    """
+
+    _MAC_RE = re.compile(rb'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$')
+    _STA_HEADER = b"\nStation MAC"
+
+    def __init__(self, path):
+        self.path = path
+        self.networks = {}
+        self.clients = {}
+        self.seen_networks = []
+        self.seen_clients = []
+        self._stamp = None
+        self._ap_lines = set()
+        self._sta_lines = set()
+        # (gone, new) rows of the AP and station sections since the last complete read
+        self._changed = ([set(), set()], [set(), set()])
+
+    def reset(self):
+        self.networks.clear()
+        self.clients.clear()
+        self.seen_networks = []
+        self.seen_clients = []
+        self._stamp = None
+        self._ap_lines = set()
+        self._sta_lines = set()
+        self._changed = ([set(), set()], [set(), set()])
+
+    def poll(self):
+        """Returns (networks, clients, lost_networks, lost_clients) or None if nothing changed."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stamp == self._stamp:
+            return None
+        with open(self.path, "rb") as f:
+            data = f.read()
+        delta = self.feed(data)
+        if delta is not None:
+            self._stamp = stamp
+        return delta
+
+    def feed(self, data):
+        """Diffs one rewrite of the file against the previous one."""
+        split = data.find(self._STA_HEADER)
+        if split < 0:
+            return None  # caught airodump mid-rewrite; retry on the next poll
+        # A rewrite that does not end in a newline is torn: ignore the partial
+        # last row and do not treat missing rows as lost.
+        complete = data.endswith(b"\n")
+        sta_part = data[split + 1:]
+        if not complete:
+            sta_part = sta_part[:sta_part.rfind(b"\n") + 1]
+
+        ap_lines = set(data[:split].split(b"\n"))
+        sta_lines = set(sta_part.split(b"\n"))
+        new_ap, old_ap = ap_lines - self._ap_lines, self._ap_lines - ap_lines
+        new_sta, old_sta = sta_lines - self._sta_lines, self._sta_lines - sta_lines
+        self._ap_lines, self._sta_lines = ap_lines, sta_lines
+
+        networks = [net for net in map(self._parse_ap, new_ap) if net]
+        clients = [sta for sta in map(self._parse_station, new_sta) if sta]
+        self.seen_networks = [mac_to_int(l[:17]) for l in new_ap if self._MAC_RE.match(l[:17])]
+        self.seen_clients = [mac_to_int(l[:17]) for l in new_sta if self._MAC_RE.match(l[:17])]
+
+        # Rows are lost only against a complete rewrite, and against the previous
+        # complete one: rows a torn read dropped still count when this one lacks them.
+        (ap_gone, ap_new), (sta_gone, sta_new) = self._changed
+        ap_gone |= old_ap
+        ap_new |= new_ap
+        sta_gone |= old_sta
+        sta_new |= new_sta
+        if not complete:
+            return networks, clients, [], []
+        lost_nets = self._lost(ap_gone, ap_new, ap_lines, self.networks)
+        lost_clients = self._lost(sta_gone, sta_new, sta_lines, self.clients)
+        self._changed = ([set(), set()], [set(), set()])
+        return networks, clients, lost_nets, lost_clients
+
+    def _lost(self, gone, new, lines, known):
+        """MACs of rows gone since the last complete read that no current row lists."""
+        alive = {l[:17] for l in new if l in lines}
+        lost = []
+        for key in {l[:17] for l in gone} - alive:
+            if self._MAC_RE.match(key) and known.pop(mac_to_int(key), None):
+                lost.append(mac_to_int(key))
+        return lost
+
+    def _parse_ap(self, line):
+        if not self._MAC_RE.match(line[:17]):
+            return None
+        parts = [p.strip() for p in line.decode("utf-8", errors="ignore").split(",")]
+        if len(parts) < 14:
+            return None
+        net = Network(mac_to_int(line[:17]), parts[13] or "<Hidden>",
+                      _to_int(parts[8]), _to_int(parts[3]), sys.intern(parts[5]))
+        if self.networks.get(net.mac) == net:
+            return None
+        self.networks[net.mac] = net
+        return net
+
+    def _parse_station(self, line):
+        if not self._MAC_RE.match(line[:17]):
+            return None
+        parts = [p.strip() for p in line.decode("utf-8", errors="ignore").split(",")]
+        if len(parts) < 6:
+            return None
+        ap_bssid = parts[5].encode()
+        if not self._MAC_RE.match(ap_bssid):
+            return None  # "(not associated)"
+        sta = Client(mac_to_int(line[:17]), mac_to_int(ap_bssid), _to_int(parts[3]))
+        if self.clients.get(sta.mac) == sta:
+            return None
+        self.clients[sta.mac] = sta
+        return sta
+
+
+# ---------------------------------------------------------------------------
+# Scan history store
+# ---------------------------------------------------------------------------
+class ScanHistory:
+    """On-disk record of every scan session: per-MAC power/channel samples over time.
+
+    SQLite in WAL mode, so the scan thread can write while the GUI reads
+    through its own connection. A sample is stored whenever a row's power or
+    channel changes; first/last seen are kept per session in the networks
+    and stations tables. Each connection must stay on the thread that
+    opened it.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY, started REAL, iface TEXT, band TEXT);
+    CREATE TABLE IF NOT EXISTS networks (
+        session INTEGER, mac INTEGER, ssid TEXT, privacy TEXT,
+        first_seen REAL, last_seen REAL, PRIMARY KEY (session, mac));
+    CREATE TABLE IF NOT EXISTS stations (
+        session INTEGER, mac INTEGER, ap INTEGER,
+        first_seen REAL, last_seen REAL, PRIMARY KEY (session, mac));
+    CREATE TABLE IF NOT EXISTS ap_samples (
+        session INTEGER, mac INTEGER, t REAL, power INTEGER, channel INTEGER);
+    CREATE TABLE IF NOT EXISTS sta_samples (
+        session INTEGER, mac INTEGER, t REAL, power INTEGER, ap INTEGER);
+    CREATE INDEX IF NOT EXISTS ap_samples_mac_t ON ap_samples (mac, t);
+    CREATE INDEX IF NOT EXISTS sta_samples_mac_t ON sta_samples (mac, t);
+    CREATE INDEX IF NOT EXISTS networks_mac ON networks (mac, last_seen);
+    CREATE INDEX IF NOT EXISTS stations_mac ON stations (mac, last_seen);
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = open_db(self.path)
+        self._db.executescript(self._SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def start_session(self, iface, band):
+        with self._db:
+            return self._db.execute("INSERT INTO sessions (started, iface, band) VALUES (?, ?, ?)",
+                                    (time.time(), iface, band)).lastrowid
+
+    def record(self, session, networks, clients, seen_networks=(), seen_clients=(), t=None):
+        """Writes one parse cycle in a single transaction."""
+        t = time.time() if t is None else t
+        with self._db:
+            db = self._db
+            db.executemany("INSERT INTO ap_samples VALUES (?, ?, ?, ?, ?)",
+                           [(session, n.mac, t, n.power, n.channel) for n in networks])
+            db.executemany("INSERT INTO sta_samples VALUES (?, ?, ?, ?, ?)",
+                           [(session, c.mac, t, c.power, c.ap) for c in clients])
+            db.executemany(
+                "INSERT INTO networks VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (session, mac) "
+                "DO UPDATE SET ssid = excluded.ssid, privacy = excluded.privacy, last_seen = excluded.last_seen",
+                [(session, n.mac, n.ssid, n.privacy, t, t) for n in networks])
+            db.executemany(
+                "INSERT INTO stations VALUES (?, ?, ?, ?, ?) ON CONFLICT (session, mac) "
+                "DO UPDATE SET ap = excluded.ap, last_seen = excluded.last_seen",
+                [(session, c.mac, c.ap, t, t) for c in clients])
+            # Rows rewritten without a field change only move last_seen.
+            changed = {n.mac for n in networks}
+            db.executemany("UPDATE networks SET last_seen = ? WHERE session = ? AND mac = ?",
+                           [(t, session, mac) for mac in seen_networks if mac not in changed])
+            changed = {c.mac for c in clients}
+            db.executemany("UPDATE stations SET last_seen = ? WHERE session = ? AND mac = ?",
+                           [(t, session, mac) for mac in seen_clients if mac not in changed])
+
+    # ── Queries ─────────────────────────────────────────────────────────────
+    def sessions(self):
+        """[(id, started, iface, band), ...], newest first."""
+        return self._db.execute("SELECT id, started, iface, band FROM sessions ORDER BY id DESC").fetchall()
+
+    def last_seen(self, mac, station=False):
+        table = "stations" if station else "networks"
+        row = self._db.execute(f"SELECT MAX(last_seen) FROM {table} WHERE mac = ?", (mac,)).fetchone()
+        return row[0]
+
+    def rssi_stats(self, mac, since=None, until=None, station=False):
+        """(min, max, avg, samples) of the power readings in [since, until], ignoring -1."""
+        table = "sta_samples" if station else "ap_samples"
+        row = self._db.execute(
+            f"SELECT MIN(power), MAX(power), AVG(power), COUNT(*) FROM {table} "
+            f"WHERE mac = ? AND t BETWEEN ? AND ? AND power != -1",
+            (mac, since or 0, until or float("inf"))).fetchone()
+        return row
+
+    def samples(self, mac, since=None, station=False):
+        """[(t, power), ...] in time order."""
+        table = "sta_samples" if station else "ap_samples"
+        return self._db.execute(f"SELECT t, power FROM {table} WHERE mac = ? AND t >= ? ORDER BY t",
+                                (mac, since or 0)).fetchall()
+
+    def session_networks(self, session):
+        """[(mac, ssid, privacy, first_seen, last_seen), ...] for every AP seen in the session."""
+        return self._db.execute(
+            "SELECT mac, ssid, privacy, first_seen, last_seen FROM networks "
+            "WHERE session = ? ORDER BY first_seen", (session,)).fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Scan job
+# ---------------------------------------------------------------------------
+class ScanJob:
+    # One emission per parse cycle: {"networks": [Network, ...], "clients": [Client, ...],
+    # "lost_networks": [mac, ...], "lost_clients": [mac, ...]} with MACs as ints.
+    # Records are immutable, so receivers may keep them as they are.
+    batch_ready = Signal(dict)
+    raw_output = Signal(str)
+    frame = Signal(list)    # airodump-ng's latest screen
+
+    def __init__(self, iface, band="abg", history_path=HISTORY_DB):
+        self.iface = iface
+        self.band = band
+        self.history_path = history_path
+        self.process = None
+        self.csv_path = None
+        self._watcher = None
+
+    def start(self):
+        # A directory of its own: scans running side by side (the GUI, the CLI,
+        # daemon jobs) never read or delete each other's CSV. The parser removes it.
+        directory = tempfile.mkdtemp(prefix="ns_scan-")
+        prefix = os.path.join(directory, "ns_scan")
+        self.csv_path = prefix + "-01.csv"
+        cmd = ["sudo", "airodump-ng", "--output-format", "csv",
+               "--write", prefix, "--band", self.band, self.iface]
+        self._watcher = FileWatcher(self.csv_path)
+        threading.Thread(target=self._parse_csv, args=(self._watcher, directory), daemon=True).start()
+        self.process = ChildProcess(cmd, sudo_kill=True)
+        self.process.output.connect(lambda line, _: self.raw_output.emit(line))
+        self.process.frame.connect(self.frame)
+        self.process.error.connect(lambda e: (self.raw_output.emit(f"Error: {e}"), self._watcher.close()))
+        self.process.finished.connect(lambda _rc: self._watcher.close())
+        self.process.start()
+
+    def isRunning(self):
+        return self.process is not None and self.process.isRunning()
+
+    def wait(self, timeout=None):
+        return self.process.wait(timeout) if self.process else True
+
+    def _open_history(self):
+        if not self.history_path:
+            return None, None
+        try:
+            history = ScanHistory(self.history_path)
+            return history, history.start_session(self.iface, self.band)
+        except Exception as e:
+            self.raw_output.emit(f"Scan history disabled: {e}")
+            return None, None
+
+    def _parse_csv(self, watcher, directory):
+        try:
+            self._parse_loop(watcher)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _parse_loop(self, watcher):
+        csv = AirodumpCsv(self.csv_path)
+        history, session = self._open_history()
+        while watcher.wait():
+            try:
+                delta = csv.poll()
+            except Exception as e:
+                self.raw_output.emit(f"CSV parse error: {e}")
+                continue
+            if delta is None:
+                continue
+            networks, clients, lost_nets, lost_clients = delta
+            if history:
+                try:
+                    history.record(session, networks, clients, csv.seen_networks, csv.seen_clients)
+                except Exception as e:
+                    self.raw_output.emit(f"Scan history write failed: {e}")
+            if any(delta):
+                self.batch_ready.emit({"networks": networks, "clients": clients,
+                                       "lost_networks": lost_nets, "lost_clients": lost_clients})
+        if history:
+            history.close()
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.close()
+        if self.process:
+            self.process.stop()
+
+
+# ---------------------------------------------------------------------------
+# Capture file handshake verification
+# ---------------------------------------------------------------------------
+class PcapError(Exception):
+    pass
+
+
+class PcapTail:
+    """Incremental reader for a classic pcap file that is still being written.
+
+    Each frames() call walks the records appended since the last one through
+    a single reusable buffer of at most CHUNK bytes, yielding memoryviews
+    into it, so a capture of any size is read once and never held whole.
+    A view is only valid until the next frame is requested. A record that
+    is only partly on disk is left for the next call.
+    """
+
+    CHUNK = 4 << 20
+    _MAGIC = {b"\xd4\xc3\xb2\xa1": "<", b"\xa1\xb2\xc3\xd4": ">",      # microsecond
+              b"\x4d\x3c\xb2\xa1": "<", b"\xa1\xb2\x3c\x4d": ">"}      # nanosecond
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.linktype = None
+        self._record = None
+        self._buf = bytearray(self.CHUNK)
+
+    def _read_header(self, f):
+        head = f.read(24)
+        if len(head) < 24:
+            return False
+        order = self._MAGIC.get(head[:4])
+        if order is None:
+            raise PcapError(f"{self.path}: not a pcap file")
+        self.linktype = struct.unpack_from(order + "I", head, 20)[0] & 0x0FFFFFFF
+        self._record = struct.Struct(order + "IIII")
+        self.offset = 24
+        return True
+
+    def frames(self, needle=None):
+        """Yields the payload of each new record; with `needle`, only records containing it."""
+        with open(self.path, "rb") as f:
+            if self._record is None and not self._read_header(f):
+                return
+            size = os.fstat(f.fileno()).st_size
+            buf, view = self._buf, memoryview(self._buf)
+            hsize = self._record.size
+            unpack = self._record.unpack_from
+            while size - self.offset >= hsize:
+                f.seek(self.offset)
+                n = f.readinto(view[:min(self.CHUNK, size - self.offset)])
+                pos, incl = 0, 0
+                nxt = buf.find(needle, 0, n) if needle else 0
+                while n - pos >= hsize:
+                    incl = unpack(buf, pos)[2]
+                    start = pos + hsize
+                    end = start + incl
+                    if end > n:
+                        break
+                    pos = end
+                    if needle:
+                        if 0 <= nxt < start:
+                            nxt = buf.find(needle, start, n)
+                        if nxt < 0 or nxt + len(needle) > end:
+                            continue
+                    yield view[start:end]
+                if pos == 0:
+                    if hsize + incl > self.CHUNK:
+                        raise PcapError(f"{self.path}: corrupt record at offset {self.offset}")
+                    break       # the next record is still being written
+                self.offset += pos
+
+
+_EAPOL_SNAP = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+
+
+def strip_link_header(linktype, frame):
+    """The 802.11 frame inside a capture record, or None for other link types."""
+    if linktype == 105:                                 # bare 802.11
+        return frame
+    if linktype in (127, 192) and len(frame) >= 4:      # radiotap, PPI
+        return frame[frame[2] | frame[3] << 8:]
+    if linktype == 119:                                 # prism
+        return frame[144:]
+    if linktype == 163 and len(frame) >= 8:             # AVS
+        return frame[int.from_bytes(frame[4:8], "big"):]
+    return None
+
+
+_EAPOL_KEY = struct.Struct(">BBHBHHQ32s")   # EAPOL header, descriptor, key info, key len, replay, nonce
+_KEY_DATA = 4 + 93                          # key data length field, from the start of the EAPOL header
+_PMKID_KDE = b"\xdd\x14\x00\x0f\xac\x04"
+_ZERO_NONCE = bytes(32)
+
+
+def eapol_key(frame):
+    """Decodes an unencrypted pairwise EAPOL-Key data frame.
+
+    Returns (bssid, station, message 1-4, replay counter, has PMKID) with the
+    MACs as 6-byte views, or None for anything else.
+    """
+    if len(frame) < 24:
+        return None
+    fc, flags = frame[0], frame[1]
+    if fc & 0x0C != 0x08 or flags & 0x40:      # data frames only, not encrypted
+        return None
+    if flags & 0x03 == 0x01:                    # to the AP
+        bssid, station = frame[4:10], frame[10:16]
+    elif flags & 0x03 == 0x02:                  # from the AP
+        bssid, station = frame[10:16], frame[4:10]
+    else:
+        return None
+    header = 24
+    if fc & 0x80:                               # QoS
+        header += 6 if flags & 0x80 else 2      # with HT control
+    eapol = frame[header + 8:]
+    if frame[header:header + 8] != _EAPOL_SNAP or len(eapol) < _KEY_DATA + 2:
+        return None
+    _ver, kind, _len, _desc, info, _keylen, replay, nonce = _EAPOL_KEY.unpack_from(eapol)
+    if kind != 3 or not info & 0x0008:          # EAPOL-Key, pairwise
+        return None
+    if info & 0x0080:                           # ACK: sent by the AP
+        msg = 3 if info & 0x0100 else 1
+    else:
+        msg = 4 if info & 0x0200 or nonce == _ZERO_NONCE else 2
+    pmkid = False
+    if msg == 1:
+        data_len = int.from_bytes(eapol[_KEY_DATA:_KEY_DATA + 2], "big")
+        data = bytes(eapol[_KEY_DATA + 2:_KEY_DATA + 2 + data_len])
+        at = data.find(_PMKID_KDE)
+        pmkid = at >= 0 and bool(data[at + 6:at + 22].strip(b"\0"))
+    return bssid, station, msg, replay, pmkid
+
+
+class HandshakeProgress(_Event):
+    # Best station seen so far: messages is a sorted tuple of 4-way handshake
+    # message numbers; complete means a crackable M1+M2 or M2+M3 pair (or a PMKID).
+    __slots__ = ("mac", "station", "messages", "complete", "pmkid")
+
+    @property
+    def bssid(self):
+        return int_to_mac(self.mac)
+
+
+class HandshakeVerifier:
+    """Follows a growing airodump-ng capture and tracks the target's EAPOL exchange.
+
+    poll() reads only what was appended since the previous call and returns
+    a HandshakeProgress when the picture changed, else None.
+    """
+
+    def __init__(self, path, bssid):
+        self.tail = PcapTail(path)
+        self.mac = mac_to_int(bssid) if isinstance(bssid, str) else bssid
+        self._bssid = self.mac.to_bytes(6, "big")
+        self.stations = {}      # station MAC int -> {message number: {replay counters}}
+        self.pmkid = None       # station that received a PMKID
+        self._last = None
+
+    def poll(self):
+        try:
+            for frame in self.tail.frames(_EAPOL_SNAP):
+                frame = strip_link_header(self.tail.linktype, frame)
+                key = eapol_key(frame) if frame is not None else None
+                if key and key[0] == self._bssid:
+                    self._add(*key[1:])
+        except FileNotFoundError:
+            return None
+        progress = self.progress()
+        if progress == self._last:
+            return None
+        self._last = progress
+        return progress
+
+    def _add(self, station, msg, replay, pmkid):
+        station = int.from_bytes(station, "big")
+        self.stations.setdefault(station, {}).setdefault(msg, set()).add(replay)
+        if pmkid and self.pmkid is None:
+            self.pmkid = station
+
+    @staticmethod
+    def _complete(seen):
+        m2 = seen.get(2, ())
+        return any(rc in m2 for rc in seen.get(1, ())) or any(rc - 1 in m2 for rc in seen.get(3, ()))
+
+    def progress(self):
+        best, best_key = None, None
+        for station, seen in self.stations.items():
+            key = (self._complete(seen), len(seen))
+            if best_key is None or key > best_key:
+                best, best_key = station, key
+        messages = tuple(sorted(self.stations[best])) if best is not None else ()
+        complete = bool(best_key and best_key[0])
+        if self.pmkid is not None and not complete:
+            best = self.pmkid
+            messages = tuple(sorted(self.stations[best]))
+        return HandshakeProgress(self.mac, best, messages, complete or self.pmkid is not None,
+                                 self.pmkid is not None)
+
+    @property
+    def complete(self):
+        return bool(self._last and self._last.complete)
+
+
+class HandshakeMonitor:
+    """Runs a HandshakeVerifier over a capture file as airodump-ng writes it."""
+
+    progress = Signal(object)   # HandshakeProgress
+    error = Signal(str)
+
+    def __init__(self, path, bssid):
+        self.path = str(path)
+        self.bssid = bssid
+        self._watcher = None
+
+    def start(self):
+        self._watcher = FileWatcher(self.path, interval=1.0)
+        threading.Thread(target=self._run, args=(self._watcher,), daemon=True).start()
+
+    def _run(self, watcher):
+        verifier = HandshakeVerifier(self.path, self.bssid)
+        while True:
+            try:
+                progress = verifier.poll()
+            except (OSError, PcapError) as e:
+                self.error.emit(f"Capture check failed: {e}")
+                watcher.close()
+                progress = None
+            if progress is not None:
+                self.progress.emit(progress)
+            if not watcher.wait():
+                break
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.close()
+
+
+def next_capture_path(prefix):
+    """The .cap airodump-ng will create for `-w prefix`: the first free -NN suffix."""
+    prefix = Path(prefix)
+    pattern = re.compile(re.escape(prefix.name) + r"-(\d\d)\.")
+    try:
+        names = os.listdir(prefix.parent)
+    except OSError:
+        names = []
+    taken = {m.group(1) for m in map(pattern.match, names) if m}
+    n = 1
+    while f"{n:02d}" in taken:
+        n += 1
+    return prefix.parent / f"{prefix.name}-{n:02d}.cap"
+
+
+# ---------------------------------------------------------------------------
+# Capture index
+# ---------------------------------------------------------------------------
+def _link_header_len(linktype, buf, start, end):
+    """Length of the link-layer header in front of the 802.11 frame, or None
+    when the record is too short to hold the header's length field."""
+    if linktype == 127 or linktype == 192:          # radiotap, PPI
+        return buf[start + 2] | buf[start + 3] << 8 if start + 4 <= end else None
+    if linktype == 105:
+        return 0
+    if linktype == 119:
+        return 144
+    if linktype == 163:
+        return int.from_bytes(buf[start + 4:start + 8], "big") if start + 8 <= end else None
+    return None
+
+
+class CaptureIndex:
+    """What a capture holds: networks and their SSIDs, EAPOL and PMKID frames, time range.
+
+    build() walks a pcap or pcapng file through mmap, looking only at the
+    802.11 header of each record, and releases walked pages as it goes so
+    memory stays flat on captures of any size. load() returns the JSON
+    sidecar next to the capture while its recorded size and mtime match,
+    and rebuilds and rewrites it otherwise.
+    """
+
+    VERSION = 1
+    SUFFIX = ".nsidx"
+    MAX_FRAMES = 64             # EAPOL/PMKID offsets kept per network
+    _RELEASE = 64 << 20
+    _LOOKAHEAD = 16 << 20       # how far ahead one search for an EAPOL header reaches
+    _PCAP_MAGIC = {b"\xd4\xc3\xb2\xa1": ("<", 1e-6), b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+                   b"\x4d\x3c\xb2\xa1": ("<", 1e-9), b"\xa1\xb2\x3c\x4d": (">", 1e-9)}
+    _PCAPNG_SHB = b"\x0a\x0d\x0d\x0a"
+
+    def __init__(self, path, size=0, mtime_ns=0, fmt=None, linktypes=(), packets=0,
+                 first=None, last=None, networks=None):
+        self.path = str(path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.format = fmt               # "pcap", "pcapng" or None if unrecognised
+        self.linktypes = list(linktypes)
+        self.packets = packets
+        self.first = first              # capture time range, epoch seconds
+        self.last = last
+        # BSSID -> {"ssid": str or None,
+        #           "eapol": [[offset, message, station, replay], ...],
+        #           "pmkid": [[offset, station], ...]}
+        self.networks = networks if networks is not None else {}
+
+    # ── Cache ──────────────────────────────────────────────────────────────
+    @classmethod
+    def load(cls, path):
+        path = str(path)
+        st = os.stat(path)
+        try:
+            with open(path + cls.SUFFIX) as f:
+                data = json.load(f)
+            if (data.get("version") == cls.VERSION and data.get("size") == st.st_size
+                    and data.get("mtime_ns") == st.st_mtime_ns):
+                return cls(path, data["size"], data["mtime_ns"], data["format"], data["linktypes"],
+                           data["packets"], data["first"], data["last"], data["networks"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        index = cls.build(path)
+        index.save()
+        return index
+
+    def save(self):
+        data = {"version": self.VERSION, "size": self.size, "mtime_ns": self.mtime_ns,
+                "format": self.format, "linktypes": self.linktypes, "packets": self.packets,
+                "first": self.first, "last": self.last, "networks": self.networks}
+        tmp = self.path + self.SUFFIX + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.path + self.SUFFIX)
+        except OSError:
+            pass    # read-only directory: the index just isn't cached
+
+    # ── Building ───────────────────────────────────────────────────────────
+    @classmethod
+    def build(cls, path):
+        path = str(path)
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            index = cls(path, st.st_size, st.st_mtime_ns)
+            if st.st_size < 24:
+                return index
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                if mm[:4] == cls._PCAPNG_SHB:
+                    index.format = "pcapng"
+                    index._walk_pcapng(mm)
+                elif mm[:4] in cls._PCAP_MAGIC:
+                    index.format = "pcap"
+                    index._walk_pcap(mm)
+        return index
+
+    def _release(self, mm, upto):
+        """Drops the mapping's pages below `upto` once a _RELEASE stretch has been walked."""
+        upto -= upto % mmap.PAGESIZE
+        if upto - self._released >= self._RELEASE and hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_DONTNEED, self._released, upto - self._released)
+            self._released = upto
+
+    def _walk_pcap(self, mm):
+        order, resolution = self._PCAP_MAGIC[mm[:4]]
+        linktype = struct.unpack_from(order + "I", mm, 20)[0] & 0x0FFFFFFF
+        self.linktypes = [linktype]
+        record = struct.Struct(order + "IIII")
+        unpack, hsize, size = record.unpack_from, record.size, len(mm)
+        self._released, self._next_eapol, self._searched, self._named = 0, -1, 0, set()
+        pos, first, last, packets = 24, None, None, 0
+        visit = self._visit
+        while pos + hsize <= size:
+            sec, frac, incl, _orig = unpack(mm, pos)
+            start = pos + hsize
+            pos = start + incl
+            if pos > size:
+                break           # last record still being written
+            packets += 1
+            last = (sec, frac)
+            if first is None:
+                first = last
+            visit(mm, linktype, start - hsize, start, pos)
+            if pos - self._released >= self._RELEASE:
+                self._release(mm, pos)
+        self.packets = packets
+        if first:
+            self.first, self.last = first[0] + first[1] * resolution, last[0] + last[1] * resolution
+
+    def _walk_pcapng(self, mm):
+        size, pos, packets = len(mm), 0, 0
+        self._released, self._next_eapol, self._searched, self._named = 0, -1, 0, set()
+        order, ifaces, first, last = "<", [], None, None
+        while pos + 12 <= size:
+            if mm[pos:pos + 4] == self._PCAPNG_SHB:
+                order = "<" if mm[pos + 8:pos + 12] == b"\x4d\x3c\x2b\x1a" else ">"
+                ifaces = []
+            btype, blen = struct.unpack_from(order + "II", mm, pos)
+            if blen < 12 or pos + blen > size:
+                break           # truncated or still being written
+            if btype == 1:                                          # interface description
+                linktype = struct.unpack_from(order + "H", mm, pos + 8)[0]
+                ifaces.append((linktype, self._tsresol(mm, order, pos + 16, pos + blen - 4)))
+                if linktype not in self.linktypes:
+                    self.linktypes.append(linktype)
+            elif btype == 6 or btype == 3:                          # enhanced / simple packet
+                if btype == 6:
+                    iface, hi, lo, caplen = struct.unpack_from(order + "IIII", mm, pos + 8)
+                    start = pos + 28
+                else:
+                    iface, hi, lo = 0, None, None
+                    caplen = min(struct.unpack_from(order + "I", mm, pos + 8)[0], blen - 16)
+                    start = pos + 12
+                if iface < len(ifaces):
+                    packets += 1
+                    linktype, resolution = ifaces[iface]
+                    if hi is not None:
+                        last = (hi << 32 | lo) * resolution
+                        if first is None:
+                            first = last
+                    self._visit(mm, linktype, pos, start, min(start + caplen, pos + blen))
+            pos += blen
+            if pos - self._released >= self._RELEASE:
+                self._release(mm, pos)
+        self.packets, self.first, self.last = packets, first, last
+
+    @staticmethod
+    def _tsresol(mm, order, pos, end):
+        while pos + 4 <= end:
+            code, length = struct.unpack_from(order + "HH", mm, pos)
+            if code == 0:
+                break
+            if code == 9 and length >= 1:
+                value = mm[pos + 4]
+                return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+            pos += 4 + (length + 3 & ~3)
+        return 1e-6
+
+    def _network(self, bssid):
+        mac = int_to_mac(int.from_bytes(bssid, "big"))
+        net = self.networks.get(mac)
+        if net is None:
+            net = self.networks[mac] = {"ssid": None, "eapol": [], "pmkid": []}
+        return net
+
+    def _visit(self, mm, linktype, record_at, start, end):
+        hlen = _link_header_len(linktype, mm, start, end)
+        if hlen is None or end - start - hlen < 24:
+            return
+        frame_at = start + hlen
+        fc = mm[frame_at]
+        if fc == 0x80 or fc == 0x50:                    # beacon, probe response
+            bssid = mm[frame_at + 16:frame_at + 22]
+            if bssid in self._named:
+                return
+            net = self._network(bssid)
+            tag = frame_at + 36
+            if tag + 2 <= end and mm[tag] == 0:
+                ssid = mm[tag + 2:min(tag + 2 + mm[tag + 1], end)]
+                if ssid.strip(b"\0"):
+                    net["ssid"] = ssid.decode("utf-8", "replace")
+                    self._named.add(bssid)
+            return
+        # _next_eapol is the first EAPOL header at or after the records already
+        # seen, or -1 if there is none before _searched.
+        nxt = self._next_eapol
+        if nxt < frame_at and (nxt >= 0 or self._searched < end):
+            self._searched = frame_at + max(self._LOOKAHEAD, end - frame_at)
+            nxt = self._next_eapol = mm.find(_EAPOL_SNAP, frame_at, self._searched)
+        if nxt < frame_at or nxt >= end:
+            return
+        key = eapol_key(mm[frame_at:end])
+        if key is None:
+            return
+        bssid, station, msg, replay, pmkid = key
+        net = self._network(bssid)
+        station = int_to_mac(int.from_bytes(station, "big"))
+        if len(net["eapol"]) < self.MAX_FRAMES:
+            net["eapol"].append([record_at, msg, station, replay])
+        if pmkid and len(net["pmkid"]) < self.MAX_FRAMES:
+            net["pmkid"].append([record_at, station])
+
+    # ── Queries ────────────────────────────────────────────────────────────
+    @property
+    def supported(self):
+        return self.format is not None and any(t in (105, 119, 127, 163, 192) for t in self.linktypes)
+
+    def messages(self, bssid):
+        return sorted({msg for _off, msg, _sta, _rc in self.networks.get(bssid, {}).get("eapol", ())})
+
+    def crackable(self, bssid):
+        """True if some station has an M1+M2 or M2+M3 pair, or a PMKID was seen."""
+        net = self.networks.get(bssid)
+        if not net:
+            return False
+        if net["pmkid"]:
+            return True
+        stations = {}
+        for _off, msg, sta, replay in net["eapol"]:
+            stations.setdefault(sta, {}).setdefault(msg, set()).add(replay)
+        return any(HandshakeVerifier._complete(seen) for seen in stations.values())
+
+    @property
+    def crackable_networks(self):
+        return [bssid for bssid in self.networks if self.crackable(bssid)]
+
+    def summary(self):
+        """Human-readable lines describing the capture."""
+        if self.format is None:
+            return [f"{os.path.basename(self.path)}: not a pcap/pcapng capture"]
+        span = ""
+        if self.first is not None and self.last is not None:
+            span = (f", from {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.first))}"
+                    f" for {_format_duration(self.last - self.first)}")
+        lines = [f"{os.path.basename(self.path)}: {self.format}, {self.packets} packets, "
+                 f"{len(self.networks)} networks{span}"]
+        if not self.supported:
+            lines.append(f"Link type {self.linktypes} is not 802.11; contents not inspected")
+        for bssid in sorted(self.networks, key=lambda b: (not self.crackable(b), b)):
+            net = self.networks[bssid]
+            if not (net["eapol"] or net["pmkid"]):
+                continue
+            parts = []
+            if self.messages(bssid):
+                parts.append(" ".join(f"M{m}" for m in self.messages(bssid)))
+            if net["pmkid"]:
+                parts.append("PMKID")
+            state = "crackable" if self.crackable(bssid) else "incomplete"
+            lines.append(f"  {net['ssid'] or '<hidden>'} [{bssid}]: {', '.join(parts)} ({state})")
+        return lines
+
+
+def _format_duration(seconds):
+    seconds = max(0, int(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h {m:02d}m {s:02d}s" if h else f"{m}m {s:02d}s" if m else f"{s}s"
+
+
+# ---------------------------------------------------------------------------
+# Capture library
+# ---------------------------------------------------------------------------
+CAPTURE_EXTENSIONS = (".cap", ".pcap", ".pcapng")
+CONVERTED_EXTENSIONS = (".hc22000", ".hccap")
+
+
+def conversion_is_current(cap, out):
+    """True if `out` exists, is not empty and is newer than the capture it came from."""
+    try:
+        out_st, cap_st = os.stat(out), os.stat(cap)
+    except OSError:
+        return False
+    return out_st.st_size > 0 and out_st.st_mtime_ns >= cap_st.st_mtime_ns
+
+
+class CaptureEntry(_Record):
+    # One capture file as the library shows it. ssids/bssids are tuples;
+    # crackable counts networks with a usable handshake or PMKID, eapol those
+    # with any EAPOL or PMKID frame. hc22000/hccap hold the mtime_ns of a
+    # converted file next to the capture, or None.
+    __slots__ = ("path", "size", "mtime_ns", "format", "packets", "first", "last",
+                 "ssids", "bssids", "crackable", "eapol", "hc22000", "hccap")
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_index(cls, index, hc22000=None, hccap=None):
+        ssids = tuple(sorted({net["ssid"] for net in index.networks.values() if net["ssid"]}))
+        eapol = sum(1 for net in index.networks.values() if net["eapol"] or net["pmkid"])
+        return cls(index.path, index.size, index.mtime_ns, index.format, index.packets,
+                   index.first, index.last, ssids, tuple(sorted(index.networks)),
+                   len(index.crackable_networks) if index.supported else 0, eapol, hc22000, hccap)
+
+    def with_outputs(self, hc22000, hccap):
+        return CaptureEntry(*self._fields()[:-2], hc22000, hccap)
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def converted(self, kind):
+        """'current', 'stale' or None for the .hc22000 / .hccap output."""
+        mtime = self.hc22000 if kind == ".hc22000" else self.hccap
+        if mtime is None:
+            return None
+        return "current" if mtime >= self.mtime_ns else "stale"
+
+
+class CaptureLibrary:
+    """Persistent metadata for every capture under one directory.
+
+    sync() lists the directory once and indexes only files whose size or
+    mtime changed since the stored row, so a library of thousands of
+    captures costs a scandir and a dict lookup per file when nothing moved.
+    Captures modified within SETTLE seconds are still being written and are
+    left for a later sync. Same threading rule as ScanHistory: a connection
+    stays on the thread that opened it.
+    """
+
+    SETTLE = 2.0
+    # extension without the dot -> True for captures, else the converted-output suffix
+    _WANTED = {**{ext[1:]: True for ext in CAPTURE_EXTENSIONS},
+               **{ext[1:]: ext for ext in CONVERTED_EXTENSIONS}}
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS captures (
+        path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, format TEXT, packets INTEGER,
+        first REAL, last REAL, ssids TEXT, bssids TEXT, crackable INTEGER, eapol INTEGER,
+        hc22000 INTEGER, hccap INTEGER);
+    """
+
+    def __init__(self, path, directory=CAPTURED_DIR):
+        self.path = str(path)
+        self.directory = os.path.abspath(directory)
+        self._db = open_db(self.path)
+        self._db.executescript(self._SCHEMA)
+        self._entries = {}
+        prefix = os.path.join(self.directory, "")
+        # substr, not LIKE: _ and % in the path are not wildcards, and case matters.
+        for row in self._db.execute("SELECT * FROM captures WHERE substr(path, 1, ?) = ?",
+                                    (len(prefix), prefix)):
+            row = list(row)
+            row[7] = tuple(row[7].split("\n")) if row[7] else ()
+            row[8] = tuple(row[8].split("\n")) if row[8] else ()
+            self._entries[row[0]] = CaptureEntry(*row)
+
+    def close(self):
+        self._db.close()
+
+    def entries(self):
+        return list(self._entries.values())
+
+    def sync(self, now=None):
+        """Brings the store in line with the directory: (changed entries, removed paths, pending paths)."""
+        now = time.time() if now is None else now
+        captures, outputs = {}, {}
+        wanted = self._WANTED
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    stem, _, ext = entry.name.rpartition(".")
+                    kind = wanted.get(ext) or wanted.get(ext.lower())
+                    if kind is None or not stem:
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if kind is True:
+                        captures[entry.path] = (stem, st)
+                    elif st.st_size:
+                        outputs[stem, kind] = st.st_mtime_ns
+        except FileNotFoundError:
+            pass
+
+        changed, pending = [], []
+        for path, (stem, st) in captures.items():
+            hc22000, hccap = outputs.get((stem, ".hc22000")), outputs.get((stem, ".hccap"))
+            old = self._entries.get(path)
+            if old is not None and (old.size, old.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                if (old.hc22000, old.hccap) != (hc22000, hccap):
+                    changed.append(old.with_outputs(hc22000, hccap))
+                continue
+            if now - st.st_mtime_ns / 1e9 < self.SETTLE:
+                pending.append(path)
+                continue
+            try:
+                index = CaptureIndex.load(path)
+            except Exception:
+                # One malformed capture must not stop the sync of the others.
+                index = CaptureIndex(path, st.st_size, st.st_mtime_ns)
+            changed.append(CaptureEntry.from_index(index, hc22000, hccap))
+        removed = [path for path in self._entries if path not in captures]
+
+        if changed or removed:
+            with self._db:
+                self._db.executemany("DELETE FROM captures WHERE path = ?", [(p,) for p in removed])
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO captures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [e._fields()[:7] + ("\n".join(e.ssids), "\n".join(e.bssids)) + e._fields()[9:]
+                     for e in changed])
+            for path in removed:
+                del self._entries[path]
+            for entry in changed:
+                self._entries[entry.path] = entry
+        return changed, removed, pending
+
+
+class LibraryJob:
+    """Keeps a CaptureLibrary in sync with its directory on a background thread."""
+
+    # (entries changed or added, paths removed); the first emission carries the whole cache.
+    changed = Signal(list, list)
+    error = Signal(str)
+
+    def __init__(self, db_path=CAPTURE_LIBRARY_DB, directory=CAPTURED_DIR):
+        self.db_path = db_path
+        self.directory = str(directory)
+        self._watcher = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        # The library writes its own index sidecars into the directory; they must not wake it.
+        suffix = CaptureIndex.SUFFIX
+        self._watcher = FileWatcher(self.directory, directory=True, ignore=(suffix, suffix + ".tmp"))
+        threading.Thread(target=self._run, args=(self._watcher,), daemon=True).start()
+
+    def _run(self, watcher):
+        try:
+            library = CaptureLibrary(self.db_path, self.directory)
+        except Exception as e:
+            self.error.emit(f"Capture library disabled: {e}")
+            return
+        self.changed.emit(library.entries(), [])
+        try:
+            while True:
+                changed, removed, pending = library.sync()
+                if changed or removed:
+                    self.changed.emit(changed, removed)
+                # Captures still being written get another look once they settle.
+                if pending and not self._stopped.wait(CaptureLibrary.SETTLE):
+                    continue
+                if not watcher.wait():
+                    break
+        except Exception as e:
+            self.error.emit(f"Capture library sync failed: {e}")
+        finally:
+            library.close()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watcher:
+            self._watcher.close()
+
+
+# ---------------------------------------------------------------------------
+# Conversion queue
+# ---------------------------------------------------------------------------
+CONVERSION_FORMATS = {".hc22000": "Hashcat", ".hccap": "John the Ripper"}
+
+
+def conversion_command(cap, fmt, out_dir):
+    """(argv, output file) converting `cap` to `fmt` ('.hc22000' or '.hccap') into out_dir."""
+    stem = Path(cap).stem
+    if fmt == ".hc22000" and shutil.which("hcxpcapngtool"):
+        out = os.path.join(out_dir, stem + ".hc22000")
+        return ["sudo", "hcxpcapngtool", "-o", out, cap], out
+    # aircrack-ng -J writes <base>.hccap; it is also the fallback for Hashcat.
+    return ["sudo", "aircrack-ng", cap, "-J", os.path.join(out_dir, stem)], os.path.join(out_dir, stem + ".hccap")
+
+
+class ConversionJob:
+    """One capture → format conversion; the queue updates it on the event loop thread."""
+
+    __slots__ = ("key", "cap", "fmt", "out", "cmd", "state", "rc", "detail",
+                 "started", "ended", "cpu", "process")
+
+    # queued → running → done / empty / failed / cancelling → cancelled;
+    # or straight to skipped / cancelled
+    FINAL = ("done", "empty", "failed", "skipped", "cancelled")
+
+    def __init__(self, key, cap, fmt, out, cmd):
+        self.key = key
+        self.cap, self.fmt, self.out, self.cmd = cap, fmt, out, cmd
+        self.state = "queued"
+        self.rc = None
+        self.detail = ""
+        self.started = self.ended = None
+        self.cpu = None
+        self.process = None
+
+    @property
+    def finished(self):
+        return self.state in self.FINAL
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.monotonic()) - self.started
+
+
+class ConversionQueue:
+    """Runs conversions at most `max_workers` at a time (default: one per CPU).
+
+    submit() returns the job already queued or running for the same capture,
+    format and output directory instead of adding another, and marks a job
+    skipped when its output is already newer than the capture. Jobs are
+    kept in submission order until clear_finished().
+    """
+
+    job_changed = Signal(object)    # ConversionJob
+    progress = Signal(int, int)     # finished jobs, total jobs
+
+    def __init__(self, max_workers=None, command=conversion_command):
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self._command = command
+        self.jobs = []
+        self._active = {}       # key -> queued or running job
+        self._pending = collections.deque()
+        self._running = set()
+        self.peak_running = 0
+
+    def submit(self, cap, fmt, out_dir, force=False):
+        cap, out_dir = os.path.abspath(cap), os.path.abspath(out_dir)
+        key = (cap, fmt, out_dir)
+        job = self._active.get(key)
+        if job is not None:
+            return job
+        cmd, out = self._command(cap, fmt, out_dir)
+        job = ConversionJob(key, cap, fmt, out, cmd)
+        self.jobs.append(job)
+        if not force and conversion_is_current(cap, out):
+            job.state, job.detail = "skipped", "output is newer than the capture"
+        else:
+            self._active[key] = job
+            self._pending.append(job)
+        self._changed(job)
+        self._pump()
+        return job
+
+    def submit_many(self, caps, fmt, out_dir):
+        return [self.submit(cap, fmt, out_dir) for cap in caps]
+
+    def cancel(self, job):
+        if job.finished or job.state == "cancelling":
+            return
+        if job.state == "queued":
+            self._pending.remove(job)
+            self._end(job, "cancelled")
+        else:
+            # Still running until the tool exits; _on_exit ends it as cancelled.
+            job.state, job.detail = "cancelling", "cancelling…"
+            self._changed(job, progress=False)
+            job.process.stop()
+
+    def cancel_all(self):
+        for job in list(self._pending):
+            self.cancel(job)
+        for job in list(self._running):
+            self.cancel(job)
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if not job.finished]
+        self.progress.emit(*self.counts())
+
+    def counts(self):
+        return sum(1 for job in self.jobs if job.finished), len(self.jobs)
+
+    @property
+    def running(self):
+        return len(self._running)
+
+    def running_jobs(self):
+        return list(self._running)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _pump(self):
+        while self._pending and len(self._running) < self.max_workers:
+            job = self._pending.popleft()
+            proc = ChildProcess(job.cmd, sudo_kill=True)
+            job.process, job.state, job.started = proc, "running", time.monotonic()
+            self._running.add(job)
+            self.peak_running = max(self.peak_running, len(self._running))
+            proc.output.connect(lambda line, _kind, job=job: self._on_output(job, line))
+            proc.finished.connect(lambda rc, job=job: self._on_exit(job, rc))
+            proc.error.connect(lambda message, job=job: self._on_exit(job, None, message))
+            proc.start()
+            self._changed(job)
+
+    def _on_output(self, job, line):
+        line = line.strip()
+        if line and job.state == "running":
+            job.detail = line
+            self._changed(job, progress=False)
+
+    def _on_exit(self, job, rc, message=None):
+        self._running.discard(job)
+        job.rc = rc
+        job.cpu = job.process.usage()["cpu_s"]
+        if job.state == "cancelling":
+            state = "cancelled"
+            job.detail = ""
+        elif message is not None:
+            state, job.detail = "failed", message
+        elif rc != 0:
+            state = "failed"
+            job.detail = f"exit code {rc}" + (f": {job.detail}" if job.detail else "")
+        elif not os.path.exists(job.out):
+            state, job.detail = "empty", "no handshake or PMKID to write"
+        else:
+            state = "done"
+        self._end(job, state)
+        self._pump()
+
+    def _end(self, job, state):
+        job.state = state
+        job.ended = time.monotonic()
+        job.process = None
+        self._active.pop(job.key, None)
+        self._changed(job)
+
+    def _changed(self, job, progress=True):
+        self.job_changed.emit(job)
+        if progress:
+            self.progress.emit(*self.counts())
+
+
+# ---------------------------------------------------------------------------
+# Hashcat output merge
+# ---------------------------------------------------------------------------
+class HashMerge:
+    """Folds every <stem>.hc22000 in a directory into one deduplicated file.
+
+    Lines already merged are remembered as 16-byte BLAKE2b digests in an
+    SQLite table beside the merged file instead of in memory, with each
+    line's BSSID and offset in the merged file; the BSSID column is the
+    per-network index. Sources are remembered by size and mtime: unchanged
+    files are not read again, and a file that grew (hcxpcapngtool appends)
+    is read from where the previous merge stopped, provided it is still the
+    same inode and the part already read still has the same head and tail.
+    Any other change reads the file again from the start. Lines are only ever
+    added; the merged file is cut back to its last committed size if a
+    merge was interrupted, and re-indexed, never emptied, when the index
+    is lost or does not match it.
+    """
+
+    NAME = "merged.hc22000"
+    BATCH = 2000
+    MARK = 4096         # bytes at each end of a source's consumed part that identify it
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS hashes (
+        digest BLOB PRIMARY KEY, bssid INTEGER, offset INTEGER, length INTEGER) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS hashes_bssid ON hashes (bssid);
+    CREATE TABLE IF NOT EXISTS sources (
+        path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, consumed INTEGER,
+        ino INTEGER, mark BLOB);
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+    """
+
+    def __init__(self, directory, name=NAME):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, name)
+        self._db = open_db(self.path + ".idx")
+        self._db.execute("PRAGMA cache_size=-65536")   # 64MB: digests are random keys
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sources)")}
+        if columns and "mark" not in columns:
+            self._db.execute("DROP TABLE sources")      # older index: sources are read once more
+        self._db.executescript(self._SCHEMA)
+        self._recover()
+
+    def close(self):
+        self._db.close()
+
+    def _committed_size(self):
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'size'").fetchone()
+        return row[0] if row else None
+
+    def _recover(self):
+        committed = self._committed_size()
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = -1
+        if size == committed:
+            return
+        if committed is not None and size > committed:
+            os.truncate(self.path, committed)   # lines written by a merge that never committed
+            return
+        # The index is missing, stale or ahead of a file that was cut short: rebuild it
+        # from the lines the merged file holds, and never drop any of them.
+        with self._db:
+            self._db.execute("DELETE FROM hashes")
+            self._db.execute("DELETE FROM sources")
+            if size < 0:
+                open(self.path, "wb").close()
+                size = 0
+            else:
+                size = self._reindex()
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('size', ?)", (size,))
+
+    def _reindex(self):
+        """Indexes the lines already in the merged file; returns its size."""
+        offset, rows, cut = 0, [], False
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    line, cut = line + b"\n", True
+                if line.startswith(b"WPA*"):
+                    rows.append((hashlib.blake2b(line, digest_size=16).digest(),
+                                 self._bssid(line), offset, len(line)))
+                offset += len(line)
+                if len(rows) >= self.BATCH:
+                    self._db.executemany("INSERT OR IGNORE INTO hashes VALUES (?, ?, ?, ?)", rows)
+                    rows = []
+        self._db.executemany("INSERT OR IGNORE INTO hashes VALUES (?, ?, ?, ?)", rows)
+        if cut:
+            with open(self.path, "ab") as f:
+                f.write(b"\n")     # end the cut-off last line so the next merge starts a new one
+        return offset
+
+    @staticmethod
+    def _bssid(line):
+        try:
+            return int(line.split(b"*", 4)[3], 16)
+        except (IndexError, ValueError):
+            return None
+
+    def sources(self):
+        """The .hc22000 files to merge, merged file excluded: [(path, stat), ...]."""
+        found = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".hc22000") and entry.path != self.path and entry.is_file():
+                    found.append((entry.path, entry.stat()))
+        return sorted(found)
+
+    def merge(self):
+        """Returns (new lines, duplicate lines, sources read)."""
+        known = {row[0]: row[1:] for row in self._db.execute(
+            "SELECT path, size, mtime_ns, consumed, ino, mark FROM sources")}
+        added = dupes = read = 0
+        with open(self.path, "ab") as out, self._db:
+            offset = out.tell()
+            for path, st in self.sources():
+                old = known.get(path)
+                if old and old[:2] == (st.st_size, st.st_mtime_ns):
+                    continue
+                read += 1
+                consumed, mark, end, new, dup = self._merge_file(path, st, old, out, offset)
+                offset = end
+                added += new
+                dupes += dup
+                self._db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)",
+                                 (path, st.st_size, st.st_mtime_ns, consumed, st.st_ino, mark))
+            out.flush()
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('size', ?)", (offset,))
+        return added, dupes, read
+
+    def _merge_file(self, path, st, old, out, offset):
+        """Appends one source's unseen lines to `out`, resuming where `old` stopped
+        if the file was only appended to since.
+
+        Returns (bytes of the source consumed, their mark, merged file offset, new, duplicates).
+        """
+        added, dupes, batch = 0, 0, []
+        with open(path, "rb") as f:
+            start = 0
+            if old:
+                _size, _mtime, done, ino, mark = old
+                if ino == st.st_ino and st.st_size >= done and self._mark(f, done) == mark:
+                    start = done
+            consumed = start
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break               # still being written
+                consumed += len(line)
+                if line.startswith(b"WPA*"):
+                    batch.append(line.rstrip(b"\r\n") + b"\n")
+                if len(batch) >= self.BATCH:
+                    offset, new = self._insert(batch, out, offset)
+                    added, dupes, batch = added + new, dupes + len(batch) - new, []
+            mark = self._mark(f, consumed)
+        if batch:
+            offset, new = self._insert(batch, out, offset)
+            added, dupes = added + new, dupes + len(batch) - new
+        return consumed, mark, offset, added, dupes
+
+    @classmethod
+    def _mark(cls, f, consumed):
+        """Digest of the first and last MARK bytes of a source's first `consumed` bytes."""
+        length = min(consumed, cls.MARK)
+        data = os.pread(f.fileno(), length, 0) + os.pread(f.fileno(), length, consumed - length)
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _insert(self, batch, out, offset):
+        """Records and writes the unseen lines of a batch; returns (offset, lines written)."""
+        rows = {}
+        for line in batch:
+            rows.setdefault(hashlib.blake2b(line, digest_size=16).digest(), line)
+        digests = list(rows)
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            for (d,) in self._db.execute(
+                    f"SELECT digest FROM hashes WHERE digest IN ({','.join('?' * len(chunk))})", chunk):
+                del rows[d]
+        fresh = []
+        for d, line in rows.items():
+            fresh.append((d, self._bssid(line), offset, len(line)))
+            offset += len(line)
+        self._db.executemany("INSERT INTO hashes VALUES (?, ?, ?, ?)", fresh)
+        out.writelines(rows.values())
+        return offset, len(fresh)
+
+    # ── Index queries ──────────────────────────────────────────────────────
+    def count(self):
+        return self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    def networks(self):
+        """{BSSID int: hash count} over everything merged so far."""
+        return dict(self._db.execute("SELECT bssid, COUNT(*) FROM hashes GROUP BY bssid"))
+
+    def lines(self, bssid):
+        """The merged lines for one network, read straight from their offsets."""
+        rows = self._db.execute("SELECT offset, length FROM hashes WHERE bssid = ? ORDER BY offset",
+                                (bssid,)).fetchall()
+        with open(self.path, "rb") as f:
+            return [os.pread(f.fileno(), length, offset) for offset, length in rows]
+
+    def export(self, bssids, path):
+        """Writes the merged lines of the given networks to `path`; returns the line count."""
+        count = 0
+        with open(path, "wb") as out:
+            for bssid in bssids:
+                lines = self.lines(bssid)
+                out.writelines(lines)
+                count += len(lines)
+        return count
+
+
+# ---------------------------------------------------------------------------
+# Attack process (throttled output)
+# ---------------------------------------------------------------------------
+class AttackProcess(ChildProcess):
+    stop_signal = "KILL"
+
+    def __init__(self, cmd):
+        super().__init__(cmd, sudo_kill=True, parser=AireplayParser())
+        self._line_count = 0
+
+    def _accept(self, line, kind):
+        self._line_count += 1
+        # Show first 20 lines, then every 10th (reduce UI flooding); errors always
+        return bool(line.strip()) and (kind == "error" or self._line_count <= 20
+                                       or self._line_count % 10 == 0)
+
+
+# ---------------------------------------------------------------------------
+# Tool commands
+# ---------------------------------------------------------------------------
+def monitor_iface(snapshot):
+    """The first interface in monitor mode in an inventory snapshot, or None."""
+    return next((iface for iface, (mode, _) in snapshot.items() if mode == "monitor"), None)
+
+
+def monitor_command(iface, enable=True):
+    """airmon-ng starting monitor mode on `iface`, or tearing monitor interface `iface` down."""
+    return ["sudo", "airmon-ng", "start" if enable else "stop", iface]
+
+
+def kill_interfering_command():
+    return ["sudo", "airmon-ng", "check", "kill"]
+
+
+def capture_command(bssid, channel, prefix, iface):
+    """airodump-ng writing one network's traffic to `prefix`-NN.cap (see next_capture_path())."""
+    return ["sudo", "airodump-ng", "--bssid", bssid, "-c", str(channel), "-w", str(prefix), iface]
+
+
+def deauth_command(bssid, iface, client=""):
+    """aireplay-ng deauthenticating `client`, or every client of `bssid` when empty."""
+    cmd = ["sudo", "aireplay-ng", "--deauth", "0", "-a", bssid]
+    if client:
+        cmd += ["-c", client]
+    cmd.append(iface)
+    return cmd
+
+
+def set_channel(iface, channel):
+    """Tunes `iface` to `channel` before an attack; failures are left to the attack to report."""
+    try:
+        subprocess.run(["sudo", "iwconfig", iface, "channel", str(channel)],
+                       capture_output=True, check=False, timeout=2)
+    except Exception:
+        pass
+
+
+def crack_command(cap, wordlist):
+    return ["sudo", "aircrack-ng", cap, "-w", wordlist]
@@ -0,0 +1,23 @@
+"""NetShade launcher.
+
+Python never caches the bytecode of the script it is started with, so
+running script.py directly compiles all of it on every start. Importing it
+from here lets the compiled module be cached in __pycache__.
+
+With a command it runs headless instead (cli.py), without loading Qt:
+
+    sudo python3 netshade.py [--startup-timeline]
+    sudo python3 netshade.py COMMAND ...   # interfaces, scan, capture, ... daemon; -h lists them
+"""
+import sys
+
+if len(sys.argv) > 1 and sys.argv[1] != "--startup-timeline":
+    from cli import main
+else:
+    if "--startup-timeline" in sys.argv:
+        from startup import TIMELINE
+        TIMELINE.start()    # before the GUI's imports, so that they are timed too
+    from script import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,42 @@
 import sys
 import os
-import subprocess
-import threading
 import time
+import threading
 import re
 import shutil
+import sqlite3
+import math
+import random
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QLabel, QPushButton, QLineEdit, QTextEdit, QComboBox,
-    QTreeWidget, QTreeWidgetItem, QFileDialog, QFrame, QSplitter,
+    QTabWidget, QLabel, QPushButton, QLineEdit, QComboBox,
+    QTreeView, QListView, QFileDialog, QFrame, QSplitter,
     QProgressBar, QScrollArea, QGridLayout, QGroupBox, QHeaderView,
-    QSizePolicy, QSpacerItem, QCheckBox, QSpinBox, QMenu
+    QSizePolicy, QSpacerItem, QCheckBox, QSpinBox, QMenu,
+    QStyle, QStyledItemDelegate
 )
 from PyQt6.QtCore import (
-    Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation,
-    QEasingCurve, QRect, QPoint, QSize
+    Qt, QObject, QEvent, pyqtSignal, QTimer, QPropertyAnimation,
+    QEasingCurve, QRect, QPoint, QSize, QLineF,
+    QAbstractItemModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPalette, QPixmap, QPainter, QLinearGradient,
     QBrush, QPen, QFontDatabase, QIcon,
-    QRadialGradient
+    QRadialGradient, QKeySequence, QShortcut
 )
-import math
-import random
+import engine
+from engine import (
+    CAPTURED_DIR, HISTORY_DB, CAPTURE_EXTENSIONS, CONVERSION_FORMATS,
+    ChildProcess, AttackProcess, InterfaceInventory,
+    Network, Client, HandshakeCaptured, Progress, KeyFound, DeauthSent, ToolError,
+    AirodumpParser, AircrackParser, ScanHistory, ScanJob, HandshakeMonitor, CaptureIndex,
+    LibraryJob, ConversionQueue, HashMerge, DbWriter, open_db, mac_to_int, int_to_mac,
+    next_capture_path,
+)
+from startup import TIMELINE
+TIMELINE.mark("imports")
 
 
 # ---------------------------------------------------------------------------
@@ -57,14 +70,52 @@ PALETTE = {
     "rosewater":   "#f5e0dc",
 }
 
-CAPTURED_DIR = Path("captured")
 CAPTURED_DIR.mkdir(exist_ok=True)
+CONSOLE_DB = Path("console_history.db")
+SESSION_DB = Path("session.db")
+
+
+# ---------------------------------------------------------------------------
+# Engine signals on the Qt event loop
+# ---------------------------------------------------------------------------
+class QtEventLoop(QObject):
+    """Delivers the engine's signals on the GUI thread, queued through Qt."""
+
+    _queued = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.thread = threading.get_ident()
+        self._queued.connect(self.deliver, Qt.ConnectionType.QueuedConnection)
+
+    def post(self, slots, args):
+        if threading.get_ident() == self.thread:
+            self.deliver(slots, args)
+        else:
+            self._queued.emit(slots, args)
+
+    def call(self, fn, *args):
+        self._queued.emit((fn,), args)
+
+    def deliver(self, slots, args):
+        for slot in slots:
+            try:
+                slot(*args)
+            except RuntimeError as e:
+                # Qt drops queued calls to deleted objects; do the same for widgets closed meanwhile.
+                if "has been deleted" not in str(e):
+                    raise
+
+
+engine.set_event_loop(QtEventLoop())
 
 
 # ---------------------------------------------------------------------------
 # Stylesheet
 # ---------------------------------------------------------------------------
-STYLESHEET = f"""
+def stylesheet():
+    """The application style sheet, built by main() when it is applied."""
+    return f"""
 QMainWindow, QWidget {{
     background-color: {PALETTE['base']};
     color: {PALETTE['text']};
@@ -192,7 +243,7 @@ QComboBox QAbstractItemView {{
     selection-background-color: {PALETTE['surface0']};
     selection-color: {PALETTE['mauve']};
 }}
-QTextEdit {{
+QListView#console {{
     background: {PALETTE['crust']};
     color: {PALETTE['green']};
     border: 1px solid {PALETTE['surface0']};
@@ -200,9 +251,8 @@ QTextEdit {{
     padding: 10px;
     font-family: 'JetBrains Mono', 'Fira Code', monospace;
     font-size: 12px;
-    line-height: 1.6;
 }}
-QTreeWidget {{
+QTreeView {{
     background: {PALETTE['crust']};
     color: {PALETTE['text']};
     border: 1px solid {PALETTE['surface0']};
@@ -210,15 +260,15 @@ QTreeWidget {{
     alternate-background-color: {PALETTE['mantle']};
     show-decoration-selected: 1;
 }}
-QTreeWidget::item {{
+QTreeView::item {{
     padding: 5px 4px;
     border-radius: 4px;
 }}
-QTreeWidget::item:selected {{
+QTreeView::item:selected {{
     background: {PALETTE['surface0']};
     color: {PALETTE['mauve']};
 }}
-QTreeWidget::item:hover {{
+QTreeView::item:hover {{
     background: {PALETTE['surface0']};
 }}
 QHeaderView::section {{
@@ -340,34 +390,272 @@ QProgressBar::chunk {{
 # ---------------------------------------------------------------------------
 # Animated banner
 # ---------------------------------------------------------------------------
+def neighbor_pairs(xs, ys, radius):
+    """[(i, j, distance), ...] for every pair of points closer than `radius`.
+
+    Points are bucketed into radius-sized grid cells, so each point is only
+    compared with its own cell and the four cells ahead of it in scan order;
+    every pair comes out once.
+    """
+    cells = {}
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(i)
+    r2 = radius * radius
+    sqrt = math.sqrt
+    pairs = []
+    for (cx, cy), members in cells.items():
+        ahead = [cells.get(key) for key in ((cx + 1, cy), (cx - 1, cy + 1), (cx, cy + 1), (cx + 1, cy + 1))]
+        for a, i in enumerate(members):
+            xi, yi = xs[i], ys[i]
+            for others in [members[a + 1:], *ahead]:
+                if not others:
+                    continue
+                for j in others:
+                    dx, dy = xi - xs[j], yi - ys[j]
+                    d2 = dx * dx + dy * dy
+                    if d2 < r2:
+                        pairs.append((i, j, sqrt(d2)))
+    return pairs
+
+
+SYS_CLASS_POWER = "/sys/class/power_supply"
+
+
+def on_battery(root=SYS_CLASS_POWER):
+    """True when a battery is present and no mains/USB supply is online."""
+    battery = False
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return False
+    for name in names:
+        try:
+            with open(os.path.join(root, name, "type")) as f:
+                kind = f.read().strip()
+            if kind == "Battery":
+                battery = True
+                continue
+            with open(os.path.join(root, name, "online")) as f:
+                if f.read().strip() == "1":
+                    return False
+        except OSError:
+            continue
+    return battery
+
+
+class AnimationScheduler(QObject):
+    """Ticks a widget's animation only as fast as anyone can see it.
+
+    Frames stop while the widget is hidden or its window is minimized or
+    not exposed, and resume when it shows again. The interval stretches once
+    the window has seen no keyboard or mouse input for IDLE_AFTER seconds,
+    and again while running on battery. Reduced motion stops ticking and
+    leaves the widget on one static frame.
+
+    Events are filtered on the widget, its top-level window and that
+    window's QWindow, which sees all of its input and expose events before
+    any child does; an application-wide filter would run for every event
+    of every widget, thousands of them while the main window is built.
+    """
+
+    ACTIVE, BATTERY, IDLE, IDLE_ON_BATTERY = 30, 60, 100, 250     # ms per frame
+    IDLE_AFTER = 60
+    POWER_POLL = 30000
+    _INPUT = frozenset({QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress, QEvent.Type.KeyPress,
+                        QEvent.Type.Wheel, QEvent.Type.TouchBegin})
+    _VISIBILITY = frozenset({QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange,
+                             QEvent.Type.Expose})
+    _REWATCH = frozenset({QEvent.Type.Show, QEvent.Type.ParentChange})
+
+    def __init__(self, widget, tick, reduced_motion=False):
+        super().__init__(widget)
+        self.widget = widget
+        self.reduced_motion = reduced_motion
+        self.on_battery = on_battery()
+        self._tick = tick
+        self._last_input = time.monotonic()
+        self._idle = False
+        self._pending = False
+        self._stopped = False
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._frame)
+        self._power_timer = QTimer(self)
+        self._power_timer.timeout.connect(self._poll_power)
+        self._power_timer.start(self.POWER_POLL)
+        widget.installEventFilter(self)
+        self._watch()
+        self.reschedule()
+
+    @property
+    def interval(self):
+        """Current ms per frame, or None while paused."""
+        return self._timer.interval() if self._timer.isActive() else None
+
+    def visible(self):
+        widget = self.widget
+        if not widget.isVisible():
+            return False
+        window = widget.window()
+        if window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def set_reduced_motion(self, on):
+        self.reduced_motion = on
+        self.reschedule()
+        self.widget.update()
+
+    def stop(self):
+        self._stopped = True
+        self._timer.stop()
+        self._power_timer.stop()
+
+    def reschedule(self):
+        self._pending = False
+        if self._stopped:
+            return
+        interval = self._interval()
+        if interval is None:
+            self._timer.stop()
+        elif not self._timer.isActive() or interval != self._timer.interval():
+            self._timer.start(interval)
+
+    def _interval(self):
+        if self.reduced_motion or not self.visible():
+            return None
+        self._idle = time.monotonic() - self._last_input > self.IDLE_AFTER
+        if self._idle:
+            return self.IDLE_ON_BATTERY if self.on_battery else self.IDLE
+        return self.BATTERY if self.on_battery else self.ACTIVE
+
+    def _watch(self):
+        """Filters the widget's current top-level window and its QWindow.
+
+        Installing twice still filters once, so no list of watched objects
+        is kept; holding one would keep a closed top-level window alive.
+        """
+        window = self.widget.window()
+        for obj in (window, window.windowHandle()):
+            if obj is not None and obj is not self.widget:
+                obj.installEventFilter(self)
+
+    def _frame(self):
+        if not self._idle and time.monotonic() - self._last_input > self.IDLE_AFTER:
+            self.reschedule()
+        self._tick()
+
+    def _poll_power(self):
+        battery = on_battery()
+        if battery != self.on_battery:
+            self.on_battery = battery
+            self.reschedule()
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if obj is self.widget and kind in self._REWATCH:
+            self._watch()
+        if kind in self._INPUT:
+            self._last_input = time.monotonic()
+            if self._idle:
+                self.reschedule()
+        elif kind in self._VISIBILITY and not self._pending:
+            # Visibility has settled once the event is delivered.
+            self._pending = True
+            QTimer.singleShot(0, self.reschedule)
+        return False
+
+
 class AnimatedBanner(QWidget):
+    """Night-sky header: twinkling stars, waves, drifting particles and sakura petals.
+
+    Only what moves is drawn per frame. The background gradient and the
+    foreground (bottom fade, title text, rule) are pixmaps rebuilt when the
+    size or pixel ratio changes, every particle and petal is a sprite
+    rendered once, and each wave goes out in one drawLines() call (stroking
+    it as a single QPainterPath is over ten times slower in the raster
+    engine, which rasterizes a long antialiased stroke over its whole span).
+
+    Particles are held column-wise in parallel lists, moved a column at a
+    time, and their count follows the banner width; links between them come
+    from neighbor_pairs() and are drawn one drawLines() call per alpha.
+    Frames are paced by an AnimationScheduler; right-click toggles reduced
+    motion, which NETSHADE_REDUCED_MOTION=1 turns on from the start.
+    """
+
+    _WAVE_COLORS = ["mauve", "blue", "sapphire", "lavender"]
+    PARTICLES_PER_PX = 22 / 1280
+    LINK_RADIUS = 90
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedHeight(180)
-        self.particles = []
+        self._px, self._py, self._pvx, self._pvy = [], [], [], []
+        self._pr, self._palpha, self._pcolor, self._psprite = [], [], [], []
         self.wave_offset = 0.0
         self.sakura = []
         self.stars = []
-        self._init_particles()
+        self._sprite_dpr = None
+        self._add_particles(22)
         self._init_sakura()
         self._init_stars()
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._animate)
-        self._timer.start(30)
+        self._layers = None         # (w, h, dpr, background, foreground, wave x positions)
+        self._star_color = QColor(PALETTE["lavender"])
+        self._link_color = QColor(PALETTE["mauve"])
+        self._link_pen = QPen(self._link_color, 0.5)
+        self._wave_pens = []
+        for i in range(4):
+            c = QColor(PALETTE[self._WAVE_COLORS[i]])
+            c.setAlpha(25 + i * 8)
+            self._wave_pens.append(QPen(c, 1.5))
+        reduced = os.environ.get("NETSHADE_REDUCED_MOTION", "").lower() in ("1", "true", "yes")
+        self.scheduler = AnimationScheduler(self, self._animate, reduced_motion=reduced)
 
     def closeEvent(self, event):
-        self._timer.stop()
+        self.scheduler.stop()
         super().closeEvent(event)
 
-    def _init_particles(self):
+    def contextMenuEvent(self, event):
+        menu = QMenu(self)
+        action = menu.addAction("Reduce motion")
+        action.setCheckable(True)
+        action.setChecked(self.scheduler.reduced_motion)
+        action.toggled.connect(self.scheduler.set_reduced_motion)
+        menu.exec(event.globalPos())
+
+    def session_state(self):
+        return {"reduced_motion": self.scheduler.reduced_motion}
+
+    def restore_state(self, state):
+        if state.get("reduced_motion", self.scheduler.reduced_motion) != self.scheduler.reduced_motion:
+            self.scheduler.set_reduced_motion(state["reduced_motion"])
+
+    @property
+    def particle_count(self):
+        return len(self._px)
+
+    def _add_particles(self, n):
         colors = [PALETTE["mauve"], PALETTE["blue"], PALETTE["lavender"], PALETTE["pink"], PALETTE["sapphire"]]
-        for _ in range(22):
-            self.particles.append({
-                "x": random.uniform(0, 1), "y": random.uniform(0, 1),
-                "vx": random.uniform(-0.0008, 0.0008), "vy": random.uniform(-0.0004, 0.0004),
-                "r": random.uniform(1.5, 4.0), "alpha": random.uniform(0.3, 0.9),
-                "color": random.choice(colors)
-            })
+        for _ in range(n):
+            self._px.append(random.uniform(0, 1))
+            self._py.append(random.uniform(0, 1))
+            self._pvx.append(random.uniform(-0.0008, 0.0008))
+            self._pvy.append(random.uniform(-0.0004, 0.0004))
+            self._pr.append(random.uniform(1.5, 4.0))
+            self._palpha.append(random.uniform(0.3, 0.9))
+            self._pcolor.append(random.choice(colors))
+            if self._sprite_dpr is not None:
+                self._psprite.append(self._particle_sprite(len(self._px) - 1, self._sprite_dpr))
+
+    def _fit_particles(self, w):
+        """Keeps the particle density of the original 22 across 1280 px at any width."""
+        n = max(22, round(w * self.PARTICLES_PER_PX))
+        if n > len(self._px):
+            self._add_particles(n - len(self._px))
+        elif n < len(self._px):
+            for col in (self._px, self._py, self._pvx, self._pvy, self._pr,
+                        self._palpha, self._pcolor, self._psprite):
+                del col[n:]
 
     def _init_sakura(self):
         colors = [PALETTE["pink"], PALETTE["flamingo"], PALETTE["rosewater"], PALETTE["mauve"]]
@@ -391,9 +679,8 @@ class AnimatedBanner(QWidget):
 
     def _animate(self):
         self.wave_offset += 0.025
-        for p in self.particles:
-            p["x"] = (p["x"] + p["vx"]) % 1.0
-            p["y"] = (p["y"] + p["vy"]) % 1.0
+        self._px = [(x + vx) % 1.0 for x, vx in zip(self._px, self._pvx)]
+        self._py = [(y + vy) % 1.0 for y, vy in zip(self._py, self._pvy)]
         for s in self.sakura:
             s["x"] += s["vx"] + 0.0003 * math.sin(self.wave_offset + s["y"] * 5)
             s["y"] += s["vy"]
@@ -406,100 +693,73 @@ class AnimatedBanner(QWidget):
             st["phase"] += st["speed"]
         self.update()
 
-    def _draw_sakura_petal(self, painter, cx, cy, size, angle, color):
-        painter.save()
-        painter.translate(cx, cy)
-        painter.rotate(angle)
-        c = QColor(color)
-        for i in range(5):
-            painter.save()
-            painter.rotate(i * 72)
-            grad = QRadialGradient(0, -size * 0.4, size * 0.6)
-            grad.setColorAt(0, c)
-            grad.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
-            painter.setBrush(QBrush(grad))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(int(-size * 0.3), int(-size * 0.9), int(size * 0.6), int(size * 0.7))
-            painter.restore()
-        painter.restore()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    # ── Cached layers and sprites ───────────────────────────────────────────
+    @staticmethod
+    def _pixmap(w, h, dpr):
+        pm = QPixmap(max(1, math.ceil(w * dpr)), max(1, math.ceil(h * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.GlobalColor.transparent)
+        return pm
+
+    def _particle_sprite(self, i, dpr):
+        r = int(self._pr[i] * 4)
+        pm = self._pixmap(2 * r, 2 * r, dpr)
+        c = QColor(self._pcolor[i])
+        c.setAlpha(int(self._palpha[i] * 200))
+        grad = QRadialGradient(r, r, self._pr[i] * 4)
+        grad.setColorAt(0, c)
+        grad.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
+        painter = QPainter(pm)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        w, h = self.width(), self.height()
+        painter.setBrush(QBrush(grad))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawEllipse(QPoint(r, r), r, r)
+        painter.end()
+        return r, pm
 
+    def _build_sprites(self, dpr):
+        self._psprite = [self._particle_sprite(i, dpr) for i in range(len(self._px))]
+        for s in self.sakura:
+            size = s["size"]
+            half = math.ceil(size * 0.9) + 1
+            pm = self._pixmap(2 * half, 2 * half, dpr)
+            c = QColor(s["color"])
+            painter = QPainter(pm)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.translate(half, half)
+            for i in range(5):
+                painter.save()
+                painter.rotate(i * 72)
+                grad = QRadialGradient(0, -size * 0.4, size * 0.6)
+                grad.setColorAt(0, c)
+                grad.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
+                painter.setBrush(QBrush(grad))
+                painter.drawEllipse(int(-size * 0.3), int(-size * 0.9), int(size * 0.6), int(size * 0.7))
+                painter.restore()
+            painter.end()
+            s["sprite"] = (half, pm)
+        self._sprite_dpr = dpr
+
+    def _build_layers(self, w, h, dpr):
+        background = self._pixmap(w, h, dpr)
+        painter = QPainter(background)
         grad = QLinearGradient(0, 0, w, h)
         grad.setColorAt(0.0, QColor("#0f0f1a"))
         grad.setColorAt(0.35, QColor(PALETTE["crust"]))
         grad.setColorAt(0.7, QColor("#1a1030"))
         grad.setColorAt(1.0, QColor("#0d0d1e"))
         painter.fillRect(0, 0, w, h, QBrush(grad))
+        painter.end()
 
-        for st in self.stars:
-            alpha = int(80 + 90 * (0.5 + 0.5 * math.sin(st["phase"])))
-            c = QColor(PALETTE["lavender"])
-            c.setAlpha(alpha)
-            painter.setBrush(QBrush(c))
-            painter.setPen(Qt.PenStyle.NoPen)
-            r = max(1, int(st["r"] * (0.7 + 0.3 * math.sin(st["phase"] * 1.3))))
-            painter.drawEllipse(QPoint(int(st["x"] * w), int(st["y"] * h)), r, r)
-
-        # Wave lines
-        wave_colors = [PALETTE["mauve"], PALETTE["blue"], PALETTE["sapphire"], PALETTE["lavender"]]
-        for i in range(4):
-            amp = 10 + i * 4
-            freq = 0.04 + i * 0.015
-            phase = self.wave_offset * (0.7 + i * 0.3) + i * math.pi / 3
-            c = QColor(wave_colors[i % len(wave_colors)])
-            c.setAlpha(25 + i * 8)
-            painter.setPen(QPen(c, 1.5))
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            prev_x = 0
-            prev_y = int(h * 0.6 + amp * math.sin(freq * 0 + phase))
-            for j in range(1, 81):
-                nx = int(j * w / 80)
-                ny = int(h * 0.6 + amp * math.sin(freq * nx + phase))
-                painter.drawLine(prev_x, prev_y, nx, ny)
-                prev_x, prev_y = nx, ny
-
-        # Particles + connections
-        for p in self.particles:
-            c = QColor(p["color"])
-            c.setAlpha(int(p["alpha"] * 200))
-            grad_p = QRadialGradient(p["x"] * w, p["y"] * h, p["r"] * 4)
-            grad_p.setColorAt(0, c)
-            grad_p.setColorAt(1, QColor(c.red(), c.green(), c.blue(), 0))
-            painter.setBrush(QBrush(grad_p))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(QPoint(int(p["x"] * w), int(p["y"] * h)), int(p["r"] * 4), int(p["r"] * 4))
-
-        for i, p1 in enumerate(self.particles):
-            for j, p2 in enumerate(self.particles):
-                if i >= j:
-                    continue
-                dx = (p1["x"] - p2["x"]) * w
-                dy = (p1["y"] - p2["y"]) * h
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist < 90:
-                    c = QColor(PALETTE["mauve"])
-                    c.setAlpha(int(30 * (1 - dist / 90)))
-                    painter.setPen(QPen(c, 0.5))
-                    painter.drawLine(int(p1["x"] * w), int(p1["y"] * h), int(p2["x"] * w), int(p2["y"] * h))
-
-        # Sakura
-        for s in self.sakura:
-            painter.save()
-            painter.setOpacity(s["alpha"])
-            self._draw_sakura_petal(painter, s["x"] * w, s["y"] * h, s["size"], s["angle"], s["color"])
-            painter.restore()
-
-        # Bottom fade overlay
+        foreground = self._pixmap(w, h, dpr)
+        painter = QPainter(foreground)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         overlay = QLinearGradient(0, 0, 0, h)
         overlay.setColorAt(0, QColor(0, 0, 0, 0))
         overlay.setColorAt(1, QColor(PALETTE["base"]))
         painter.fillRect(0, 0, w, h, QBrush(overlay))
 
-        # Title text
         painter.setFont(QFont("JetBrains Mono", 28, QFont.Weight.Bold))
         gtext = QLinearGradient(0, 0, w, 0)
         gtext.setColorAt(0.0, QColor(PALETTE["mauve"]))
@@ -523,166 +783,568 @@ class AnimatedBanner(QWidget):
         painter.drawLine(0, h - 1, w, h - 1)
         painter.end()
 
+        wave_xs = [int(j * w / 80) for j in range(81)]
+        self._layers = (w, h, dpr, background, foreground, wave_xs)
+
+    # ── Frame ───────────────────────────────────────────────────────────────
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        w, h, dpr = self.width(), self.height(), painter.device().devicePixelRatioF()
+        self._fit_particles(w)
+        if self._sprite_dpr != dpr:
+            self._build_sprites(dpr)
+        if self._layers is None or self._layers[:3] != (w, h, dpr):
+            self._build_layers(w, h, dpr)
+        _, _, _, background, foreground, wave_xs = self._layers
+
+        painter.drawPixmap(0, 0, background)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        c = self._star_color
+        for st in self.stars:
+            c.setAlpha(int(80 + 90 * (0.5 + 0.5 * math.sin(st["phase"]))))
+            painter.setBrush(c)
+            r = max(1, int(st["r"] * (0.7 + 0.3 * math.sin(st["phase"] * 1.3))))
+            painter.drawEllipse(QPoint(int(st["x"] * w), int(st["y"] * h)), r, r)
+
+        # Wave lines
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        base = h * 0.6
+        sin = math.sin
+        for i, pen in enumerate(self._wave_pens):
+            amp = 10 + i * 4
+            freq = 0.04 + i * 0.015
+            phase = self.wave_offset * (0.7 + i * 0.3) + i * math.pi / 3
+            wave_ys = [int(base + amp * sin(freq * nx + phase)) for nx in wave_xs]
+            painter.setPen(pen)
+            painter.drawLines([QLineF(wave_xs[j], wave_ys[j], wave_xs[j + 1], wave_ys[j + 1])
+                               for j in range(80)])
+
+        # Particles + connections
+        xs = [x * w for x in self._px]
+        ys = [y * h for y in self._py]
+        for x, y, (r, sprite) in zip(xs, ys, self._psprite):
+            painter.drawPixmap(int(x) - r, int(y) - r, sprite)
+
+        radius = self.LINK_RADIUS
+        links = {}
+        for i, j, dist in neighbor_pairs(xs, ys, radius):
+            alpha = int(30 * (1 - dist / radius))
+            if alpha:
+                links.setdefault(alpha, []).append(QLineF(int(xs[i]), int(ys[i]), int(xs[j]), int(ys[j])))
+        pen, c = self._link_pen, self._link_color
+        for alpha, lines in links.items():
+            c.setAlpha(alpha)
+            pen.setColor(c)
+            painter.setPen(pen)
+            painter.drawLines(lines)
+
+        # Sakura
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        for s in self.sakura:
+            half, sprite = s["sprite"]
+            painter.translate(s["x"] * w, s["y"] * h)
+            painter.rotate(s["angle"])
+            painter.setOpacity(s["alpha"])
+            painter.drawPixmap(-half, -half, sprite)
+            painter.resetTransform()
+        painter.setOpacity(1.0)
+
+        painter.drawPixmap(0, 0, foreground)
+        painter.end()
+
 
 # ---------------------------------------------------------------------------
-# Console output widget with buffered appends
+# Console output: ring buffer of log records behind a virtualized list view
 # ---------------------------------------------------------------------------
-class ConsoleOutput(QTextEdit):
+class LogRing:
+    """Fixed-capacity ring buffer of (timestamp, level, text, count) records; oldest drop first."""
+
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._slots[(self._start + i) % self.capacity]
+
+    def drop_front(self, n):
+        n = min(n, self._count)
+        for i in range(n):
+            self._slots[(self._start + i) % self.capacity] = None
+        self._start = (self._start + n) % self.capacity
+        self._count -= n
+
+    def extend(self, records):
+        """Appends records; the caller drops enough from the front first."""
+        for record in records:
+            self._slots[(self._start + self._count) % self.capacity] = record
+            self._count += 1
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._start = self._count = 0
+
+
+RECORD_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class ConsoleModel(QAbstractListModel):
+    # level -> (prefix, palette color)
+    LEVELS = {
+        "line":    ("",   "green"),
+        "success": ("✓ ", "green"),
+        "error":   ("✗ ", "red"),
+        "warn":    ("⚠ ", "yellow"),
+        "info":    ("ℹ ", "blue"),
+        "raw":     ("",   "subtext1"),
+    }
+
+    def __init__(self, capacity=2000, parent=None):
+        super().__init__(parent)
+        self.ring = LogRing(capacity)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ring)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ts, level, text, count = record = self.ring[index.row()]
+        if role == RECORD_ROLE:
+            return record
+        if role == Qt.ItemDataRole.DisplayRole:
+            repeat = f"  ×{count}" if count > 1 else ""
+            return f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] {self.LEVELS[level][0]}{text}{repeat}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return text
+        return None
+
+    def append(self, records):
+        """Adds a batch of records with one remove and one insert notification."""
+        records = records[-self.ring.capacity:]
+        if not records:
+            return
+        overflow = len(self.ring) + len(records) - self.ring.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self.ring.drop_front(overflow)
+            self.endRemoveRows()
+        first = len(self.ring)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.ring.extend(records)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.ring.clear()
+        self.endResetModel()
+
+
+class ConsoleLog:
+    """Every console line of every session, on disk with a full-text index.
+
+    Lines are handed over in batches and written by a background thread in
+    one transaction per batch; an FTS5 table kept in sync by trigger indexes
+    the text (plain LIKE scans are used where SQLite lacks FTS5). search()
+    runs on the caller's own connection, so it must stay on one thread.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS log_sessions (id INTEGER PRIMARY KEY, started REAL);
+    CREATE TABLE IF NOT EXISTS lines (
+        id INTEGER PRIMARY KEY, session INTEGER, ts REAL,
+        source TEXT, level TEXT, text TEXT);
+    CREATE INDEX IF NOT EXISTS lines_level ON lines (level, id);
+    CREATE INDEX IF NOT EXISTS lines_source ON lines (source, level, id);
+    """
+    _FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(text, content='lines', content_rowid='id');
+    CREATE TRIGGER IF NOT EXISTS lines_fts_insert AFTER INSERT ON lines BEGIN
+        INSERT INTO lines_fts (rowid, text) VALUES (new.id, new.text);
+    END;
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        db = open_db(self.path)
+        db.executescript(self._SCHEMA)
+        try:
+            db.executescript(self._FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        with db:
+            self.session = db.execute("INSERT INTO log_sessions (started) VALUES (?)",
+                                      (time.time(),)).lastrowid
+        db.close()
+        self._reader = None
+        self._writer = DbWriter(self.path, self._write, "Console history")
+        self.error = self._writer.error     # str, for a batch that could not be written
+
+    def write(self, source, records):
+        """Queues [(ts, level, text), ...] from one console; safe from any thread."""
+        self._writer.put((source, records))
+
+    def close(self):
+        self._writer.close()
+        if self._reader:
+            self._reader.close()
+
+    def _write(self, db, items):
+        rows = [(self.session, ts, source, level, text)
+                for source, records in items for ts, level, text in records]
+        db.executemany("INSERT INTO lines (session, ts, source, level, text) "
+                       "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _match_expr(self, text):
+        # Each word is a quoted prefix term, so punctuation such as the
+        # colons in a MAC can't break the FTS query syntax.
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+    def search(self, text="", level=None, source=None, before=None, limit=500):
+        """Newest-first [(id, ts, source, level, text), ...] matching every given filter.
+
+        `before` is the id of the last row of the previous page.
+        """
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, timeout=5)
+        where, args = [], []
+        if level:
+            where.append("l.level = ?"); args.append(level)
+        if source:
+            where.append("l.source = ?"); args.append(source)
+        if before is not None:
+            where.append("l.id < ?"); args.append(before)
+        text = text.strip()
+        if text and self.fts:
+            sql = ("SELECT l.id, l.ts, l.source, l.level, l.text FROM lines_fts f "
+                   "JOIN lines l ON l.id = f.rowid WHERE lines_fts MATCH ?")
+            args.insert(0, self._match_expr(text))
+            order = "f.rowid"
+        else:
+            sql = "SELECT l.id, l.ts, l.source, l.level, l.text FROM lines l WHERE 1"
+            if text:
+                where.append("instr(lower(l.text), ?) > 0"); args.append(text.lower())
+            order = "l.id"
+        sql += "".join(f" AND {w}" for w in where) + f" ORDER BY {order} DESC LIMIT ?"
+        return self._reader.execute(sql, args + [limit]).fetchall()
+
+
+class ConsoleSearchModel(QAbstractListModel):
+    """Search results from a ConsoleLog, fetched a page at a time as the view scrolls."""
+
+    PAGE = 500
+
+    def __init__(self, log, text="", level=None, source=None, parent=None):
+        super().__init__(parent)
+        self._log = log
+        self._query = (text, level, source)
+        self._rows = []
+        self._done = False
+        self._fetch()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._done
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._fetch()
+
+    def _fetch(self):
+        before = self._rows[-1][0] if self._rows else None
+        rows = self._log.search(*self._query, before=before, limit=self.PAGE)
+        self._done = len(rows) < self.PAGE
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        _id, ts, source, level, text = self._rows[index.row()]
+        if self._query[2] is None:
+            text = f"[{source}] {text}"
+        if role == RECORD_ROLE:
+            return ts, level, text, 1
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}] {ConsoleModel.LEVELS[level][0]}{text}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return text
+        return None
+
+
+class ConsoleDelegate(QStyledItemDelegate):
+    """Paints one record as a dim timestamp followed by the text in its level's color."""
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setReadOnly(True)
-        self.document().setMaximumBlockCount(2000)
+        self._stamp_color = QColor(PALETTE["overlay0"])
+        self._colors = {level: QColor(PALETTE[color]) for level, (_, color) in ConsoleModel.LEVELS.items()}
+        self._selected = QColor(PALETTE["surface0"])
+
+    def paint(self, painter, option, index):
+        ts, level, text, count = index.data(RECORD_ROLE)
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, self._selected)
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        flags = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        stamp = f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] "
+        painter.setPen(self._stamp_color)
+        painter.drawText(rect, flags, stamp)
+        painter.setPen(self._colors[level])
+        rect.setLeft(rect.left() + option.fontMetrics.horizontalAdvance(stamp))
+        line = ConsoleModel.LEVELS[level][0] + text
+        if count > 1:
+            line += f"  ×{count}"
+        painter.drawText(rect, flags, line)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(0, option.fontMetrics.height() + 4)
+
+
+class ConsoleOutput(QListView):
+    """Log view that flushes queued lines on an adaptive schedule.
+
+    The flush timer only runs while lines are pending, one frame after the
+    first one arrives. Each flush takes as many lines as fit the frame
+    budget: flush cost is modelled as a fixed part (the cheapest flush seen)
+    plus a per-line part averaged over recent flushes. Past COLLAPSE_BACKLOG
+    pending lines, a line identical to the one before it only bumps that
+    record's ×N counter, and lines that would be evicted from the ring
+    before ever being shown are dropped.
+
+    When ConsoleOutput.log is set, every line, collapsed or dropped ones
+    included, is also written there under this console's source name, and
+    Ctrl+F opens a filter bar that searches that history instead of the
+    ring.
+    """
+
+    log = None  # app-wide ConsoleLog, set up in main()
+
+    FRAME_INTERVAL_MS = 16
+    FRAME_BUDGET = 0.008
+    MIN_BATCH = 50
+    COLLAPSE_BACKLOG = 500
+
+    def __init__(self, parent=None, capacity=2000, source=""):
+        super().__init__(parent)
+        self.setObjectName("console")
+        self._source = source
+        self._log_pending = []
+        self._model = ConsoleModel(capacity, self)
+        self.setModel(self._model)
+        self.setItemDelegate(ConsoleDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self._capacity = capacity
         self._buffer = []
+        self._batch = self.MIN_BATCH * 4
+        self._fixed_cost = None
+        self._line_cost = None
         self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._flush_buffer)
-        self._timer.start(100)
-        self._last_flush = time.time()
+        self._latency = 0.0
+        self._max_latency = 0.0
+        self._flushes = self._dropped = self._collapsed = 0
+        self._build_filter_bar()
+
+    def _build_filter_bar(self):
+        bar = self._filter_bar = QFrame(self)
+        bar.setStyleSheet(f"QFrame {{ background:{PALETTE['mantle']}; border-radius:4px; }}"
+                          "QLineEdit, QComboBox { padding:2px 6px; min-width:0; font-size:11px; }"
+                          "QCheckBox { font-size:11px; }")
+        row = QHBoxLayout(bar)
+        row.setContentsMargins(4, 2, 4, 2)
+        row.setSpacing(6)
+        self._filter_text = QLineEdit()
+        self._filter_text.setPlaceholderText("Search console history… (Esc to close)")
+        self._filter_level = QComboBox()
+        self._filter_level.addItem("All levels", None)
+        for level in ("info", "success", "warn", "error", "raw"):
+            self._filter_level.addItem(level.capitalize(), level)
+        self._filter_all = QCheckBox("All tabs")
+        self._filter_status = QLabel()
+        self._filter_status.setStyleSheet(f"color:{PALETTE['overlay0']};font-size:11px;")
+        row.addWidget(self._filter_text, 1)
+        for w in [self._filter_level, self._filter_all, self._filter_status]:
+            row.addWidget(w)
+        bar.hide()
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self._run_search)
+        self._filter_text.textChanged.connect(lambda: self._search_timer.start(150))
+        self._filter_level.currentIndexChanged.connect(lambda: self._search_timer.start(0))
+        self._filter_all.toggled.connect(lambda: self._search_timer.start(0))
+        QShortcut(QKeySequence.StandardKey.Find, self, self.show_filter_bar,
+                  context=Qt.ShortcutContext.WidgetWithChildrenShortcut)
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), bar, self.hide_filter_bar,
+                  context=Qt.ShortcutContext.WidgetWithChildrenShortcut)
+
+    def show_filter_bar(self):
+        if self.log is None:
+            self.append_warn("Console history is not enabled.")
+            return
+        self._filter_bar.show()
+        self._layout_filter_bar()
+        self._filter_text.setFocus()
+        self._filter_text.selectAll()
+        self._run_search()
+
+    def hide_filter_bar(self):
+        self._filter_bar.hide()
+        self._layout_filter_bar()
+        self._show_live()
+        self.setFocus()
+
+    def _layout_filter_bar(self):
+        height = self._filter_bar.sizeHint().height() if self._filter_bar.isVisible() else 0
+        self.setViewportMargins(0, height, 0, 0)
+        rect = self.viewport().geometry()
+        self._filter_bar.setGeometry(rect.left(), rect.top() - height, rect.width(), height)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._filter_bar.isVisible():
+            self._layout_filter_bar()
+
+    def _show_live(self):
+        if self.model() is not self._model:
+            searched = self.model()
+            self.setModel(self._model)
+            searched.deleteLater()
+            self.scrollToBottom()
+
+    def _run_search(self):
+        text = self._filter_text.text().strip()
+        level = self._filter_level.currentData()
+        all_tabs = self._filter_all.isChecked()
+        if not text and level is None and not all_tabs:
+            self._show_live()
+            self._filter_status.setText("")
+            return
+        # Hand over lines still waiting for the writer thread first.
+        self._write_log()
+        start = time.perf_counter()
+        results = ConsoleSearchModel(self.log, text, level, None if all_tabs else self._source, self)
+        elapsed = time.perf_counter() - start
+        previous = self.model()
+        self.setModel(results)
+        if previous is not self._model:
+            previous.deleteLater()
+        more = "+" if results.canFetchMore() else ""
+        self._filter_status.setText(f"{results.rowCount()}{more} matches · {elapsed * 1e3:.0f} ms")
+
+    def _write_log(self):
+        if self._log_pending:
+            self.log.write(self._source, self._log_pending)
+            self._log_pending = []
 
     def closeEvent(self, event):
         self._timer.stop()
         super().closeEvent(event)
 
+    def metrics(self):
+        """Backlog and flush statistics; latencies are how long a line waited to be shown."""
+        return {
+            "backlog": len(self._buffer),
+            "batch": self._batch,
+            "flushes": self._flushes,
+            "flush_latency_ms": self._latency * 1e3,
+            "max_flush_latency_ms": self._max_latency * 1e3,
+            "dropped": self._dropped,
+            "collapsed": self._collapsed,
+        }
+
     def _flush_buffer(self):
+        self._write_log()
         if not self._buffer:
             return
-        self.moveCursor(self.textCursor().MoveOperation.End)
-        batch, self._buffer = self._buffer[:50], self._buffer[50:]
-        self.insertHtml("".join(batch))
-        self.ensureCursorVisible()
+        start = time.perf_counter()
+        if len(self._buffer) <= self._batch:
+            batch, self._buffer = self._buffer, []
+        else:
+            batch = self._buffer[:self._batch]
+            del self._buffer[:self._batch]
+        self._model.append(batch)
+        if self.model() is self._model:
+            self.scrollToBottom()
+        elapsed = time.perf_counter() - start
+
+        self._resize_batch(elapsed, len(batch))
+        waited = time.time() - batch[0][0]
+        self._latency = waited if not self._flushes else 0.8 * self._latency + 0.2 * waited
+        self._max_latency = max(self._max_latency, waited)
+        self._flushes += 1
+        if self._buffer:
+            self._timer.start(self.FRAME_INTERVAL_MS)
+
+    def _resize_batch(self, elapsed, n):
+        self._fixed_cost = elapsed if self._fixed_cost is None else min(self._fixed_cost, elapsed)
+        line_cost = (elapsed - self._fixed_cost) / n
+        self._line_cost = line_cost if self._line_cost is None else 0.8 * self._line_cost + 0.2 * line_cost
+        spare = self.FRAME_BUDGET - self._fixed_cost
+        if spare <= 0 or self._line_cost <= 0:
+            # Nothing to gain from small batches when the fixed part dominates.
+            self._batch = self._capacity
+        else:
+            self._batch = int(min(self._capacity, max(self.MIN_BATCH, spare / self._line_cost)))
 
-    def _enqueue(self, html_line):
-        self._buffer.append(html_line)
+    def _enqueue(self, level, text):
         now = time.time()
-        if now - self._last_flush > 0.5 or len(self._buffer) > 100:
-            self._flush_buffer()
-            self._last_flush = now
-
-    def append_line(self, text, color=None):
-        color = color or PALETTE["green"]
-        ts = time.strftime("%H:%M:%S")
-        prompt = f'<span style="color:{PALETTE["overlay0"]};">[{ts}]</span>'
-        content = f'<span style="color:{color};">{text}</span>'
-        self._enqueue(f'{prompt} {content}<br>')
-
-    def append_success(self, text): self.append_line(f"✓ {text}", PALETTE["green"])
-    def append_error(self, text):   self.append_line(f"✗ {text}", PALETTE["red"])
-    def append_warn(self, text):    self.append_line(f"⚠ {text}", PALETTE["yellow"])
-    def append_info(self, text):    self.append_line(f"ℹ {text}", PALETTE["blue"])
-    def append_raw(self, text):     self.append_line(text, PALETTE["subtext1"])
+        if self.log is not None:
+            self._log_pending.append((now, level, text))
+        buf = self._buffer
+        if len(buf) >= self.COLLAPSE_BACKLOG:
+            ts, last_level, last_text, count = buf[-1]
+            if last_level == level and last_text == text:
+                buf[-1] = (ts, level, text, count + 1)
+                self._collapsed += 1
+                return
+        buf.append((now, level, text, 1))
+        if len(buf) > 2 * self._capacity:
+            drop = len(buf) - self._capacity
+            del buf[:drop]
+            self._dropped += drop
+        if not self._timer.isActive():
+            self._timer.start(self.FRAME_INTERVAL_MS)
+
+    def append_line(self, text, level="line"):
+        self._enqueue(level, text)
+
+    def append_success(self, text): self._enqueue("success", text)
+    def append_error(self, text):   self._enqueue("error", text)
+    def append_warn(self, text):    self._enqueue("warn", text)
+    def append_info(self, text):    self._enqueue("info", text)
+    def append_raw(self, text):     self._enqueue("raw", text)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            model = self.model()
+            QApplication.clipboard().setText("\n".join(model.index(r).data() for r in rows))
+            return
+        super().keyPressEvent(event)
 
     def clear_log(self):
-        self.clear()
+        self._model.clear()
         self._buffer.clear()
-
-
-# ---------------------------------------------------------------------------
-# Generic worker thread for subprocess commands
-# ---------------------------------------------------------------------------
-class WorkerThread(QThread):
-    output = pyqtSignal(str, str)
-    finished = pyqtSignal(int)
-    error = pyqtSignal(str)
-
-    def __init__(self, cmd, shell=False):
-        super().__init__()
-        self.cmd = cmd
-        self.shell = shell
-        self.process = None
-        self._stop = False
-
-    def run(self):
-        try:
-            self.process = subprocess.Popen(
-                self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=True, shell=self.shell, bufsize=1
-            )
-            for line in iter(self.process.stdout.readline, ''):
-                if self._stop:
-                    break
-                line = line.rstrip()
-                if line:
-                    self.output.emit(line, "raw")
-            self.process.wait()
-            self.finished.emit(self.process.returncode)
-        except Exception as e:
-            self.error.emit(str(e))
-
-    def stop(self):
-        self._stop = True
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=3)
-            except Exception:
-                try:
-                    self.process.kill()
-                except Exception:
-                    pass
-
-
-# ---------------------------------------------------------------------------
-# Helper: wireless interface detection
-# ---------------------------------------------------------------------------
-def get_all_wireless_ifaces():
-    ifaces = []
-    try:
-        result = subprocess.run(["iw", "dev"], capture_output=True, text=True, timeout=5)
-        for line in result.stdout.splitlines():
-            m = re.match(r'\s+Interface\s+(\S+)', line)
-            if m:
-                ifaces.append(m.group(1))
-    except Exception:
-        pass
-    if not ifaces:
-        try:
-            result = subprocess.run(["iwconfig"], capture_output=True, text=True, timeout=5)
-            ifaces = re.findall(r'^(\w+)\s+IEEE', result.stdout + result.stderr, re.MULTILINE)
-        except Exception:
-            pass
-    if not ifaces:
-        try:
-            with open("/proc/net/wireless") as f:
-                for line in f.readlines()[2:]:
-                    iface = line.split(":")[0].strip()
-                    if iface:
-                        ifaces.append(iface)
-        except Exception:
-            pass
-    return ifaces or ["wlan0"]
-
-
-def get_iface_mode(iface):
-    try:
-        result = subprocess.run(["iw", "dev", iface, "info"], capture_output=True, text=True, timeout=5)
-        m = re.search(r'type\s+(\S+)', result.stdout)
-        if m:
-            return m.group(1).lower()
-    except Exception:
-        pass
-    try:
-        result = subprocess.run(["iwconfig", iface], capture_output=True, text=True, timeout=5)
-        output = result.stdout + result.stderr
-        if re.search(r'Mode\s*:\s*Monitor', output, re.IGNORECASE):
-            return "monitor"
-        if re.search(r'Mode\s*:\s*Managed', output, re.IGNORECASE):
-            return "managed"
-    except Exception:
-        pass
-    return "unknown"
-
-
-def detect_interface():
-    ifaces = get_all_wireless_ifaces()
-    managed = monitor = None
-    for iface in ifaces:
-        mode = get_iface_mode(iface)
-        if mode == "monitor" and monitor is None:
-            monitor = iface
-        elif mode in ("managed", "unknown") and managed is None:
-            managed = iface
-    base = managed or monitor or "wlan0"
-    mon = monitor or (base + "mon")
-    return base, mon
+        self._timer.stop()
 
 
 # ---------------------------------------------------------------------------
@@ -753,10 +1415,17 @@ class WifiCardTab(QWidget):
     def __init__(self, status_bar, parent=None):
         super().__init__(parent)
         self.status_bar = status_bar
-        self.iface, self.mon_iface = detect_interface()
+        self.inventory = InterfaceInventory()
+        self.iface, self.mon_iface = "wlan0", "wlan0mon"
         self.worker = None
+        self._next_cmd = None   # run once the current command has exited
+        self._state = None
+        self._wanted = None     # interface restored from the session before the first snapshot
         self._build_ui()
-        self._refresh_state()
+        # The first snapshot is read in the background so the window is not held up by it.
+        self.mode_label.setText("Detecting…")
+        self.inventory.changed.connect(self._apply_state)
+        self.inventory.refresh()
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
@@ -778,7 +1447,6 @@ class WifiCardTab(QWidget):
 
         grid.addWidget(QLabel("Interface:"), 0, 0)
         self.iface_combo = QComboBox()
-        self._populate_interfaces()
         grid.addWidget(self.iface_combo, 0, 1)
 
         grid.addWidget(QLabel("Current Mode:"), 1, 0)
@@ -818,25 +1486,38 @@ class WifiCardTab(QWidget):
         btn_row.addStretch()
         layout.addLayout(btn_row)
 
-        self.console = ConsoleOutput()
+        self.console = ConsoleOutput(source="card")
         self.console.setFixedHeight(240)
         layout.addWidget(self.console)
         layout.addStretch()
 
-    def _populate_interfaces(self):
-        prev = self.iface_combo.currentData()
+    def _populate_interfaces(self, snapshot):
+        items = [(f"{iface}  [{mode}]", iface) for iface, (mode, _) in snapshot.items()]
+        items = items or [("wlan0  [unknown]", "wlan0")]
+        current = [(self.iface_combo.itemText(i), self.iface_combo.itemData(i))
+                   for i in range(self.iface_combo.count())]
+        if items == current:
+            return
+        prev = self.iface_combo.currentData() or self._wanted
         self.iface_combo.clear()
-        for iface in get_all_wireless_ifaces():
-            mode = get_iface_mode(iface)
-            self.iface_combo.addItem(f"{iface}  [{mode}]", iface)
-        if self.iface_combo.count() == 0:
-            self.iface_combo.addItem("wlan0  [unknown]", "wlan0")
+        for text, iface in items:
+            self.iface_combo.addItem(text, iface)
         # Restore previous selection
         for i in range(self.iface_combo.count()):
             if self.iface_combo.itemData(i) == prev:
                 self.iface_combo.setCurrentIndex(i)
                 break
 
+    def session_state(self):
+        return {"iface": self._get_current_iface()}
+
+    def restore_state(self, state):
+        self._wanted = state.get("iface")
+        i = self.iface_combo.findData(self._wanted)
+        if i >= 0 and i != self.iface_combo.currentIndex():
+            self.iface_combo.setCurrentIndex(i)
+            self._apply_state(self.inventory.snapshot())
+
     def _get_current_iface(self):
         data = self.iface_combo.currentData()
         if data:
@@ -845,11 +1526,14 @@ class WifiCardTab(QWidget):
         return text.split()[0] if text else "wlan0"
 
     def _refresh_state(self):
-        self._populate_interfaces()
-        iface = self._get_current_iface()
+        self._state = None     # report the result even if nothing changed
+        self.inventory.refresh()
+
+    def _apply_state(self, snapshot):
         try:
-            mode = get_iface_mode(iface)
-            all_ifaces = get_all_wireless_ifaces()
+            self._populate_interfaces(snapshot)
+            iface = self._get_current_iface()
+            mode, driver = snapshot.get(iface, ("unknown", "Unknown"))
 
             if mode == "monitor":
                 self.mode_label.setText("Monitor Mode  🔴")
@@ -864,7 +1548,7 @@ class WifiCardTab(QWidget):
                 self.mode_label.setStyleSheet(f"color:{PALETTE['green']};font-weight:700;")
                 self.toggle_btn.setText("Enable Monitor Mode")
                 self.toggle_btn.setObjectName("primary")
-                mon_iface = next((i for i in all_ifaces if get_iface_mode(i) == "monitor"), None)
+                mon_iface = engine.monitor_iface(snapshot)
                 if mon_iface:
                     self.mon_label.setText(mon_iface)
                     self.mon_label.setStyleSheet(f"color:{PALETTE['mauve']};font-weight:700;")
@@ -877,17 +1561,16 @@ class WifiCardTab(QWidget):
             self.toggle_btn.style().unpolish(self.toggle_btn)
             self.toggle_btn.style().polish(self.toggle_btn)
 
-            # Driver info
-            try:
-                dr = subprocess.run(["ethtool", "-i", iface], capture_output=True, text=True, timeout=5)
-                m = re.search(r'driver:\s+(\S+)', dr.stdout)
-                self.driver_label.setText(m.group(1) if m else "Unknown")
-            except Exception:
-                self.driver_label.setText("Unknown")
-
-            self.status_bar.update_interface(iface, mode)
-            self.mode_changed.emit(iface, emit_mon)
-            self.console.append_info(f"Interface: {iface} | Mode: {mode} | Monitor: {self.mon_label.text()}")
+            self.driver_label.setText(driver)
+
+            # Link events also fire for carrier changes; only announce real ones.
+            state = (iface, mode, emit_mon, self.mon_label.text())
+            if state != self._state:
+                self._state = state
+                self.iface, self.mon_iface = iface, emit_mon
+                self.status_bar.update_interface(iface, mode)
+                self.mode_changed.emit(iface, emit_mon)
+                self.console.append_info(f"Interface: {iface} | Mode: {mode} | Monitor: {self.mon_label.text()}")
         except Exception as e:
             self.console.append_error(f"Could not read interface state: {e}")
 
@@ -896,24 +1579,24 @@ class WifiCardTab(QWidget):
         if "Enable" in self.toggle_btn.text():
             self.console.append_info(f"Starting monitor mode on {iface}…")
             self.status_bar.set_status("Enabling monitor mode…", PALETTE["yellow"])
-            self._run_cmd(["sudo", "airmon-ng", "start", iface])
+            self._run_cmd(engine.monitor_command(iface))
         else:
             self.console.append_info("Stopping monitor mode…")
             self.status_bar.set_status("Disabling monitor mode…", PALETTE["yellow"])
-            all_ifaces = get_all_wireless_ifaces()
-            mon_iface = next((i for i in all_ifaces if get_iface_mode(i) == "monitor"), None)
-            target = mon_iface or (iface + "mon")
-            self._run_cmd(["sudo", "airmon-ng", "stop", target])
+            target = engine.monitor_iface(self.inventory.snapshot()) or (iface + "mon")
+            self._run_cmd(engine.monitor_command(target, enable=False))
 
     def _kill_processes(self):
         self.console.append_warn("Killing interfering processes…")
-        self._run_cmd(["sudo", "airmon-ng", "check", "kill"])
+        self._run_cmd(engine.kill_interfering_command())
 
     def _run_cmd(self, cmd):
         if self.worker and self.worker.isRunning():
+            # Never wait on the GUI thread: _on_cmd_done starts it once this one exits.
+            self._next_cmd = cmd
             self.worker.stop()
-            self.worker.wait()
-        self.worker = WorkerThread(cmd)
+            return
+        self.worker = ChildProcess(cmd, sudo_kill=True)
         self.worker.output.connect(lambda t, _: self.console.append_raw(t))
         self.worker.finished.connect(self._on_cmd_done)
         self.worker.error.connect(self.console.append_error)
@@ -922,6 +1605,10 @@ class WifiCardTab(QWidget):
         self.kill_btn.setEnabled(False)
 
     def _on_cmd_done(self, rc):
+        if self._next_cmd:
+            cmd, self._next_cmd = self._next_cmd, None
+            self._run_cmd(cmd)
+            return
         self.toggle_btn.setEnabled(True)
         self.kill_btn.setEnabled(True)
         if rc == 0:
@@ -930,128 +1617,331 @@ class WifiCardTab(QWidget):
         else:
             self.console.append_error(f"Command exited with code {rc}")
             self.status_bar.set_status("Error", PALETTE["red"])
-        QTimer.singleShot(800, self._refresh_state)
-        QTimer.singleShot(1500, self._refresh_state)
+        self._refresh_state()
+        if not self.inventory.watching:
+            # No link events to catch airmon-ng's late rename; read once more.
+            QTimer.singleShot(1500, self.inventory.refresh)
 
 
 # ---------------------------------------------------------------------------
-# Scan thread
+# Scan results model
 # ---------------------------------------------------------------------------
-class ScanThread(QThread):
-    network_found = pyqtSignal(dict)
-    client_found = pyqtSignal(dict)
-    raw_output = pyqtSignal(str)
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
 
-    _MAC_RE = re.compile(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$')
-    _CSV_PATH = "/tmp/ns_scan-01.csv"
 
-    def __init__(self, iface, band="abg"):
-        super().__init__()
-        self.iface = iface
-        self.band = band
-        self.process = None
-        self._stop = False
-        self._networks = {}
-        self._clients = {}
-        self._lock = threading.Lock()
-
-    def run(self):
-        # Clean up old files
-        for f in [self._CSV_PATH, "/tmp/ns_scan-01.cap"]:
-            try: os.remove(f)
-            except Exception: pass
-
-        cmd = ["sudo", "airodump-ng", "--output-format", "csv",
-               "--write", "/tmp/ns_scan", "--band", self.band, self.iface]
-        try:
-            self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
-                                            stderr=subprocess.STDOUT, text=True, bufsize=1)
-            csv_thread = threading.Thread(target=self._parse_csv, daemon=True)
-            csv_thread.start()
-            for line in iter(self.process.stdout.readline, ''):
-                if self._stop:
-                    break
-                self.raw_output.emit(line.rstrip())
-            self.process.wait()
-        except Exception as e:
-            self.raw_output.emit(f"Error: {e}")
+class ScanModel(QAbstractItemModel):
+    """Networks as top-level rows with their associated clients as children.
+
+    Rows are stored column-wise in parallel lists indexed by row (display id,
+    Network record, client MACs) instead of one item object per cell; text,
+    colors and the band column are derived in data() when a row is actually
+    painted. The records are the ones ScanJob parsed, shared rather than
+    copied. A child index carries its parent network's id as internalId,
+    which stays valid when rows are removed.
+    """
 
-    def _parse_csv(self):
-        while not self._stop:
-            time.sleep(2)
-            if not os.path.exists(self._CSV_PATH):
+    HEADERS = ["#", "BSSID", "SSID", "PWR", "CH", "Band", "Security", "Clients"]
+    # Display ids only grow and rows are only appended, so row order already
+    # is "#" ascending and the proxy need not sort for it.
+    NATURAL_ORDER = 0
+    _COLORS = {name: QColor(PALETTE[name]) for name in
+               ("blue", "sapphire", "peach", "teal", "overlay1", "green", "yellow", "red")}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._counter = 0
+        self._id = []
+        self._net = []
+        self._children = []   # row -> [client mac, ...]
+        self._row = {}        # network mac -> row
+        self._id_row = {}     # id -> row
+        self._clients = {}    # client mac -> Client
+
+    @classmethod
+    def power_color(cls, power):
+        if power > -50:   return cls._COLORS["green"]
+        if power > -70:   return cls._COLORS["yellow"]
+        return cls._COLORS["red"]
+
+    # ── Qt model interface ──────────────────────────────────────────────────
+    def index(self, row, column, parent=QModelIndex()):
+        # Called for every painted or sorted cell, so bounds are checked
+        # directly instead of through hasIndex() and rowCount().
+        if row < 0 or not 0 <= column < 8:
+            return QModelIndex()
+        if parent.isValid():
+            prow = parent.row()
+            if parent.internalId() or row >= len(self._children[prow]):
+                return QModelIndex()
+            return self.createIndex(row, column, self._id[prow])
+        if row >= len(self._id):
+            return QModelIndex()
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        if not index.isValid() or not index.internalId():
+            return QModelIndex()
+        return self.createIndex(self._id_row[index.internalId()], 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._id)
+        if parent.internalId() or parent.column() != 0:
+            return 0
+        return len(self._children[parent.row()])
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId():
+            return self._client_data(index, role)
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            net = self._net[row]
+            if col == 0: return str(self._id[row])
+            if col == 1: return net.bssid
+            if col == 2: return net.ssid
+            if col == 3: return str(net.power)
+            if col == 4: return str(net.channel)
+            if col == 5: return net.band
+            if col == 6: return net.privacy
+            return str(len(self._children[row]))
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == 1: return self._COLORS["blue"]
+            if col == 3: return self.power_color(self._net[row].power)
+            if col == 4: return self._COLORS["sapphire"]
+            if col == 5: return self._COLORS["peach" if self._net[row].band == "5 GHz" else "teal"]
+            if col == 6: return self._COLORS["peach"]
+            return None
+        if role == SORT_ROLE:
+            return self.sort_key(index)
+        if role == Qt.ItemDataRole.UserRole:
+            return self._net[row]
+        return None
+
+    def _client_data(self, index, role):
+        sta = self._clients[self._children[self._id_row[index.internalId()]][index.row()]]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 1: return f"  └─ {sta.bssid}"
+            if col == 2: return f"Client  [{sta.bssid[:8]}]"
+            if col == 3: return str(sta.power)
+            return ""
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == 1: return self._COLORS["teal"]
+            if col == 2: return self._COLORS["overlay1"]
+            if col == 3: return self.power_color(sta.power)
+            return None
+        if role == SORT_ROLE:
+            return self.sort_key(index)
+        return None
+
+    def search_text(self, row, parent):
+        """Lower-cased text the scan filter matches against."""
+        if parent.isValid():
+            return int_to_mac(self._children[parent.row()][row]).lower()
+        net = self._net[row]
+        return f"{net.bssid} {net.ssid} {net.privacy}".lower()
+
+    def sort_key(self, index):
+        row, col, parent_id = index.row(), index.column(), index.internalId()
+        if parent_id:
+            mac = self._children[self._id_row[parent_id]][row]
+            return self._clients[mac].power if col == 3 else mac
+        net = self._net[row]
+        if col == 0: return self._id[row]
+        if col == 1: return net.mac
+        if col == 2: return net.ssid.lower()
+        if col == 3: return net.power
+        if col == 4: return net.channel
+        if col == 5: return net.channel
+        if col == 6: return net.privacy
+        return len(self._children[row])
+
+    # ── Store ───────────────────────────────────────────────────────────────
+    def networks(self):
+        """(display id, Network) pairs in row order."""
+        return list(zip(self._id, self._net))
+
+    def client_count(self):
+        return len(self._clients)
+
+    def display_id(self, mac):
+        row = self._row.get(mac)
+        return None if row is None else self._id[row]
+
+    def restore(self, networks, clients):
+        """Replaces the rows with saved (display id, Network) pairs and their Clients in one reset."""
+        self.beginResetModel()
+        for col in (self._id, self._net, self._children):
+            col.clear()
+        self._row.clear()
+        self._id_row.clear()
+        self._clients.clear()
+        for num, net in networks:
+            row = len(self._id)
+            self._row[net.mac] = row
+            self._id_row[num] = row
+            self._id.append(num)
+            self._net.append(net)
+            self._children.append([])
+        self._counter = max(self._id, default=0)
+        for sta in clients:
+            row = self._row.get(sta.ap)
+            if row is not None:
+                self._clients[sta.mac] = sta
+                self._children[row].append(sta.mac)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._counter = 0
+        for col in (self._id, self._net, self._children):
+            col.clear()
+        self._row.clear()
+        self._id_row.clear()
+        self._clients.clear()
+        self.endResetModel()
+
+    def apply_batch(self, batch):
+        """Applies one ScanJob batch, signalling contiguous ranges rather than cells."""
+        new_nets, changed = [], set()
+        for net in batch["networks"]:
+            row = self._row.get(net.mac)
+            if row is None:
+                new_nets.append(net)
                 continue
-            try:
-                with open(self._CSV_PATH, "rb") as f:
-                    content = f.read().decode('utf-8', errors='ignore')
+            self._net[row] = net
+            changed.add(row)
+        clients = batch["clients"]
+        if new_nets:
+            first = len(self._id)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_nets) - 1)
+            fresh = {net.mac for net in new_nets}
+            pending = {}
+            for sta in clients:
+                if sta.ap in fresh and sta.mac not in self._clients:
+                    pending.setdefault(sta.ap, []).append(sta.mac)
+                    self._clients[sta.mac] = sta
+            # Clients of brand-new networks ride along in the same insert.
+            clients = [sta for sta in clients if self._clients.get(sta.mac) is not sta]
+            for net in new_nets:
+                self._counter += 1
+                row = len(self._id)
+                self._row[net.mac] = row
+                self._id_row[self._counter] = row
+                self._id.append(self._counter)
+                self._net.append(net)
+                self._children.append(pending.get(net.mac, []))
+            self.endInsertRows()
+        self._emit_rows_changed(changed, 2, 6)
+
+        added, counts = {}, set()
+        for sta in clients:
+            row = self._row.get(sta.ap)
+            if row is None:
+                continue
+            known = self._clients.get(sta.mac)
+            if known is not None and known.ap != sta.ap:
+                counts.add(self._remove_client(sta.mac))
+                known = None
+            self._clients[sta.mac] = sta
+            if known is not None:
+                idx = self.index(self._children[row].index(sta.mac), 3, self.index(row, 0))
+                self.dataChanged.emit(idx, idx)
+            else:
+                added.setdefault(row, []).append(sta.mac)
+        for row, macs in added.items():
+            kids = self._children[row]
+            self.beginInsertRows(self.index(row, 0), len(kids), len(kids) + len(macs) - 1)
+            kids.extend(macs)
+            self.endInsertRows()
+            counts.add(row)
+        for mac in batch["lost_clients"]:
+            counts.add(self._remove_client(mac))
+        counts.discard(None)
+        self._emit_rows_changed(counts, 7, 7)
+
+        for mac in batch["lost_networks"]:
+            self._remove_network(mac)
+
+    def _emit_rows_changed(self, rows, first_col, last_col):
+        run_start = prev = None
+        for row in sorted(rows) + [None]:
+            if row is not None and prev is not None and row == prev + 1:
+                prev = row
+                continue
+            if run_start is not None:
+                self.dataChanged.emit(self.index(run_start, first_col), self.index(prev, last_col))
+            run_start = prev = row
+
+    def _remove_client(self, mac):
+        sta = self._clients.pop(mac, None)
+        row = self._row.get(sta.ap) if sta else None
+        if row is None:
+            return None
+        kids = self._children[row]
+        i = kids.index(mac)
+        self.beginRemoveRows(self.index(row, 0), i, i)
+        del kids[i]
+        self.endRemoveRows()
+        return row
+
+    def _remove_network(self, mac):
+        row = self._row.get(mac)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for sta_mac in self._children[row]:
+            self._clients.pop(sta_mac, None)
+        for col in (self._id, self._net, self._children):
+            del col[row]
+        self._row = {net.mac: r for r, net in enumerate(self._net)}
+        self._id_row = {i: r for r, i in enumerate(self._id)}
+        self.endRemoveRows()
 
-                sep = '\r\n\r\n' if '\r\n\r\n' in content else '\n\n'
-                sections = content.split(sep)
-                if len(sections) < 2:
-                    continue
 
-                # Parse APs
-                for line in sections[0].splitlines()[2:]:
-                    if not line.strip():
-                        continue
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) < 14:
-                        continue
-                    bssid = parts[0]
-                    if not self._MAC_RE.match(bssid):
-                        continue
-                    net = {
-                        "bssid": bssid, "channel": parts[3],
-                        "power": parts[8], "privacy": parts[5],
-                        "ssid": parts[13] or "<Hidden>",
-                    }
-                    with self._lock:
-                        if bssid not in self._networks:
-                            self._networks[bssid] = net
-                            self.network_found.emit(net)
-                        else:
-                            self._networks[bssid].update(net)
-
-                # Parse clients
-                sta_section = sections[1].strip()
-                if not sta_section:
-                    continue
-                for line in sta_section.splitlines()[2:]:
-                    if not line.strip():
-                        continue
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) < 6:
-                        continue
-                    sta_mac = parts[0]
-                    ap_bssid = parts[5].strip()
-                    if (not self._MAC_RE.match(sta_mac) or not self._MAC_RE.match(ap_bssid)
-                            or "(not associated)" in ap_bssid.lower()):
-                        continue
-                    power = parts[3] if len(parts) > 3 else "-100"
-                    sta = {"bssid": sta_mac, "ap_bssid": ap_bssid, "power": power}
-                    key = f"{sta_mac}:{ap_bssid}"
-                    with self._lock:
-                        if key not in self._clients:
-                            self._clients[key] = sta
-                            self.client_found.emit(sta)
-                        elif self._clients[key]["power"] != power:
-                            self._clients[key]["power"] = power
-                            self.client_found.emit(sta)
-            except Exception as e:
-                self.raw_output.emit(f"CSV parse error: {e}")
+class ScanProxyModel(QSortFilterProxyModel):
+    """Sorts and filters by reading the source model's columns directly.
 
-    def stop(self):
-        self._stop = True
-        if self.process:
-            try:
-                subprocess.run(["sudo", "kill", str(self.process.pid)],
-                               capture_output=True, timeout=2)
-                self.process.terminate()
-            except Exception:
-                pass
-        for f in [self._CSV_PATH, "/tmp/ns_scan-01.cap"]:
-            try: os.remove(f)
-            except Exception: pass
+    Both are hot paths on large surveys: going through data() would cost two
+    Python calls per comparison and one per column per filtered row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self.setSortRole(SORT_ROLE)
+        self.setRecursiveFilteringEnabled(True)
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        return self._needle in self.sourceModel().search_text(source_row, source_parent)
+
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        return model.sort_key(left) < model.sort_key(right)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # A source model whose rows are already in ascending order of one
+        # column names it as NATURAL_ORDER; showing source order then costs
+        # no comparisons on resets and inserts.
+        if column == getattr(self.sourceModel(), "NATURAL_ORDER", None) and order == Qt.SortOrder.AscendingOrder:
+            column = -1
+        super().sort(column, order)
 
 
 # ---------------------------------------------------------------------------
@@ -1063,17 +1953,37 @@ class ScanTab(QWidget):
     def __init__(self, status_bar, parent=None):
         super().__init__(parent)
         self.status_bar = status_bar
-        self.scan_thread = None
+        self.scan_job = None
         self.mon_iface = "wlan0mon"
-        self._networks = {}
-        self._net_items = {}
-        self._client_items = {}
-        self._net_counter = 0
+        self.model = ScanModel(self)
+        self.proxy = ScanProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self._history = None
+        self.session = None
         self._build_ui()
 
     def set_monitor_iface(self, iface):
         self.mon_iface = iface
 
+    def session_state(self):
+        return {"iface": self.mon_iface_edit.text(), "band": self.band_combo.currentData(),
+                "filter": self.filter_edit.text()}
+
+    def restore_state(self, state):
+        self.mon_iface_edit.setText(state.get("iface", self.mon_iface_edit.text()))
+        i = self.band_combo.findData(state.get("band"))
+        if i >= 0:
+            self.band_combo.setCurrentIndex(i)
+        self.filter_edit.setText(state.get("filter", ""))
+
+    def restore_results(self, networks, clients):
+        """Shows the last session's scan results, unless a scan already filled the table."""
+        if self.model.rowCount() or not networks:
+            return
+        self.model.restore(networks, clients)
+        self._update_badge()
+        self.status_lbl.setText(f"Restored {len(networks)} networks from the last session.")
+
     def _build_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -1130,19 +2040,26 @@ class ScanTab(QWidget):
         self.clear_btn.setMinimumHeight(38)
         self.clear_btn.clicked.connect(self._clear)
 
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter BSSID / SSID / security…")
+        self.filter_edit.setFixedWidth(220)
+        self.filter_edit.textChanged.connect(self.proxy.set_filter_text)
+
         for w in [iface_lbl, self.mon_iface_edit, band_lbl, self.band_combo,
-                  self.scan_btn, self.set_target_btn, self.clear_btn]:
+                  self.scan_btn, self.set_target_btn, self.clear_btn, self.filter_edit]:
             ctrl.addWidget(w)
         ctrl.addStretch()
         layout.addLayout(ctrl)
 
         splitter = QSplitter(Qt.Orientation.Vertical)
 
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["#", "BSSID", "SSID", "PWR", "CH", "Band", "Security", "Clients"])
+        self.tree = QTreeView()
+        self.tree.setModel(self.proxy)
+        self.tree.setUniformRowHeights(True)
         self.tree.setAlternatingRowColors(True)
-        self.tree.setAnimated(True)
-        self.tree.setSelectionMode(QTreeWidget.SelectionMode.ExtendedSelection)
+        self.tree.setSelectionMode(QTreeView.SelectionMode.ExtendedSelection)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self._show_context_menu)
         self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
@@ -1151,10 +2068,12 @@ class ScanTab(QWidget):
         self.tree.setColumnWidth(5, 72); self.tree.setColumnWidth(6, 100)
         self.tree.setColumnWidth(7, 65)
         self.tree.setMinimumHeight(280)
-        self.tree.itemDoubleClicked.connect(self._on_tree_click)
+        self.tree.doubleClicked.connect(self._on_tree_click)
+        self.proxy.rowsInserted.connect(
+            lambda parent, first, last: parent.isValid() and self.tree.expand(parent))
         splitter.addWidget(self.tree)
 
-        self.console = ConsoleOutput()
+        self.console = ConsoleOutput(source="scan")
         self.console.setFixedHeight(130)
         splitter.addWidget(self.console)
         layout.addWidget(splitter)
@@ -1177,7 +2096,7 @@ class ScanTab(QWidget):
         self.band_badge.style().polish(self.band_badge)
 
     def _toggle_scan(self):
-        if self.scan_thread and self.scan_thread.isRunning():
+        if self.scan_job and self.scan_job.isRunning():
             self._stop_scan()
         else:
             self._start_scan()
@@ -1185,25 +2104,36 @@ class ScanTab(QWidget):
     def _start_scan(self):
         iface = self.mon_iface_edit.text().strip() or self.mon_iface
         band = self.band_combo.currentData() or "abg"
-        self._net_counter = 0
-        self.scan_thread = ScanThread(iface, band)
-        self.scan_thread.network_found.connect(self._on_network)
-        self.scan_thread.client_found.connect(self._on_client)
-        self.scan_thread.raw_output.connect(self.console.append_raw)
-        self.scan_thread.start()
+        self.scan_job = ScanJob(iface, band)
+        self.scan_job.batch_ready.connect(self._on_batch)
+        self.scan_job.raw_output.connect(self.console.append_raw)
+        self.scan_job.frame.connect(self._on_frame)
+        self.scan_job.start()
+        self.scan_job.process.finished.connect(self._on_scan_done)
+        self.scan_job.process.error.connect(self._on_scan_done)
 
         self._set_scan_btn_state(scanning=True)
         band_label = self.band_combo.currentText().split("(")[0].strip()
-        self.status_lbl.setText(f"Scanning on {iface} — {band_label}…")
+        self._scan_label = f"Scanning on {iface} — {band_label}"
+        self.status_lbl.setText(f"{self._scan_label}…")
         self.status_bar.set_status(f"Scanning {iface} [{band_label}]", PALETTE["yellow"])
         self.console.append_info(f"Scan started on {iface} | Band: {band_label}")
 
+    def _on_frame(self, lines):
+        # airodump-ng's header line: channel, elapsed time, handshakes seen.
+        if self.scan_job and self.scan_job.isRunning():
+            self.status_lbl.setText(f"{self._scan_label}  │  {lines[0].strip()}")
+
     def _stop_scan(self):
-        if self.scan_thread:
-            self.scan_thread.stop()
-            self.scan_thread.wait()
+        # The button comes back in _on_scan_done once airodump-ng has exited.
+        self.scan_job.stop()
+        self.scan_btn.setEnabled(False)
+        self.status_lbl.setText("Stopping scan…")
+
+    def _on_scan_done(self, _result=None):
+        self.scan_btn.setEnabled(True)
         self._set_scan_btn_state(scanning=False)
-        self.status_lbl.setText(f"Scan stopped. {len(self._networks)} networks found.")
+        self.status_lbl.setText(f"Scan stopped. {self.model.rowCount()} networks found.")
         self.status_bar.set_status("Ready")
         self.console.append_info("Scan stopped.")
 
@@ -1217,98 +2147,38 @@ class ScanTab(QWidget):
         self.scan_btn.style().unpolish(self.scan_btn)
         self.scan_btn.style().polish(self.scan_btn)
 
-    @staticmethod
-    def _power_color(power):
-        try:
-            p = int(power)
-            if p > -50:   return QColor(PALETTE["green"])
-            if p > -70:   return QColor(PALETTE["yellow"])
-            return QColor(PALETTE["red"])
-        except Exception:
-            return QColor(PALETTE["subtext0"])
-
-    @staticmethod
-    def _channel_to_band(channel_str):
-        try:
-            return "5 GHz" if int(channel_str.strip()) > 14 else "2.4 GHz"
-        except Exception:
-            return "?"
-
-    def _on_network(self, net):
-        bssid = net["bssid"]
-        band = self._channel_to_band(net.get("channel", "0"))
-        net["band"] = band
-
-        if bssid not in self._net_items:
-            self._net_counter += 1
-            net["_id"] = self._net_counter
-            self._networks[bssid] = net
-            item = QTreeWidgetItem([
-                str(self._net_counter), bssid,
-                net["ssid"] or "<Hidden>",
-                net["power"], net["channel"], band, net["privacy"], "0"
-            ])
-            item.setData(0, Qt.ItemDataRole.UserRole, net)
-            item.setForeground(1, QColor(PALETTE["blue"]))
-            item.setForeground(3, self._power_color(net["power"]))
-            item.setForeground(4, QColor(PALETTE["sapphire"]))
-            item.setForeground(5, QColor(PALETTE["peach"] if band == "5 GHz" else PALETTE["teal"]))
-            item.setForeground(6, QColor(PALETTE["peach"]))
-            self.tree.addTopLevelItem(item)
-            self._net_items[bssid] = item
-            self._update_badge()
-        else:
-            item = self._net_items[bssid]
-            item.setText(3, net["power"])
-            item.setForeground(3, self._power_color(net["power"]))
-
-    def _on_client(self, sta):
-        ap_bssid = sta.get("ap_bssid", "").strip()
-        sta_mac = sta["bssid"]
-        parent_item = self._net_items.get(ap_bssid)
-        if not parent_item:
-            return
-
-        if sta_mac in self._client_items:
-            self._client_items[sta_mac].setText(3, sta.get("power", ""))
-        else:
-            child = QTreeWidgetItem(["", f"  └─ {sta_mac}",
-                                     f"Client  [{sta_mac[:8].upper()}]",
-                                     sta.get("power", ""), "", "", "", ""])
-            child.setForeground(1, QColor(PALETTE["teal"]))
-            child.setForeground(2, QColor(PALETTE["overlay1"]))
-            child.setForeground(3, self._power_color(sta.get("power", "-100")))
-            parent_item.addChild(child)
-            parent_item.setExpanded(True)
-            parent_item.setText(7, str(parent_item.childCount()))
-            self._client_items[sta_mac] = child
-            self.client_count_badge.setText(f"{len(self._client_items)} Clients")
+    def _on_batch(self, batch):
+        self.model.apply_batch(batch)
+        self._update_badge()
+        if self.session:
+            self.session.write_scan(batch, self.model.display_id)
 
     def _update_badge(self):
-        self.network_count_badge.setText(f"{self.tree.topLevelItemCount()} Networks")
+        self.network_count_badge.setText(f"{self.model.rowCount()} Networks")
+        self.client_count_badge.setText(f"{self.model.client_count()} Clients")
 
-    def _on_tree_click(self, item, col):
-        net = item.data(0, Qt.ItemDataRole.UserRole)
+    def _on_tree_click(self, index):
+        net = index.data(Qt.ItemDataRole.UserRole)
         if net:
-            self.status_bar.set_target(net.get("ssid", ""), net.get("bssid", ""))
-            self.console.append_info(f"Selected: {net.get('ssid','')} [{net.get('bssid','')}]")
+            self.status_bar.set_target(net.ssid, net.bssid)
+            self.console.append_info(f"Selected: {net.ssid} [{net.bssid}]")
 
     def _set_target(self):
-        item = self.tree.currentItem()
-        if not item:
+        index = self.tree.currentIndex()
+        if not index.isValid():
             self.console.append_warn("Select a network first.")
             return
-        net = item.data(0, Qt.ItemDataRole.UserRole)
+        net = index.data(Qt.ItemDataRole.UserRole)
         if net:
-            self.target_selected.emit(net.get("bssid", ""), net.get("ssid", ""), net.get("channel", ""))
-            self.console.append_success(f"Target set: {net.get('ssid','')} [{net.get('bssid','')}]")
-            self.status_bar.set_target(net.get("ssid", ""), net.get("bssid", ""))
+            self.target_selected.emit(net.bssid, net.ssid, str(net.channel))
+            self.console.append_success(f"Target set: {net.ssid} [{net.bssid}]")
+            self.status_bar.set_target(net.ssid, net.bssid)
         else:
             self.console.append_warn("Please select a network (not a client row).")
 
     def _show_context_menu(self, pos):
-        item = self.tree.itemAt(pos)
-        if not item:
+        index = self.tree.indexAt(pos)
+        if not index.isValid():
             return
         menu = QMenu(self)
         menu.setStyleSheet(f"""
@@ -1317,35 +2187,263 @@ class ScanTab(QWidget):
             QMenu::item {{ padding:6px 20px; border-radius:4px; }}
             QMenu::item:selected {{ background:{PALETTE['surface0']}; color:{PALETTE['mauve']}; }}
         """)
-        bssid = item.text(1).replace("└─ ", "").strip()
+        bssid = index.siblingAtColumn(1).data().replace("└─ ", "").strip()
         copy_bssid = menu.addAction("📋 Copy BSSID")
         copy_bssid.triggered.connect(lambda: QApplication.clipboard().setText(bssid))
-        net = item.data(0, Qt.ItemDataRole.UserRole)
+        station = index.parent().isValid()
+        history = menu.addAction("📈 Signal History")
+        history.triggered.connect(lambda: self._show_history(bssid, station))
+        net = index.data(Qt.ItemDataRole.UserRole)
         if net:
             copy_all = menu.addAction("📋 Copy All Info")
             copy_all.triggered.connect(lambda: QApplication.clipboard().setText(
-                f"BSSID: {net.get('bssid','')}\nSSID: {net.get('ssid','')}\n"
-                f"Channel: {net.get('channel','')}\nPower: {net.get('power','')} dBm\n"
-                f"Security: {net.get('privacy','')}"
+                f"BSSID: {net.bssid}\nSSID: {net.ssid}\n"
+                f"Channel: {net.channel}\nPower: {net.power} dBm\n"
+                f"Security: {net.privacy}"
             ))
             set_tgt = menu.addAction("🎯 Set as Target")
             set_tgt.triggered.connect(self._set_target)
         menu.exec(self.tree.viewport().mapToGlobal(pos))
 
+    def _show_history(self, bssid, station, window=600):
+        try:
+            if self._history is None:
+                self._history = ScanHistory(HISTORY_DB)
+            mac = mac_to_int(bssid)
+            last = self._history.last_seen(mac, station)
+            lo, hi, avg, n = self._history.rssi_stats(mac, time.time() - window, station=station)
+        except Exception as e:
+            self.console.append_error(f"Scan history unavailable: {e}")
+            return
+        if last is None:
+            self.console.append_info(f"No history recorded for {bssid}.")
+            return
+        seen = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last))
+        if n:
+            self.console.append_info(f"{bssid}: last seen {seen} | last {window // 60} min: "
+                                     f"min {lo} / max {hi} / avg {avg:.1f} dBm over {n} samples")
+        else:
+            self.console.append_info(f"{bssid}: last seen {seen} | no power samples in the last {window // 60} min")
+
     def get_networks(self):
-        return sorted(self._networks.values(), key=lambda n: n.get("_id", 0))
+        return self.model.networks()
 
     def _clear(self):
-        self.tree.clear()
-        self._networks.clear()
-        self._net_items.clear()
-        self._client_items.clear()
-        self._net_counter = 0
+        self.model.clear()
         self._update_badge()
-        self.client_count_badge.setText("0 Clients")
+        if self.session:
+            self.session.clear_scan()
         self.console.append_info("Cleared scan results.")
 
 
+# ---------------------------------------------------------------------------
+# Capture library model
+# ---------------------------------------------------------------------------
+class LibraryModel(QAbstractItemModel):
+    """Flat table of CaptureEntry rows, updated in place as the library syncs."""
+
+    HEADERS = ["File", "Size", "Networks", "Handshake", "Hashcat", "John", "Modified"]
+    _COLORS = {name: QColor(PALETTE[name]) for name in
+               ("blue", "green", "yellow", "overlay1", "peach", "subtext0")}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+        self._row = {}      # path -> row
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._entries) or not 0 <= column < len(self.HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    @staticmethod
+    def _handshake(entry):
+        if entry.format is None:
+            return "not a capture"
+        if entry.crackable:
+            return f"✓ crackable ({entry.crackable})"
+        return "partial" if entry.eapol else "none"
+
+    @staticmethod
+    def _size(n):
+        for unit in ("B", "KB", "MB", "GB"):
+            if n < 1024 or unit == "GB":
+                return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+            n /= 1024
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry, col = self._entries[index.row()], index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0: return entry.name
+            if col == 1: return self._size(entry.size)
+            if col == 2:
+                shown = ", ".join(entry.ssids[:3])
+                more = len(entry.bssids) - min(3, len(entry.ssids))
+                return f"{shown} (+{more})" if shown and more > 0 else shown or f"{len(entry.bssids)} BSSIDs"
+            if col == 3: return self._handshake(entry)
+            if col in (4, 5):
+                state = entry.converted(".hc22000" if col == 4 else ".hccap")
+                return {"current": "✓", "stale": "outdated"}.get(state, "")
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.mtime_ns / 1e9))
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == 0: return self._COLORS["blue"]
+            if col == 3:
+                return self._COLORS["green" if entry.crackable else "yellow" if entry.eapol else "overlay1"]
+            if col in (4, 5): return self._COLORS["green"]
+            if col == 6: return self._COLORS["subtext0"]
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return entry.path if col == 0 else "\n".join(entry.ssids) if col == 2 else None
+        if role == SORT_ROLE:
+            return self.sort_key(index)
+        if role == Qt.ItemDataRole.UserRole:
+            return entry
+        return None
+
+    def search_text(self, row, parent):
+        entry = self._entries[row]
+        return f"{entry.name} {' '.join(entry.ssids)} {' '.join(entry.bssids)}".lower()
+
+    def sort_key(self, index):
+        entry, col = self._entries[index.row()], index.column()
+        if col == 0: return entry.name.lower()
+        if col == 1: return entry.size
+        if col == 2: return len(entry.bssids)
+        if col == 3: return (entry.crackable, entry.eapol)
+        if col == 4: return entry.hc22000 or 0
+        if col == 5: return entry.hccap or 0
+        return entry.mtime_ns
+
+    def apply(self, changed, removed):
+        for path in removed:
+            row = self._row.get(path)
+            if row is None:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._entries[row]
+            self._row = {e.path: r for r, e in enumerate(self._entries)}
+            self.endRemoveRows()
+        new = []
+        for entry in changed:
+            row = self._row.get(entry.path)
+            if row is None:
+                new.append(entry)
+                continue
+            self._entries[row] = entry
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        if new:
+            first = len(self._entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            for entry in new:
+                self._row[entry.path] = len(self._entries)
+                self._entries.append(entry)
+            self.endInsertRows()
+
+    def entry_count(self):
+        return len(self._entries)
+
+    def crackable_count(self):
+        return sum(1 for entry in self._entries if entry.crackable)
+
+
+# ---------------------------------------------------------------------------
+# Conversion queue model
+# ---------------------------------------------------------------------------
+class ConversionModel(QAbstractItemModel):
+    """The queue's jobs in submission order; rows refresh as jobs change state."""
+
+    HEADERS = ["Capture", "Format", "State", "Time", "Detail"]
+    _COLORS = {"queued": QColor(PALETTE["overlay1"]), "running": QColor(PALETTE["yellow"]),
+               "done": QColor(PALETTE["green"]), "skipped": QColor(PALETTE["teal"]),
+               "empty": QColor(PALETTE["peach"]), "failed": QColor(PALETTE["red"]),
+               "cancelling": QColor(PALETTE["overlay1"]), "cancelled": QColor(PALETTE["overlay1"])}
+
+    def __init__(self, queue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self._jobs = []
+        self._row = {}      # id(job) -> row
+        queue.job_changed.connect(self._on_job_changed)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._jobs) or not 0 <= column < len(self.HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        job, col = self._jobs[index.row()], index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0: return os.path.basename(job.cap)
+            if col == 1: return CONVERSION_FORMATS.get(job.fmt, job.fmt)
+            if col == 2: return job.state
+            if col == 3: return f"{job.elapsed:.1f}s" if job.started else ""
+            return job.detail
+        if role == Qt.ItemDataRole.ForegroundRole and col == 2:
+            return self._COLORS.get(job.state)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return job.cap if col == 0 else job.out if col == 1 else job.detail or None
+        if role == Qt.ItemDataRole.UserRole:
+            return job
+        return None
+
+    def _on_job_changed(self, job):
+        row = self._row.get(id(job))
+        if row is None:
+            row = len(self._jobs)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._row[id(job)] = row
+            self._jobs.append(job)
+            self.endInsertRows()
+            return
+        self.dataChanged.emit(self.index(row, 2), self.index(row, len(self.HEADERS) - 1))
+
+    def refresh_running(self):
+        """Updates the Time column of running jobs."""
+        for job in self.queue.running_jobs():
+            row = self._row.get(id(job))
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 3), self.index(row, 3))
+
+    def sync(self):
+        """Drops rows for jobs the queue no longer holds."""
+        self.beginResetModel()
+        self._jobs = list(self.queue.jobs)
+        self._row = {id(job): row for row, job in enumerate(self._jobs)}
+        self.endResetModel()
+
+
 # ---------------------------------------------------------------------------
 # Handshake capture tab
 # ---------------------------------------------------------------------------
@@ -1354,8 +2452,10 @@ class HandshakeTab(QWidget):
         super().__init__(parent)
         self.status_bar = status_bar
         self.worker = None
+        self.monitor = None
         self._networks = []
         self._handshake_detected = False
+        self._verified = False
         self._build_ui()
 
     def set_target(self, bssid, ssid, channel):
@@ -1370,11 +2470,19 @@ class HandshakeTab(QWidget):
         self._networks = networks
         self._refresh_combo()
 
+    def session_state(self):
+        return {"iface": self.iface_edit.text(), "name": self.name_edit.text(),
+                "autostop": self.autostop_check.isChecked()}
+
+    def restore_state(self, state):
+        self.iface_edit.setText(state.get("iface", self.iface_edit.text()))
+        self.name_edit.setText(state.get("name", ""))
+        self.autostop_check.setChecked(state.get("autostop", True))
+
     def _refresh_combo(self):
         self.wifi_combo.clear()
-        for net in self._networks:
-            label = f"[{net.get('_id',0)}] {net.get('ssid','?')} — {net.get('bssid','')}"
-            self.wifi_combo.addItem(label, net)
+        for num, net in self._networks:
+            self.wifi_combo.addItem(f"[{num}] {net.ssid} — {net.bssid}", net)
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
@@ -1422,10 +2530,13 @@ class HandshakeTab(QWidget):
         self.capture_btn.setMinimumHeight(42); self.capture_btn.setMinimumWidth(180)
         self.capture_btn.clicked.connect(self._toggle_capture)
         btn_row.addWidget(self.capture_btn)
+        self.autostop_check = QCheckBox("Stop once a usable handshake is on disk")
+        self.autostop_check.setChecked(True)
+        btn_row.addWidget(self.autostop_check)
         btn_row.addStretch()
         layout.addLayout(btn_row)
 
-        self.console = ConsoleOutput()
+        self.console = ConsoleOutput(source="handshake")
         layout.addWidget(self.console)
 
     def _toggle_capture(self):
@@ -1445,39 +2556,68 @@ class HandshakeTab(QWidget):
             return
 
         self._handshake_detected = False
+        self._verified = False
         iface = self.iface_edit.text().strip() or "wlan0mon"
-        bssid = net.get("bssid", "")
-        channel = net.get("channel", "")
+        bssid = net.bssid
+        channel = str(net.channel)
         save_path = str(CAPTURED_DIR / name)
+        cap_path = next_capture_path(save_path)
 
-        cmd = ["sudo", "airodump-ng", "--bssid", bssid, "-c", channel, "-w", save_path, iface]
-        self.worker = WorkerThread(cmd)
-        self.worker.output.connect(self._handle_output)
+        cmd = engine.capture_command(bssid, channel, save_path, iface)
+        self.worker = ChildProcess(cmd, sudo_kill=True, parser=AirodumpParser())
+        self.worker.output.connect(self.console.append_line)
+        self.worker.events.connect(self._on_events)
         self.worker.finished.connect(self._on_done)
         self.worker.error.connect(self.console.append_error)
         self.worker.start()
 
+        self.monitor = HandshakeMonitor(cap_path, bssid)
+        self.monitor.progress.connect(self._on_progress)
+        self.monitor.error.connect(self.console.append_warn)
+        self.monitor.start()
+
         self._set_capture_btn(capturing=True)
         self.status_bar.set_status("Capturing handshake…", PALETTE["yellow"])
-        self.console.append_info(f"Capturing from {net.get('ssid','')} [{bssid}] → {save_path}.*")
+        self.console.append_info(f"Capturing from {net.ssid} [{bssid}] → {cap_path}")
 
-    def _handle_output(self, text, _):
-        self.console.append_raw(text)
-        if not self._handshake_detected and any(
-                p in text.lower() for p in ["wpa handshake", "handshake", "4-way handshake", "eapol"]):
-            self._handshake_detected = True
-            self.console.append_success("🎉 Handshake captured!")
-            self.status_bar.set_status("Handshake captured!", PALETTE["green"])
+    def _on_events(self, events):
+        for ev in events:
+            if isinstance(ev, HandshakeCaptured) and not self._handshake_detected:
+                self._handshake_detected = True
+                what = "PMKID" if ev.kind == "pmkid" else "Handshake"
+                self.console.append_info(f"airodump-ng reports a {what} [{ev.bssid}]; checking the capture…")
 
-    def _stop(self):
+    def _on_progress(self, progress):
+        if self._verified:
+            return
+        seen = " ".join(f"M{n}" for n in progress.messages) or "none"
+        station = f" from {int_to_mac(progress.station)}" if progress.station is not None else ""
+        if not progress.complete:
+            self.console.append_info(f"EAPOL on disk{station}: {seen}")
+            self.status_bar.set_status(f"Capturing handshake… ({seen})", PALETTE["yellow"])
+            return
+        self._verified = True
+        what = "PMKID" if progress.pmkid and len(progress.messages) < 2 else "Handshake"
+        self.console.append_success(f"🎉 {what} verified in {self.monitor.path} [{progress.bssid}]{station}: {seen}")
+        self.status_bar.set_status(f"{what} captured!", PALETTE["green"])
+        if self.autostop_check.isChecked():
+            self._stop(keep_status=True)
+
+    def _stop(self, keep_status=False):
         if self.worker:
             self.worker.stop()
+        if self.monitor:
+            self.monitor.stop()
         self._set_capture_btn(capturing=False)
-        self.status_bar.set_status("Ready")
+        if not keep_status:
+            self.status_bar.set_status("Ready")
 
     def _on_done(self, rc):
+        if self.monitor:
+            self.monitor.stop()
         self._set_capture_btn(capturing=False)
-        self.status_bar.set_status("Ready")
+        if not self._verified:
+            self.status_bar.set_status("Ready")
 
     def _set_capture_btn(self, capturing: bool):
         if capturing:
@@ -1490,52 +2630,6 @@ class HandshakeTab(QWidget):
         self.capture_btn.style().polish(self.capture_btn)
 
 
-# ---------------------------------------------------------------------------
-# Attack thread (throttled output)
-# ---------------------------------------------------------------------------
-class AttackThread(QThread):
-    output = pyqtSignal(str, str)
-    finished = pyqtSignal(int)
-    error = pyqtSignal(str)
-
-    def __init__(self, cmd):
-        super().__init__()
-        self.cmd = cmd
-        self.process = None
-        self._stop = False
-        self._line_count = 0
-
-    def run(self):
-        try:
-            self.process = subprocess.Popen(
-                self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=True, bufsize=1
-            )
-            for line in iter(self.process.stdout.readline, ''):
-                if self._stop:
-                    break
-                self._line_count += 1
-                # Show first 20 lines, then every 10th (reduce UI flooding)
-                if line.strip() and (self._line_count <= 20 or self._line_count % 10 == 0):
-                    self.output.emit(line.rstrip(), "raw")
-            self.process.wait()
-            self.finished.emit(self.process.returncode)
-        except Exception as e:
-            self.error.emit(str(e))
-
-    def stop(self):
-        self._stop = True
-        if self.process:
-            try:
-                subprocess.run(["sudo", "kill", "-9", str(self.process.pid)],
-                               capture_output=True, timeout=2)
-                self.process.terminate()
-                self.process.wait(timeout=2)
-            except Exception:
-                try: self.process.kill()
-                except Exception: pass
-
-
 # ---------------------------------------------------------------------------
 # Deauth tab
 # ---------------------------------------------------------------------------
@@ -1556,6 +2650,18 @@ class DeauthTab(QWidget):
         self.target_info.setText(f"Target: {ssid}  [{bssid}]  CH:{channel}")
         self.target_info.setStyleSheet(f"color:{PALETTE['green']};font-size:11px;font-weight:700;")
 
+    def session_state(self):
+        return {"bssid": self.bssid_edit.text(), "channel": self.channel_edit.text(),
+                "iface": self.iface_edit.text(), "client": self.client_edit.text(),
+                "broadcast": self.broadcast_check.isChecked()}
+
+    def restore_state(self, state):
+        self.bssid_edit.setText(state.get("bssid", ""))
+        self.channel_edit.setText(state.get("channel", ""))
+        self.iface_edit.setText(state.get("iface", self.iface_edit.text()))
+        self.client_edit.setText(state.get("client", ""))
+        self.broadcast_check.setChecked(state.get("broadcast", True))
+
     def _build_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -1627,7 +2733,7 @@ class DeauthTab(QWidget):
         cl.addLayout(btn_row)
 
         layout.addWidget(card)
-        self.console = ConsoleOutput()
+        self.console = ConsoleOutput(source="deauth")
         layout.addWidget(self.console)
 
     _MAC_RE = re.compile(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$')
@@ -1655,40 +2761,44 @@ class DeauthTab(QWidget):
             return
 
         if channel:
-            try:
-                subprocess.run(["sudo", "iwconfig", iface, "channel", channel],
-                               capture_output=True, check=False, timeout=2)
-            except Exception:
-                pass
+            engine.set_channel(iface, channel)
 
-        cmd = ["sudo", "aireplay-ng", "--deauth", "0", "-a", bssid]
         target_desc = f"client {client}" if client else "all clients (broadcast)"
-        if client:
-            cmd += ["-c", client]
-        cmd.append(iface)
-
-        self.worker = AttackThread(cmd)
-        self.worker.output.connect(lambda t, _: self.console.append_raw(t))
+        self.worker = AttackProcess(engine.deauth_command(bssid, iface, client))
+        self.worker.output.connect(self.console.append_line)
+        self.worker.events.connect(self._on_events)
         self.worker.finished.connect(self._on_done)
         self.worker.error.connect(self.console.append_error)
         self.worker.start()
 
         self._set_btn_state(running=True)
+        self._target_desc = target_desc
+        self._bursts = self._acks = 0
         self.console.append_info(f"Deauth attack started → {bssid} targeting {target_desc}")
         self.status_bar.set_status(f"Deauth active [{target_desc}]", PALETTE["red"])
 
+    def _on_events(self, events):
+        sent = [ev for ev in events if isinstance(ev, DeauthSent)]
+        if sent and self.worker and self.worker.isRunning():
+            self._bursts += len(sent)
+            self._acks += sum(ev.acks or 0 for ev in sent)
+            self.status_bar.set_status(
+                f"Deauth active [{self._target_desc}] — {self._bursts} bursts, {self._acks} ACKs",
+                PALETTE["red"])
+
     def _stop(self):
-        if self.worker:
-            self.worker.stop()
-            self.worker.wait()
-        self._set_btn_state(running=False)
-        self.console.append_warn("Deauth attack stopped.")
-        self.status_bar.set_status("Ready")
+        # The button comes back in _on_done once aireplay-ng has exited.
+        self.worker.stop()
+        self.start_btn.setEnabled(False)
+        self.status_bar.set_status("Stopping deauth attack…", PALETTE["yellow"])
 
     def _on_done(self, rc):
+        self.start_btn.setEnabled(True)
         self._set_btn_state(running=False)
         self.status_bar.set_status("Ready")
-        if rc != 0:
+        if self.worker.stop_requested:
+            self.console.append_warn("Deauth attack stopped.")
+        elif rc != 0:
             self.console.append_error(f"Deauth process exited with code {rc}")
 
     def _set_btn_state(self, running: bool):
@@ -1706,11 +2816,29 @@ class DeauthTab(QWidget):
 # Crack & Convert tab  ← UNIFIED: one file picker, three actions
 # ---------------------------------------------------------------------------
 class CrackConvertTab(QWidget):
+    _index_ready = pyqtSignal(str, object)     # path, CaptureIndex or error text
+    _merged = pyqtSignal(str, object)          # directory, (added, dupes, total, networks) or error text
+
     def __init__(self, status_bar, parent=None):
         super().__init__(parent)
         self.status_bar = status_bar
         self.crack_worker = None
+        self._crack_verdict = None
+        self._key_reported = False
+        self._index = None
+        self._indexing = None
+        self._index_ready.connect(self._on_index_ready)
+        self._merge_dirs = set()      # output dirs with new Hashcat files since the last merge
+        self._merging = None
+        self._merged.connect(self._on_merged)
+        self.queue = ConversionQueue()
+        self.queue.job_changed.connect(self._on_job_changed)
+        self.queue.progress.connect(self._on_queue_progress)
+        self.jobs_model = ConversionModel(self.queue, self)
         self._build_ui()
+        self._tick = QTimer(self)
+        self._tick.setInterval(500)
+        self._tick.timeout.connect(self.jobs_model.refresh_running)
 
     def _build_ui(self):
         layout = QVBoxLayout(self)
@@ -1741,8 +2869,14 @@ class CrackConvertTab(QWidget):
         cap_row.addWidget(self.cap_edit)
         cap_row.addWidget(self.cap_browse)
         fg.addLayout(cap_row, 0, 1)
+        self.cap_edit.editingFinished.connect(self._index_cap)
 
-        fg.addWidget(QLabel("Wordlist (for crack):"), 1, 0)
+        self.cap_info = QLabel("")
+        self.cap_info.setWordWrap(True)
+        self.cap_info.setStyleSheet(f"color:{PALETTE['subtext0']};font-size:11px;")
+        fg.addWidget(self.cap_info, 1, 1)
+
+        fg.addWidget(QLabel("Wordlist (for crack):"), 2, 0)
         wl_row = QHBoxLayout()
         self.wl_edit = QLineEdit("/usr/share/wordlists/rockyou.txt")
         self.wl_browse = QPushButton("Browse")
@@ -1750,9 +2884,9 @@ class CrackConvertTab(QWidget):
         self.wl_browse.clicked.connect(self._browse_wordlist)
         wl_row.addWidget(self.wl_edit)
         wl_row.addWidget(self.wl_browse)
-        fg.addLayout(wl_row, 1, 1)
+        fg.addLayout(wl_row, 2, 1)
 
-        fg.addWidget(QLabel("Output Directory:"), 2, 0)
+        fg.addWidget(QLabel("Output Directory:"), 3, 0)
         out_row = QHBoxLayout()
         self.out_dir_edit = QLineEdit(str(CAPTURED_DIR.resolve()))
         self.out_dir_browse = QPushButton("Browse")
@@ -1760,7 +2894,7 @@ class CrackConvertTab(QWidget):
         self.out_dir_browse.clicked.connect(self._browse_output_dir)
         out_row.addWidget(self.out_dir_edit)
         out_row.addWidget(self.out_dir_browse)
-        fg.addLayout(out_row, 2, 1)
+        fg.addLayout(out_row, 3, 1)
 
         layout.addWidget(file_card)
 
@@ -1802,17 +2936,77 @@ class CrackConvertTab(QWidget):
 
         layout.addWidget(action_card)
 
+        # ── Conversion queue ────────────────────────────────────────────────
+        queue_card = QFrame(); queue_card.setObjectName("card")
+        ql = QVBoxLayout(queue_card)
+        ql.setContentsMargins(22, 16, 22, 16)
+        ql.setSpacing(10)
+
+        queue_hdr = QLabel(f"Batch Conversion  ·  {self.queue.max_workers} at a time")
+        queue_hdr.setStyleSheet(f"color:{PALETTE['subtext0']};font-size:11px;font-weight:600;")
+        ql.addWidget(queue_hdr)
+
+        q_row = QHBoxLayout()
+        q_row.setSpacing(10)
+        self.fmt_combo = QComboBox()
+        for fmt, label in CONVERSION_FORMATS.items():
+            self.fmt_combo.addItem(f"{label} ({fmt})", fmt)
+        self.add_files_btn = QPushButton("Add Files…")
+        self.add_files_btn.clicked.connect(self._queue_files)
+        self.add_dir_btn = QPushButton("Add Directory…")
+        self.add_dir_btn.clicked.connect(self._queue_directory)
+        self.cancel_sel_btn = QPushButton("Cancel Selected")
+        self.cancel_sel_btn.clicked.connect(self._cancel_selected)
+        self.cancel_all_btn = QPushButton("Cancel All")
+        self.cancel_all_btn.setObjectName("danger")
+        self.cancel_all_btn.clicked.connect(self.queue.cancel_all)
+        self.clear_jobs_btn = QPushButton("Clear Finished")
+        self.clear_jobs_btn.clicked.connect(self._clear_finished)
+        self.merge_chk = QCheckBox(f"Merge into {HashMerge.NAME}")
+        self.merge_chk.setChecked(True)
+        self.merge_chk.setToolTip("When the queue drains, fold every .hc22000 in the output directory "
+                                  "into one deduplicated file")
+        self.merge_btn = QPushButton("Merge Now")
+        self.merge_btn.clicked.connect(self._merge_now)
+        for w in [self.fmt_combo, self.add_files_btn, self.add_dir_btn,
+                  self.cancel_sel_btn, self.cancel_all_btn, self.clear_jobs_btn,
+                  self.merge_chk, self.merge_btn]:
+            q_row.addWidget(w)
+        q_row.addStretch()
+        ql.addLayout(q_row)
+
+        self.queue_bar = QProgressBar()
+        self.queue_bar.setRange(0, 1)
+        self.queue_bar.setValue(0)
+        self.queue_bar.setFormat("No conversions queued")
+        ql.addWidget(self.queue_bar)
+
+        self.jobs_view = QTreeView()
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.setRootIsDecorated(False)
+        self.jobs_view.setUniformRowHeights(True)
+        self.jobs_view.setAlternatingRowColors(True)
+        self.jobs_view.setSelectionMode(QTreeView.SelectionMode.ExtendedSelection)
+        self.jobs_view.header().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        self.jobs_view.setColumnWidth(0, 220); self.jobs_view.setColumnWidth(1, 120)
+        self.jobs_view.setColumnWidth(2, 80); self.jobs_view.setColumnWidth(3, 60)
+        self.jobs_view.setMinimumHeight(120)
+        ql.addWidget(self.jobs_view)
+
+        layout.addWidget(queue_card)
+
         # ── Console ─────────────────────────────────────────────────────────
-        self.console = ConsoleOutput()
+        self.console = ConsoleOutput(source="crack")
         layout.addWidget(self.console)
 
     # ── File browsing ───────────────────────────────────────────────────────
     def _browse_cap(self):
         path, _ = QFileDialog.getOpenFileName(
             self, "Select .cap / .pcap File", str(Path.home()),
-            "Capture Files (*.cap *.pcap);;All Files (*)")
+            "Capture Files (*.cap *.pcap *.pcapng);;All Files (*)")
         if path:
             self.cap_edit.setText(path)
+            self._index_cap()
 
     def _browse_wordlist(self):
         path, _ = QFileDialog.getOpenFileName(
@@ -1826,6 +3020,62 @@ class CrackConvertTab(QWidget):
         if d:
             self.out_dir_edit.setText(d)
 
+    def open_capture(self, path):
+        self.cap_edit.setText(path)
+        self._index_cap()
+
+    def session_state(self):
+        return {"cap": self.cap_edit.text(), "wordlist": self.wl_edit.text(),
+                "out_dir": self.out_dir_edit.text(), "format": self.fmt_combo.currentData(),
+                "merge": self.merge_chk.isChecked()}
+
+    def restore_state(self, state):
+        self.wl_edit.setText(state.get("wordlist", self.wl_edit.text()))
+        self.out_dir_edit.setText(state.get("out_dir", self.out_dir_edit.text()))
+        i = self.fmt_combo.findData(state.get("format"))
+        if i >= 0:
+            self.fmt_combo.setCurrentIndex(i)
+        self.merge_chk.setChecked(state.get("merge", True))
+        if state.get("cap"):
+            self.open_capture(state["cap"])
+
+    # ── Capture index ───────────────────────────────────────────────────────
+    def _index_cap(self):
+        cap = self.cap_edit.text().strip()
+        if not cap or cap == self._indexing or (self._index and self._index.path == cap):
+            return
+        self._index = None
+        if not os.path.isfile(cap):
+            self.cap_info.setText("")
+            return
+        self._indexing = cap
+        self.cap_info.setText("Indexing capture…")
+        threading.Thread(target=self._build_index, args=(cap,), daemon=True).start()
+
+    def _build_index(self, cap):
+        try:
+            self._index_ready.emit(cap, CaptureIndex.load(cap))
+        except Exception as e:
+            self._index_ready.emit(cap, f"Could not index {cap}: {e}")
+
+    def _on_index_ready(self, cap, index):
+        if cap == self._indexing:
+            self._indexing = None
+        if cap != self.cap_edit.text().strip():
+            return
+        if isinstance(index, str):
+            self.cap_info.setText(index)
+            return
+        self._index = index
+        lines = index.summary()
+        crackable = index.crackable_networks
+        if index.supported:
+            lines.append(f"{len(crackable)} network(s) with a crackable handshake or PMKID"
+                         if crackable else "No crackable handshake or PMKID in this capture")
+        self.cap_info.setText("\n".join(lines))
+        for line in lines:
+            self.console.append_info(line)
+
     # ── Validation helper ───────────────────────────────────────────────────
     def _validate_cap(self):
         cap = self.cap_edit.text().strip()
@@ -1835,6 +3085,19 @@ class CrackConvertTab(QWidget):
         if not os.path.exists(cap):
             self.console.append_error(f"File not found: {cap}")
             return None
+        index = self._index
+        if index and index.path == cap:
+            try:
+                st = os.stat(cap)
+                fresh = (st.st_size, st.st_mtime_ns) == (index.size, index.mtime_ns)
+            except OSError:
+                fresh = False
+            if not fresh:
+                self._index = None
+                self._index_cap()
+            elif index.supported and not index.crackable_networks:
+                self.console.append_error(f"{os.path.basename(cap)} holds no crackable handshake or PMKID.")
+                return None
         return cap
 
     def _get_out_dir(self):
@@ -1859,25 +3122,44 @@ class CrackConvertTab(QWidget):
             self.console.append_error(f"Wordlist not found: {wl}")
             return
 
-        self.crack_worker = WorkerThread(["sudo", "aircrack-ng", cap, "-w", wl])
+        self.crack_worker = ChildProcess(engine.crack_command(cap, wl),
+                                         sudo_kill=True, parser=AircrackParser())
         self.crack_worker.output.connect(self._handle_crack_output)
+        self.crack_worker.events.connect(self._on_crack_events)
         self.crack_worker.finished.connect(self._on_crack_done)
         self.crack_worker.error.connect(self.console.append_error)
         self.crack_worker.start()
 
+        self._crack_verdict = None
+        self._key_reported = False
         self._set_crack_btn(cracking=True)
         self.status_bar.set_status("Cracking…", PALETTE["yellow"])
         self.console.append_info(f"aircrack-ng started: {cap}")
 
-    def _handle_crack_output(self, text, _):
-        if "KEY FOUND" in text.upper():
-            self.console.append_success(text)
-            self.status_bar.set_status("KEY FOUND!", PALETTE["green"])
-        elif any(k in text.lower() for k in ("failed", "not found")):
+    def _handle_crack_output(self, text, kind):
+        if kind == "error":
+            if text.strip() == self._crack_verdict:
+                self._crack_verdict = None
             self.console.append_warn(text)
         else:
             self.console.append_raw(text)
 
+    def _on_crack_events(self, events):
+        # Events arrive before the lines they came from; errors seen only on
+        # aircrack-ng's redrawn screen are kept and reported once it exits.
+        for ev in events:
+            if isinstance(ev, KeyFound):
+                if not self._key_reported:
+                    self._key_reported = True
+                    self.console.append_success(f"KEY FOUND! [ {ev.key} ]")
+                    self.status_bar.set_status("KEY FOUND!", PALETTE["green"])
+            elif isinstance(ev, Progress) and not self._key_reported:
+                total = f"/{ev.total}" if ev.total >= 0 else ""
+                rate = f" ({ev.rate:.0f} k/s)" if ev.rate else ""
+                self.status_bar.set_status(f"Cracking… {ev.tested}{total} keys{rate}", PALETTE["yellow"])
+            elif isinstance(ev, ToolError):
+                self._crack_verdict = ev.message
+
     def _stop_crack(self):
         if self.crack_worker:
             self.crack_worker.stop()
@@ -1888,6 +3170,9 @@ class CrackConvertTab(QWidget):
     def _on_crack_done(self, rc):
         self._set_crack_btn(cracking=False)
         self.status_bar.set_status("Ready")
+        if self._crack_verdict and not self._key_reported:
+            self.console.append_warn(self._crack_verdict)
+        self._crack_verdict = None
         msg = "Aircrack-ng finished." if rc == 0 else f"Aircrack-ng exited with code {rc}"
         (self.console.append_success if rc == 0 else self.console.append_warn)(msg)
 
@@ -1903,65 +3188,365 @@ class CrackConvertTab(QWidget):
         self.hc_btn.setEnabled(not cracking)
         self.jtr_btn.setEnabled(not cracking)
 
-    # ── Conversion helpers ───────────────────────────────────────────────────
-    def _run_conversion(self, cmd, expected_output, label):
-        """Runs a conversion command and reports result."""
-        w = WorkerThread(cmd)
-        w.output.connect(lambda t, _: self.console.append_raw(t))
-        w.finished.connect(lambda rc: (
-            self.console.append_success(f"{label} saved → {expected_output}")
-            if rc == 0 else
-            self.console.append_error(f"{label} conversion failed (code {rc})")
-        ))
-        w.error.connect(self.console.append_error)
-        w.start()
-
+    # ── Conversion ───────────────────────────────────────────────────────────
     def _to_hashcat(self):
+        self._convert(".hc22000")
+
+    def _to_john(self):
+        self._convert(".hccap")
+
+    def _convert(self, fmt):
         cap = self._validate_cap()
         if not cap:
             return
-        out_dir = self._get_out_dir()
-        stem = Path(cap).stem
-        out = os.path.join(out_dir, stem + ".hc22000")
+        if fmt == ".hc22000" and not shutil.which("hcxpcapngtool"):
+            self.console.append_warn("hcxpcapngtool not found; using aircrack-ng fallback (limited compatibility).")
+        job = self.queue.submit(cap, fmt, self._get_out_dir())
+        if job.state == "skipped":
+            self.console.append_info(f"{job.out} is newer than the capture; conversion skipped.")
+        else:
+            self.console.append_info(f"Converting to {CONVERSION_FORMATS[fmt]} format → {job.out}")
+
+    def convert_many(self, caps, fmt=None):
+        """Queues every capture in `caps`; duplicates of queued jobs are dropped."""
+        fmt = fmt or self.fmt_combo.currentData()
+        before = len(self.queue.jobs)
+        jobs = self.queue.submit_many(caps, fmt, self._get_out_dir())
+        added = len(self.queue.jobs) - before
+        skipped = sum(1 for job in self.queue.jobs[before:] if job.state == "skipped")
+        self.console.append_info(
+            f"Queued {added - skipped} {CONVERSION_FORMATS[fmt]} conversion(s)"
+            f"{f', {skipped} already up to date' if skipped else ''}"
+            f"{f', {len(jobs) - added} already queued' if len(jobs) > added else ''}.")
+
+    def _queue_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Captures", str(CAPTURED_DIR.resolve()),
+            "Capture Files (*.cap *.pcap *.pcapng);;All Files (*)")
+        if paths:
+            self.convert_many(paths)
+
+    def _queue_directory(self):
+        d = QFileDialog.getExistingDirectory(self, "Select Capture Directory", str(CAPTURED_DIR.resolve()))
+        if not d:
+            return
+        caps = sorted(str(p) for p in Path(d).iterdir()
+                      if p.suffix.lower() in CAPTURE_EXTENSIONS and p.is_file())
+        if not caps:
+            self.console.append_warn(f"No captures in {d}.")
+            return
+        self.convert_many(caps)
+
+    def _cancel_selected(self):
+        for index in self.jobs_view.selectionModel().selectedRows():
+            self.queue.cancel(self.jobs_model.data(index, Qt.ItemDataRole.UserRole))
 
-        if shutil.which("hcxpcapngtool"):
-            cmd = ["sudo", "hcxpcapngtool", "-o", out, cap]
+    def _clear_finished(self):
+        self.queue.clear_finished()
+        self.jobs_model.sync()
+
+    def _on_job_changed(self, job):
+        if not job.finished or job.state == "skipped":
+            return
+        label = f"{CONVERSION_FORMATS[job.fmt]} file"
+        if job.state == "done":
+            took = f" ({job.cpu:.2f}s CPU)" if job.cpu is not None else ""
+            self.console.append_success(f"{label} saved → {job.out}{took}")
+            if job.fmt == ".hc22000":
+                self._merge_dirs.add(os.path.dirname(job.out))
+        elif job.state == "empty":
+            self.console.append_warn(f"{os.path.basename(job.cap)}: {job.detail}")
+        elif job.state == "failed":
+            self.console.append_error(f"{label} conversion failed for {os.path.basename(job.cap)} ({job.detail})")
+
+    def _on_queue_progress(self, done, total):
+        active = self.queue.running + self.queue.pending
+        if active:
+            self._tick.start()
         else:
-            self.console.append_warn("hcxpcapngtool not found; using aircrack-ng fallback (limited compatibility).")
-            cmd = ["sudo", "aircrack-ng", cap, "-J", os.path.join(out_dir, stem)]
+            self._tick.stop()
+        self.queue_bar.setRange(0, max(total, 1))
+        self.queue_bar.setValue(done)
+        self.queue_bar.setFormat(f"{done}/{total} converted · {self.queue.running} running"
+                                 if active else f"{done}/{total} finished" if total else "No conversions queued")
+        if not active and self.merge_chk.isChecked():
+            self._start_merge()
+
+    # ── Hashcat merge ───────────────────────────────────────────────────────
+    def _merge_now(self):
+        self._merge_dirs.add(os.path.abspath(self.out_dir_edit.text().strip() or "."))
+        self._start_merge()
+
+    def _start_merge(self):
+        """Merges one pending output directory in the background, one at a time."""
+        if self._merging or not self._merge_dirs:
+            return
+        self._merging = self._merge_dirs.pop()
+        self.merge_btn.setEnabled(False)
+        threading.Thread(target=self._run_merge, args=(self._merging,), daemon=True).start()
 
-        self.console.append_info(f"Converting to Hashcat format → {out}")
-        self._run_conversion(cmd, out, "Hashcat file")
+    def _run_merge(self, directory):
+        try:
+            merge = HashMerge(directory)
+            try:
+                added, dupes, _ = merge.merge()
+                self._merged.emit(directory, (added, dupes, merge.count(), len(merge.networks())))
+            finally:
+                merge.close()
+        except Exception as e:
+            self._merged.emit(directory, f"Could not merge Hashcat files in {directory}: {e}")
 
-    def _to_john(self):
-        cap = self._validate_cap()
-        if not cap:
+    def _on_merged(self, directory, result):
+        self._merging = None
+        self.merge_btn.setEnabled(True)
+        if isinstance(result, str):
+            self.console.append_error(result)
+        else:
+            added, dupes, total, networks = result
+            self.console.append_success(
+                f"{HashMerge.NAME}: +{added} new hash(es), {dupes} duplicate(s) skipped · "
+                f"{total} across {networks} network(s) → {os.path.join(directory, HashMerge.NAME)}")
+        self._start_merge()
+
+
+# ---------------------------------------------------------------------------
+# Capture library tab
+# ---------------------------------------------------------------------------
+class LibraryTab(QWidget):
+    capture_selected = pyqtSignal(str)
+    convert_requested = pyqtSignal(list)
+
+    def __init__(self, status_bar, parent=None):
+        super().__init__(parent)
+        self.status_bar = status_bar
+        self.model = LibraryModel(self)
+        self.proxy = ScanProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self._build_ui()
+        self.job = LibraryJob()
+        self.job.changed.connect(self._on_changed)
+        self.job.error.connect(self.status_lbl.setText)
+        self.job.start()
+
+    def _build_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(14)
+
+        hdr = QHBoxLayout()
+        title = QLabel("Capture Library")
+        title.setObjectName("section")
+        title.setFont(QFont("JetBrains Mono", 15, QFont.Weight.Bold))
+        hdr.addWidget(title)
+        hdr.addStretch()
+        self.count_badge = QLabel("0 Captures")
+        self.count_badge.setObjectName("badge_blue")
+        self.crackable_badge = QLabel("0 Crackable")
+        self.crackable_badge.setObjectName("badge_green")
+        hdr.addWidget(self.count_badge)
+        hdr.addWidget(self.crackable_badge)
+        layout.addLayout(hdr)
+
+        sep = QFrame(); sep.setObjectName("separator")
+        layout.addWidget(sep)
+
+        ctrl = QHBoxLayout()
+        ctrl.setSpacing(10)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter file / SSID / BSSID…")
+        self.filter_edit.setFixedWidth(260)
+        self.filter_edit.textChanged.connect(self.proxy.set_filter_text)
+        self.open_btn = QPushButton("Open in Crack & Convert")
+        self.open_btn.setObjectName("primary")
+        self.open_btn.setMinimumHeight(38)
+        self.open_btn.clicked.connect(self._open_selected)
+        self.convert_btn = QPushButton("Queue Conversion")
+        self.convert_btn.setObjectName("warning")
+        self.convert_btn.setMinimumHeight(38)
+        self.convert_btn.setToolTip("Convert the selected captures in the Crack & Convert queue")
+        self.convert_btn.clicked.connect(self._convert_selected)
+        path_lbl = QLabel(str(CAPTURED_DIR.resolve()))
+        path_lbl.setStyleSheet(f"color:{PALETTE['subtext0']};font-size:11px;")
+        for w in [self.filter_edit, self.open_btn, self.convert_btn, path_lbl]:
+            ctrl.addWidget(w)
+        ctrl.addStretch()
+        layout.addLayout(ctrl)
+
+        self.tree = QTreeView()
+        self.tree.setModel(self.proxy)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setSelectionMode(QTreeView.SelectionMode.ExtendedSelection)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(6, Qt.SortOrder.DescendingOrder)
+        self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.tree.setColumnWidth(0, 220); self.tree.setColumnWidth(1, 80)
+        self.tree.setColumnWidth(3, 130); self.tree.setColumnWidth(4, 70)
+        self.tree.setColumnWidth(5, 70)
+        self.tree.doubleClicked.connect(lambda _index: self._open_selected())
+        layout.addWidget(self.tree)
+
+        self.status_lbl = QLabel("Loading capture library…")
+        self.status_lbl.setStyleSheet(f"color:{PALETTE['subtext0']};font-size:11px;")
+        layout.addWidget(self.status_lbl)
+
+    def _on_changed(self, changed, removed):
+        self.model.apply(changed, removed)
+        self.count_badge.setText(f"{self.model.entry_count()} Captures")
+        self.crackable_badge.setText(f"{self.model.crackable_count()} Crackable")
+        self.status_lbl.setText(f"Watching {CAPTURED_DIR.resolve()} — double-click a capture to crack or convert it.")
+
+    def _open_selected(self):
+        index = self.tree.currentIndex()
+        if not index.isValid():
+            self.status_lbl.setText("Select a capture first.")
             return
-        out_dir = self._get_out_dir()
-        stem = Path(cap).stem
-        out_base = os.path.join(out_dir, stem)
-        out = out_base + ".hccap"
+        entry = self.proxy.data(index, Qt.ItemDataRole.UserRole)
+        self.capture_selected.emit(entry.path)
 
-        cmd = ["sudo", "aircrack-ng", cap, "-J", out_base]
-        self.console.append_info(f"Converting to John the Ripper format → {out}")
-        self._run_conversion(cmd, out, "John the Ripper file")
+    def _convert_selected(self):
+        rows = self.tree.selectionModel().selectedRows()
+        if not rows:
+            self.status_lbl.setText("Select one or more captures first.")
+            return
+        self.convert_requested.emit([self.proxy.data(i, Qt.ItemDataRole.UserRole).path for i in rows])
+
+    def shutdown(self):
+        self.job.stop()
+
+
+# ---------------------------------------------------------------------------
+# Session snapshot
+# ---------------------------------------------------------------------------
+class SessionStore:
+    """What the window held when it was last closed: scan results and tab fields.
+
+    Written like ConsoleLog, through a DbWriter: changes are queued from the
+    GUI thread and folded into one transaction per batch; a failed batch is
+    reported on `error`.
+    Scan results arrive as the deltas ScanTab applies (networks keyed by MAC
+    with their display id, clients by MAC), so a survey is never rewritten
+    whole; tab fields are one JSON value per key and only changed keys are
+    queued. load() runs on the calling thread's own connection.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS networks (
+        mac INTEGER PRIMARY KEY, id INTEGER, ssid TEXT, power INTEGER, channel INTEGER, privacy TEXT);
+    CREATE TABLE IF NOT EXISTS clients (mac INTEGER PRIMARY KEY, ap INTEGER, power INTEGER);
+    CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        db = open_db(self.path)
+        db.executescript(self._SCHEMA)
+        db.close()
+        self._saved = {}
+        self._writer = DbWriter(self.path, self._write, "Session snapshot")
+        self.error = self._writer.error
+
+    def load(self):
+        """(state dict, [(display id, Network), ...] in id order, [Client, ...])."""
+        import json
+        db = open_db(self.path)
+        try:
+            state = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM state")}
+            networks = [(num, Network(mac, ssid, power, channel, privacy))
+                        for mac, num, ssid, power, channel, privacy in db.execute(
+                            "SELECT mac, id, ssid, power, channel, privacy FROM networks ORDER BY id")]
+            clients = [Client(mac, ap, power)
+                       for mac, ap, power in db.execute("SELECT mac, ap, power FROM clients")]
+        finally:
+            db.close()
+        self._saved = dict(state)
+        return state, networks, clients
+
+    def write_scan(self, batch, display_id):
+        """Queues one applied ScanJob batch; `display_id(mac)` gives a network's row number."""
+        networks = []
+        for net in batch["networks"]:
+            num = display_id(net.mac)
+            if num is not None:
+                networks.append((net.mac, num, net.ssid, net.power, net.channel, net.privacy))
+        clients = [(c.mac, c.ap, c.power) for c in batch["clients"]]
+        self._writer.put(("scan", networks, clients, batch["lost_networks"], batch["lost_clients"]))
+
+    def clear_scan(self):
+        self._writer.put(("clear",))
+
+    def write_state(self, state):
+        """Queues the keys of `state` whose values differ from what was last written."""
+        import json
+        changed = {key: value for key, value in state.items() if self._saved.get(key) != value}
+        if changed:
+            self._saved.update(changed)
+            self._writer.put(("state", {key: json.dumps(value) for key, value in changed.items()}))
+
+    def close(self):
+        self._writer.close()
+
+    def _write(self, db, items):
+        for item in items:
+            if item[0] == "scan":
+                _, networks, clients, lost_nets, lost_clients = item
+                db.executemany("INSERT OR REPLACE INTO networks VALUES (?, ?, ?, ?, ?, ?)", networks)
+                db.executemany("INSERT OR REPLACE INTO clients VALUES (?, ?, ?)", clients)
+                db.executemany("DELETE FROM networks WHERE mac = ?", [(m,) for m in lost_nets])
+                db.executemany("DELETE FROM clients WHERE mac = ?", [(m,) for m in lost_clients])
+            elif item[0] == "clear":
+                db.execute("DELETE FROM networks")
+                db.execute("DELETE FROM clients")
+            else:
+                db.executemany("INSERT OR REPLACE INTO state VALUES (?, ?)", item[1].items())
 
 
 # ---------------------------------------------------------------------------
 # Main window
 # ---------------------------------------------------------------------------
 class MainWindow(QMainWindow):
+    """The banner, status bar and tabs.
+
+    Only the first tab is built with the window; the others start as empty
+    pages and are built on first activation, or when something needs them
+    (the card tab switching interfaces, a restored session, a capture sent
+    to Crack & Convert). What arrives for a tab before it exists is held
+    and handed over when it is built.
+    """
+
+    _session_loaded = pyqtSignal(object)    # (SessionStore, state, networks, clients) or error text
+
+    _TABS = (
+        ("card",      WifiCardTab,     "⚡ Card Control"),
+        ("scan",      ScanTab,         "📡 Scanner"),
+        ("handshake", HandshakeTab,    "🤝 Handshake"),
+        ("deauth",    DeauthTab,       "💥 Deauth"),
+        ("crack",     CrackConvertTab, "🔓 Crack & Convert"),
+        ("library",   LibraryTab,      "📁 Library"),
+    )
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("NetShade — Wi-Fi Security Testing Framework")
         self.setMinimumSize(1100, 780)
         self.resize(1280, 860)
+        self.session = None
+        self._target = None
+        self._mon_iface = None
+        self._built = {}
+        self._pending_state = {}        # session state of tabs not built yet
+        self._pending_results = None    # (networks, clients) restored before the scan tab was built
         self._build_ui()
-        self._set_pointer_cursors()
+        self._set_pointer_cursors(self)
+        self._session_loaded.connect(self._on_session_loaded)
+        self._session_timer = QTimer(self)
+        self._session_timer.setInterval(3000)
+        self._session_timer.timeout.connect(self._save_session_state)
 
-    def _set_pointer_cursors(self):
+    def _set_pointer_cursors(self, root):
         for cls in (QPushButton, QComboBox):
-            for widget in self.findChildren(cls):
+            for widget in root.findChildren(cls):
                 widget.setCursor(Qt.CursorShape.PointingHandCursor)
 
     def _build_ui(self):
@@ -1973,6 +3558,7 @@ class MainWindow(QMainWindow):
 
         self.banner = AnimatedBanner()
         root.addWidget(self.banner)
+        TIMELINE.mark("banner")
 
         content = QWidget()
         cl = QVBoxLayout(content)
@@ -1984,37 +3570,166 @@ class MainWindow(QMainWindow):
 
         self.tabs = QTabWidget()
         self.tabs.setDocumentMode(True)
-
-        self.card_tab   = WifiCardTab(self.status_bar_widget)
-        self.scan_tab   = ScanTab(self.status_bar_widget)
-        self.hs_tab     = HandshakeTab(self.status_bar_widget)
-        self.attack_tab = DeauthTab(self.status_bar_widget)
-        self.crack_tab  = CrackConvertTab(self.status_bar_widget)
-
-        self.tabs.addTab(self.card_tab,   "⚡ Card Control")
-        self.tabs.addTab(self.scan_tab,   "📡 Scanner")
-        self.tabs.addTab(self.hs_tab,     "🤝 Handshake")
-        self.tabs.addTab(self.attack_tab, "💥 Deauth")
-        self.tabs.addTab(self.crack_tab,  "🔓 Crack & Convert")
-
-        self.card_tab.mode_changed.connect(self._on_mode_changed)
-        self.scan_tab.target_selected.connect(self._on_target_selected)
+        self._pages = {}
+        for key, _cls, label in self._TABS:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self._pages[key] = page
+            self.tabs.addTab(page, label)
+        TIMELINE.mark("tab pages")
+        self.tab(self._TABS[0][0])
+        self.tabs.currentChanged.connect(lambda i: self.tab(self._TABS[i][0]))
 
         cl.addWidget(self.tabs)
         root.addWidget(content)
 
+    # ── Tabs ────────────────────────────────────────────────────────────────
+    def tab(self, key):
+        """The tab for `key`, built on first use."""
+        tab = self._built.get(key)
+        if tab is None:
+            with TIMELINE.measure(f"tab {key} built"):
+                cls = next(cls for k, cls, _label in self._TABS if k == key)
+                tab = self._built[key] = cls(self.status_bar_widget)
+                self._pages[key].layout().addWidget(tab)
+                self._set_pointer_cursors(tab)
+                self._attach(key, tab)
+        return tab
+
+    def _attach(self, key, tab):
+        """Wires a freshly built tab and hands it what arrived before it existed."""
+        if key == "card":
+            tab.mode_changed.connect(self._on_mode_changed)
+        elif key == "scan":
+            tab.target_selected.connect(self._on_target_selected)
+            tab.session = self.session
+            if self._pending_results:
+                tab.restore_results(*self._pending_results)
+                self._pending_results = None
+        elif key == "library":
+            tab.capture_selected.connect(self._on_capture_selected)
+            tab.convert_requested.connect(self._on_convert_requested)
+        if self._mon_iface and key in ("scan", "handshake", "deauth"):
+            self._set_mon_iface(key, tab, self._mon_iface)
+        if self._target and key in ("handshake", "deauth"):
+            self._set_target(key, tab, *self._target)
+        if key in self._pending_state:
+            tab.restore_state(self._pending_state.pop(key))
+
+    card_tab = property(lambda self: self.tab("card"))
+    scan_tab = property(lambda self: self.tab("scan"))
+    hs_tab = property(lambda self: self.tab("handshake"))
+    attack_tab = property(lambda self: self.tab("deauth"))
+    crack_tab = property(lambda self: self.tab("crack"))
+    library_tab = property(lambda self: self.tab("library"))
+
+    def _show_tab(self, key):
+        self.tabs.setCurrentWidget(self._pages[key])
+        return self.tab(key)
+
+    def _networks(self):
+        if "scan" in self._built:
+            return self._built["scan"].get_networks()
+        return self._pending_results[0] if self._pending_results else []
+
+    def _set_mon_iface(self, key, tab, mon_iface):
+        if key == "scan":
+            tab.set_monitor_iface(mon_iface)
+            tab.mon_iface_edit.setText(mon_iface)
+        else:
+            tab.iface_edit.setText(mon_iface)
+
+    def _set_target(self, key, tab, bssid, ssid, channel):
+        if key == "handshake":
+            tab.update_networks(self._networks())
+        tab.set_target(bssid, ssid, channel)
+
     def _on_mode_changed(self, iface, mon_iface):
-        self.scan_tab.set_monitor_iface(mon_iface)
-        self.scan_tab.mon_iface_edit.setText(mon_iface)
-        self.hs_tab.iface_edit.setText(mon_iface)
-        self.attack_tab.iface_edit.setText(mon_iface)
+        self._mon_iface = mon_iface
+        for key in ("scan", "handshake", "deauth"):
+            if key in self._built:
+                self._set_mon_iface(key, self._built[key], mon_iface)
 
     def _on_target_selected(self, bssid, ssid, channel):
-        self.hs_tab.update_networks(self.scan_tab.get_networks())
-        self.hs_tab.set_target(bssid, ssid, channel)
-        self.attack_tab.set_target(bssid, ssid, channel)
+        self._target = [bssid, ssid, channel]
+        for key in ("handshake", "deauth"):
+            if key in self._built:
+                self._set_target(key, self._built[key], bssid, ssid, channel)
         self.status_bar_widget.set_target(ssid, bssid)
 
+    def _on_capture_selected(self, path):
+        self._show_tab("crack").open_capture(path)
+
+    def _on_convert_requested(self, paths):
+        self._show_tab("crack").convert_many(paths)
+
+    # ── Session ─────────────────────────────────────────────────────────────
+    def open_session(self, path=SESSION_DB):
+        """Restores the last session in the background and starts recording this one."""
+        threading.Thread(target=self._load_session, args=(path,), daemon=True).start()
+
+    def _load_session(self, path):
+        try:
+            store = SessionStore(path)
+            self._session_loaded.emit((store, *store.load()))
+        except Exception as e:
+            self._session_loaded.emit(f"Session restore disabled: {e}")
+
+    def _on_session_loaded(self, result):
+        if isinstance(result, str):
+            self.tab(self._TABS[0][0]).console.append_warn(result)
+            return
+        store, state, networks, clients = result
+        self.session = store
+        store.error.connect(self.tab(self._TABS[0][0]).console.append_warn)
+        if "scan" in self._built:
+            self._built["scan"].restore_results(networks, clients)
+            self._built["scan"].session = store
+        elif networks:
+            self._pending_results = (networks, clients)
+        if state.get("target"):
+            self._on_target_selected(*state["target"])
+        for key, part in self._session_parts().items():
+            if key in state:
+                part.restore_state(state[key])
+        self._pending_state.update({key: state[key] for key, _cls, _label in self._TABS
+                                    if key in state and key not in self._built})
+        self.tabs.setCurrentIndex(state.get("tab", self.tabs.currentIndex()))
+        self._session_timer.start()
+
+    def _session_parts(self):
+        """Banner and built tabs that save and restore their own state."""
+        parts = {"banner": self.banner}
+        parts.update((key, tab) for key, tab in self._built.items() if key != "library")
+        return parts
+
+    def _save_session_state(self):
+        state = dict(self._pending_state)
+        state.update((key, part.session_state()) for key, part in self._session_parts().items())
+        state["target"] = self._target
+        state["tab"] = self.tabs.currentIndex()
+        self.session.write_state(state)
+
+    def close_session(self):
+        if self.session:
+            self._session_timer.stop()
+            self._save_session_state()
+            self.session.close()
+            self.session = None
+            if "scan" in self._built:
+                self._built["scan"].session = None
+
+    def shutdown(self):
+        """Stops background work on quit: the session recorder and the library scanner."""
+        self.close_session()
+        if "library" in self._built:
+            self._built["library"].shutdown()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if TIMELINE.first_paint():
+            QTimer.singleShot(0, TIMELINE.dump)
+
 
 # ---------------------------------------------------------------------------
 # Entry point
@@ -2028,11 +3743,12 @@ def main():
         os.makedirs(runtime_dir, exist_ok=True)
         os.environ['XDG_RUNTIME_DIR'] = runtime_dir
 
+    TIMELINE.mark("module body")
     app = QApplication(sys.argv)
     app.setApplicationName("NetShade")
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("Rupen Maharjan")
-    app.setStyleSheet(STYLESHEET)
+    app.setStyleSheet(stylesheet())
 
     pal = app.palette()
     color_map = {
@@ -2049,11 +3765,28 @@ def main():
     for role, color in color_map.items():
         pal.setColor(role, QColor(color))
     app.setPalette(pal)
+    TIMELINE.mark("QApplication and theme")
+
+    try:
+        ConsoleOutput.log = ConsoleLog(CONSOLE_DB)
+        app.aboutToQuit.connect(ConsoleOutput.log.close)
+        # Not into a console: its lines would go back to the log that just failed.
+        ConsoleOutput.log.error.connect(lambda message: print(f"[NetShade] {message}", file=sys.stderr))
+    except Exception as e:
+        print(f"[NetShade] Console history disabled: {e}")
+
+    TIMELINE.mark("console history")
 
     window = MainWindow()
+    app.aboutToQuit.connect(window.shutdown)
+    TIMELINE.mark("main window")
     window.show()
+    TIMELINE.mark("shown")
+    window.open_session()
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    if "--startup-timeline" in sys.argv:
+        TIMELINE.start()
     main()
\ No newline at end of file
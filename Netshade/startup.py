@@ -0,0 +1,136 @@
+"""Where NetShade's startup time goes; `netshade.py --startup-timeline` prints it.
+
+TIMELINE stays disabled, mark() and measure() costing a check each, until
+start() is called: netshade.py does that before importing the GUI when it
+is given the flag, and only then is the import hook installed.
+"""
+import sys
+import os
+import time
+import builtins
+import _thread
+
+
+def process_age():
+    """Seconds since this process was started, from /proc (0.0 where unavailable)."""
+    try:
+        with open("/proc/self/stat") as f:
+            start = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTimeline:
+    """Phases are stamped with mark() (time since the previous mark) or
+    measure() (a block's own duration) against process start. Imports made
+    on the main thread are timed like -X importtime: self and cumulative
+    time of every first import, nested by depth. dump() runs once the first
+    frame is painted; anything marked afterwards, such as a tab built on its
+    first activation, is printed as it happens.
+    """
+
+    IMPORT_MIN = 0.002      # s cumulative; quicker imports are left out of the dump
+
+    def __init__(self, enabled=False):
+        self.enabled = False
+        self.marks = []         # (label, at, took) in seconds
+        self.imports = []       # [depth, name, self, cumulative] in seconds
+        self.painted = False
+        self._t0 = time.perf_counter() - process_age()
+        self._last = self._t0
+        self._dumped = False
+        self._import = None
+        if enabled:
+            self.start()
+
+    def start(self):
+        """Turns the timeline on; first imports from here on are timed."""
+        if not self.enabled:
+            self.enabled = True
+            self.mark("interpreter ready")
+            self._trace_imports()
+
+    def mark(self, label):
+        if self.enabled:
+            now = time.perf_counter()
+            self._record(label, now, now - self._last)
+            self._last = now
+
+    def measure(self, label):
+        """Context manager timing one block as its own phase."""
+        return _Measure(self, label)
+
+    def _record(self, label, at, took):
+        self.marks.append((label, at - self._t0, took))
+        if self._dumped:
+            print(f"[startup] {(at - self._t0) * 1e3:8.1f} ms  {label} ({took * 1e3:.1f} ms)")
+
+    def _trace_imports(self):
+        real, main, stack, imports = builtins.__import__, _thread.get_ident(), [], self.imports
+
+        def traced(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or _thread.get_ident() != main:
+                return real(name, globals, locals, fromlist, level)
+            entry = [len(stack), name, 0.0, 0.0]
+            imports.append(entry)
+            stack.append(0.0)
+            t = time.perf_counter()
+            try:
+                return real(name, globals, locals, fromlist, level)
+            finally:
+                took = time.perf_counter() - t
+                entry[2], entry[3] = took - stack.pop(), took
+                if stack:
+                    stack[-1] += took
+
+        self._import, builtins.__import__ = real, traced
+
+    def first_paint(self):
+        """Called from the main window's first paintEvent. True when a dump is
+        due: the caller runs dump() once the frame is out."""
+        if self.painted:
+            return False
+        self.painted = True
+        if self.enabled:
+            self.mark("first paint")
+        return self.enabled
+
+    def dump(self, out=None):
+        out = out or sys.stdout
+        if self._import is not None:
+            builtins.__import__, self._import = self._import, None
+        self.mark("first frame")
+        print("[startup] phase                                 at ms    took ms", file=out)
+        for label, at, took in self.marks:
+            print(f"[startup]   {label:<36} {at * 1e3:8.1f} {took * 1e3:10.1f}", file=out)
+        shown = [e for e in self.imports if e[3] >= self.IMPORT_MIN]
+        total = sum(e[3] for e in self.imports if e[0] == 0)
+        print(f"[startup] imports: {len(self.imports)} modules, {total * 1e3:.1f} ms; "
+              f"self / cumulative ms for those over {self.IMPORT_MIN * 1e3:.0f} ms:", file=out)
+        for depth, name, own, cumulative in shown:
+            print(f"[startup]   {own * 1e3:8.1f} {cumulative * 1e3:8.1f}  {'  ' * depth}{name}", file=out)
+        out.flush()
+        self._dumped = True
+
+
+class _Measure:
+    __slots__ = ("timeline", "label", "start")
+
+    def __init__(self, timeline, label):
+        self.timeline, self.label = timeline, label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        timeline = self.timeline
+        if timeline.enabled:
+            now = time.perf_counter()
+            timeline._record(self.label, now, now - self.start)
+            timeline._last = now
+
+
+TIMELINE = StartupTimeline()
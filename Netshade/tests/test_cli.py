@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import time
+
+import pytest
+
+import cli
+import engine
+
+
+AIRODUMP = r"""#!/bin/sh
+# Writes one airodump-ng CSV under --write PREFIX, then runs until killed.
+while [ "$#" -gt 0 ] && [ "$1" != "--write" ]; do shift; done
+printf '\r\nBSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key\r\n' > "$2-01.csv.tmp"
+printf 'AA:BB:CC:DD:EE:01, 2024-01-01 10:00:00, 2024-01-01 10:00:05,  6,  54, WPA2, CCMP, PSK, -40,      100,        0,   0.  0.  0.  0,   4, test, \r\n' >> "$2-01.csv.tmp"
+printf '\r\nStation MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs\r\n\r\n' >> "$2-01.csv.tmp"
+mv "$2-01.csv.tmp" "$2-01.csv"
+exec sleep 30
+"""
+
+
+@pytest.fixture
+def loop():
+    previous = engine.event_loop()
+    loop = engine.EventLoop()
+    engine.set_event_loop(loop)
+    yield loop
+    engine.set_event_loop(previous)
+
+
+@pytest.fixture
+def runner(loop):
+    return cli.Runner(loop, out=io.StringIO(), daemon=True)
+
+
+@pytest.fixture
+def tools(tmp_path, monkeypatch):
+    """sudo and airodump-ng stand-ins first on PATH; scan directories under tmp_path."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, body in (("sudo", '#!/bin/sh\nexec "$@"\n'), ("airodump-ng", AIRODUMP)):
+        path = bin_dir / name
+        path.write_text(body)
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    scans = tmp_path / "tmp"
+    scans.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scans))
+    return scans
+
+
+def events(runner):
+    return [json.loads(line) for line in runner.out.getvalue().splitlines()]
+
+
+def run_until(loop, done, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not done():
+        assert time.monotonic() < deadline, "timed out"
+        loop.call_later(0.05, loop.stop)
+        loop.run()
+
+
+def test_job_is_abstract(runner):
+    with pytest.raises(TypeError):
+        cli.Job(runner, "job", {})
+    for cls in cli.COMMANDS.values():
+        cls(runner, "job", {})
+
+
+@pytest.mark.parametrize("request_, message", [
+    ([], "request must be a JSON object"),
+    ({"cmd": "reboot"}, "unknown command 'reboot'"),
+    ({"cmd": "scan"}, "scan: missing iface"),
+    ({"cmd": "stop", "id": "nope"}, "no running job 'nope'"),
+])
+def test_rejected_requests_start_nothing(runner, request_, message):
+    runner.request(request_)
+    assert [e["event"] for e in events(runner)] == ["error"]
+    assert events(runner)[0]["message"] == message
+    assert not runner.jobs
+
+
+@pytest.mark.parametrize("request_, message", [
+    ({"cmd": "scan", "iface": 3}, "iface must be a string, not 3"),
+    ({"cmd": "capture", "iface": "wlan0", "bssid": "AA:BB:CC:DD:EE:01", "channel": "6",
+      "name": "x"}, "channel must be a positive integer, not '6'"),
+    ({"cmd": "deauth", "iface": "wlan0", "bssid": "AA:BB:CC:DD:EE:01", "channel": 6,
+      "bursts": True}, "bursts must be a positive integer, not True"),
+    ({"cmd": "convert", "captures": "a.cap"}, "captures must be a list of strings, not 'a.cap'"),
+    ({"cmd": "library", "watch": "yes"}, "watch must be a boolean, not 'yes'"),
+])
+def test_bad_fields_end_the_job(runner, request_, message):
+    runner.request(dict(request_, id="job"))
+    assert [(e["event"], e["id"]) for e in events(runner)] == [
+        ("started", "job"), ("error", "job"), ("done", "job")]
+    assert events(runner)[1]["message"] == message
+    assert events(runner)[2]["rc"] == 2
+    assert not runner.jobs
+
+
+def test_failing_start_ends_the_job(runner, monkeypatch):
+    def broken(self):
+        raise KeyError("boom")
+    monkeypatch.setattr(cli.Library, "start", broken)
+    runner.request({"cmd": "library", "id": "job"})
+    assert [e["event"] for e in events(runner)] == ["started", "error", "done"]
+    assert events(runner)[1]["message"] == "KeyError: 'boom'"
+    assert not runner.jobs
+
+
+def test_scans_use_their_own_directory(loop, runner, tools):
+    for job_id in ("a", "b"):
+        runner.request({"cmd": "scan", "id": job_id, "iface": "wlan0", "history": False})
+    directories = {os.path.dirname(job.scan.csv_path) for job in runner.jobs.values()}
+    assert len(directories) == 2
+    assert {os.path.dirname(d) for d in directories} == {str(tools)}
+
+    def seen():
+        return {e["id"] for e in events(runner) if e["event"] == "network"}
+    run_until(loop, lambda: seen() == {"a", "b"})
+
+    runner.quit()
+    run_until(loop, lambda: not runner.jobs and not os.listdir(tools))
+    assert {e["id"]: e["rc"] for e in events(runner) if e["event"] == "done"} == {"a": 130, "b": 130}